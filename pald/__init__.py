@@ -1,5 +1,24 @@
-from .main import main as cli_main
-from .gui import run as gui_main
+# cli_main / gui_main se încarcă abia la prima folosire: `import pald`
+# (sau `python -m pald batch`) nu trebuie să tragă după el Tk, Pillow și OpenCV
+_LAZY = {
+    "cli_main": (".main", "main"),
+    "gui_main": (".gui", "run"),
+}
 
 __all__ = ["cli_main", "gui_main"]
 
+
+def __getattr__(name):
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    import importlib
+
+    module_name, attr = _LAZY[name]
+    value = getattr(importlib.import_module(module_name, __name__), attr)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY))
@@ -1,5 +1,33 @@
-from .gui import run
-# from .start_screen import run
+import sys
 
-if __name__ == "__main__":
+
+def _main(argv):
+    # `python -m pald batch <folder>` -> mod fără interfață, pentru foldere întregi
+    if argv and argv[0] == "batch":
+        from .batch import main as batch_main
+        return batch_main(argv[1:])
+
+    # `python -m pald watch <folder>` -> identifică pozele noi pe măsură ce apar
+    if argv and argv[0] == "watch":
+        from .watch import main as watch_main
+        return watch_main(argv[1:])
+
+    # `python -m pald history [--species ...]` -> caută în istoricul identificărilor
+    if argv and argv[0] == "history":
+        from .history import main as history_main
+        return history_main(argv[1:])
+
+    # `python -m pald cli [--profile]` -> meniul din consolă
+    if argv and argv[0] == "cli":
+        from .main import main as cli_main
+        cli_main(argv[1:])
+        return 0
+
+    from .gui import run
+    # from .start_screen import run
     run()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(_main(sys.argv[1:]))
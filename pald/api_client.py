@@ -1,12 +1,381 @@
 import base64
-from typing import List, Dict, Any
+import copy
+import email.utils
+import hashlib
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, List, Dict, Any, Optional, Sequence, Tuple, Union
 
-import requests
+from .cache import ResultCache
+from .config import (
+    CACHE_DIR,
+    CACHE_MAX_MB,
+    CACHE_MAX_AGE_DAYS,
+    DEDUP_MAX_DISTANCE,
+    DEDUP_MAX_ENTRIES,
+    HTTP_BACKOFF_BASE,
+    HTTP_BACKOFF_MAX,
+    HTTP_MAX_RETRIES,
+    HTTP_POOL_SIZE,
+    HTTP_TIMEOUT,
+    KEY_AUTH_QUARANTINE,
+    PLANT_ID_ENDPOINT,
+    get_api_keys,
+    QUOTA_INTERACTIVE_RESERVE,
+    RATE_BURST,
+    RATE_LIMIT,
+    DAILY_QUOTA,
+    UPLOAD_MAX_EDGE,
+    UPLOAD_JPEG_QUALITY,
+)
+from .dedup import NearDuplicateIndex, dhash
+from .keypool import AUTH_STATUSES, RATE_LIMIT_STATUS, KeyPool, NoKeyAvailableError
+from .preprocess import preprocess_image_bytes
+from .profiling import record, span
+from .request_body import ImageSource, JSONImagesBody, source_size
+from .scheduler import PRIORITY_BATCH, PRIORITY_INTERACTIVE, RateScheduler
+from .singleflight import SingleFlight
 
-from .config import API_KEY
+if TYPE_CHECKING:
+    import requests
 
 
-PLANT_ID_ENDPOINT = "https://api.plant.id/v3/identification"
+# ce info suplimentar cerem implicit (url, nume comune etc.)
+DEFAULT_DETAILS = "url,common_names"
+
+# ce poate primi identify_plant: cale de fișier, bytes ai unei imagini
+# codate (JPEG/PNG...) sau direct un cadru numpy de la cameră (BGR)
+ImageInput = Union[str, "os.PathLike[str]", bytes, bytearray, memoryview, Any]
+
+# câte poze ale aceluiași exemplar trimitem într-o singură cerere
+MAX_IMAGES_PER_REQUEST = 5
+
+# statusuri după care merită să reîncercăm (rate limit + erori temporare de server)
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+_result_cache: Optional[ResultCache] = None
+_result_cache_lock = threading.Lock()
+
+_duplicate_index: Optional[NearDuplicateIndex] = None
+_duplicate_index_lock = threading.Lock()
+
+_preprocess_pool: Optional[ThreadPoolExecutor] = None
+_preprocess_pool_lock = threading.Lock()
+
+_in_flight = SingleFlight()
+
+_key_pool: Optional[KeyPool] = None
+_key_pool_lock = threading.Lock()
+
+_scheduler: Optional[RateScheduler] = None
+_scheduler_lock = threading.Lock()
+
+_default_client: Optional["PlantIdClient"] = None
+_default_client_lock = threading.Lock()
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Retry-After poate fi un număr de secunde sau o dată HTTP.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when.timestamp() - time.time())
+
+
+def _parse_remaining(headers) -> Optional[int]:
+    """
+    Cota rămasă a cheii, dacă API-ul o trimite în header-e.
+    """
+    value = headers.get("X-RateLimit-Remaining")
+    try:
+        return int(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+def backoff_delay(
+    attempt: int,
+    base: float,
+    maximum: float,
+    retry_after: Optional[float] = None,
+) -> float:
+    """
+    Cât așteptăm înainte de reîncercarea `attempt` (0 = prima reîncercare).
+    Dacă serverul a trimis Retry-After îl respectăm; altfel backoff
+    exponențial cu "full jitter", ca mai mulți clienți să nu revină deodată.
+    """
+    if retry_after is not None:
+        return retry_after
+    return random.uniform(0, min(maximum, base * (2 ** attempt)))
+
+
+class PlantIdClient:
+    """
+    Client HTTP comun pentru Plant.id, sigur de folosit din mai multe thread-uri.
+
+    Conexiunile (TCP + TLS) sunt păstrate într-un pool și refolosite între
+    cereri. Fiecare thread are propria `requests.Session`, dar toate
+    împart același adaptor, deci același pool de conexiuni keep-alive.
+    Cererile eșuate cu 429 / 5xx sau erori de rețea sunt reîncercate cu
+    backoff exponențial + jitter, respectând Retry-After.
+
+    Fiecare încercare trece întâi prin `scheduler` (implicit cel comun,
+    vezi get_scheduler), care dozează cererile după prioritate și cotă,
+    și ia o cheie din `key_pool` (implicit cel comun, vezi get_key_pool).
+    Dacă o cheie e respinsă (401/403) sau limitată (429), cererea e
+    reîncercată imediat cu altă cheie, când există una disponibilă.
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        key_pool: Optional[KeyPool] = None,
+        endpoint: str = PLANT_ID_ENDPOINT,
+        pool_size: int = HTTP_POOL_SIZE,
+        max_retries: int = HTTP_MAX_RETRIES,
+        backoff_base: float = HTTP_BACKOFF_BASE,
+        backoff_max: float = HTTP_BACKOFF_MAX,
+        timeout: float = HTTP_TIMEOUT,
+        scheduler: Optional[RateScheduler] = None,
+    ):
+        # o cheie dată explicit are pool-ul ei; altfel folosim cheile din config
+        self.key_pool = key_pool or (KeyPool([api_key]) if api_key else get_key_pool())
+        self.endpoint = endpoint
+        self.pool_size = pool_size
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.timeout = timeout
+        self.scheduler = scheduler or get_scheduler()
+
+        # pool_block=True: dacă toate conexiunile sunt ocupate, thread-ul
+        # așteaptă una liberă în loc să deschidă conexiuni noi care se aruncă
+        # requests e importat abia aici: modurile care nu fac cereri pornesc mai repede
+        from requests.adapters import HTTPAdapter
+
+        self._adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=pool_size,
+            pool_block=True,
+        )
+        self._local = threading.local()
+
+    def _session(self) -> "requests.Session":
+        import requests
+
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            session.mount("https://", self._adapter)
+            session.mount("http://", self._adapter)
+            self._local.session = session
+        return session
+
+    def post_identification(
+        self,
+        payload: Union[Dict[str, Any], JSONImagesBody],
+        params: Optional[Dict[str, Any]] = None,
+        priority: int = PRIORITY_INTERACTIVE,
+    ) -> Dict[str, Any]:
+        """
+        Trimite o cerere de identificare și întoarce JSON-ul brut de la API.
+        `payload` e un dict sau un JSONImagesBody, trimis pe bucăți (la
+        fiecare încercare corpul e generat din nou).
+        Ridică requests.HTTPError dacă și ultima încercare eșuează și
+        QuotaExceededError dacă s-a terminat cota zilnică.
+        """
+        import requests
+
+        session = self._session()
+        attempt = 0
+
+        while True:
+            try:
+                key = self.key_pool.acquire()
+            except NoKeyAvailableError as e:
+                # toate cheile sunt blocate; așteptăm doar dacă se eliberează curând
+                if attempt >= self.max_retries or e.retry_after > self.backoff_max:
+                    raise
+                time.sleep(e.retry_after)
+                attempt += 1
+                continue
+
+            # și reîncercările consumă din limită: tot la API ajung
+            self.scheduler.acquire(priority)
+            try:
+                with span("http.request"):
+                    response = session.post(
+                        self.endpoint,
+                        params=params,
+                        timeout=self.timeout,
+                        **_body_kwargs(payload, key),
+                    )
+                # de la trimiterea cererii până la primirea header-elor:
+                # upload + timpul serverului, fără descărcarea corpului
+                record("http.until_headers", response.elapsed.total_seconds())
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt >= self.max_retries:
+                    raise
+                time.sleep(backoff_delay(attempt, self.backoff_base, self.backoff_max))
+                attempt += 1
+                continue
+
+            status = response.status_code
+            delay = backoff_delay(
+                attempt,
+                self.backoff_base,
+                self.backoff_max,
+                _parse_retry_after(response.headers.get("Retry-After")),
+            )
+            # la 429 cheia stă deoparte cât am fi așteptat oricum
+            self.key_pool.report(
+                key, status, retry_after=delay, remaining=_parse_remaining(response.headers)
+            )
+
+            if (
+                status in AUTH_STATUSES + (RATE_LIMIT_STATUS,)
+                and attempt < self.max_retries
+                and not self.key_pool.is_available(key)
+                and self.key_pool.available_count()
+            ):
+                # problema e la cheie, nu la cerere: încercăm imediat cu alta
+                response.close()
+                attempt += 1
+                continue
+
+            if status in RETRY_STATUSES and attempt < self.max_retries:
+                response.close()
+                time.sleep(delay)
+                attempt += 1
+                continue
+
+            response.raise_for_status()
+            with span("http.json_parse"):
+                return response.json()
+
+    def close(self) -> None:
+        self._adapter.close()
+
+
+def _body_kwargs(payload: Union[Dict[str, Any], JSONImagesBody], key: str) -> Dict[str, Any]:
+    headers = {"Api-Key": key}
+    if isinstance(payload, JSONImagesBody):
+        headers["Content-Type"] = "application/json"
+        return {"data": payload.stream(), "headers": headers}
+    return {"json": payload, "headers": headers}
+
+
+def get_key_pool() -> KeyPool:
+    """
+    Cheile Plant.id din config (PLANT_ID_API_KEY / PLANT_ID_API_KEYS /
+    PLANT_ID_API_KEYS_FILE), împărțite de toți clienții din proces.
+    """
+    global _key_pool
+
+    with _key_pool_lock:
+        if _key_pool is None:
+            _key_pool = KeyPool(get_api_keys(), auth_quarantine=KEY_AUTH_QUARANTINE)
+        return _key_pool
+
+
+def get_scheduler() -> RateScheduler:
+    """
+    Planificatorul comun al cererilor (limită pe secundă + cotă zilnică),
+    împărțit de toți clienții din proces. Limitele din config sunt per
+    cheie, deci cu mai multe chei debitul total crește proporțional.
+    """
+    global _scheduler
+
+    with _scheduler_lock:
+        if _scheduler is None:
+            keys = len(get_key_pool())
+            _scheduler = RateScheduler(
+                RATE_LIMIT * keys,
+                burst=RATE_BURST * keys,
+                daily_quota=DAILY_QUOTA * keys,
+                interactive_reserve=QUOTA_INTERACTIVE_RESERVE,
+                # nu direct în CACHE_DIR: acolo ResultCache își ține intrările
+                state_path=os.path.join(CACHE_DIR, "state", "quota.sqlite3"),
+            )
+        return _scheduler
+
+
+def get_default_client() -> PlantIdClient:
+    """
+    Clientul comun folosit de identify_plant (GUI, CLI și batch),
+    creat la prima folosire.
+    """
+    global _default_client
+
+    with _default_client_lock:
+        if _default_client is None:
+            _default_client = PlantIdClient()
+        return _default_client
+
+
+def get_result_cache() -> Optional[ResultCache]:
+    """
+    Întoarce cache-ul de rezultate comun (creat la prima folosire)
+    sau None dacă e dezactivat din config (PALD_CACHE_MAX_MB=0).
+    """
+    global _result_cache
+
+    if CACHE_MAX_MB <= 0:
+        return None
+
+    with _result_cache_lock:
+        if _result_cache is None:
+            _result_cache = ResultCache(
+                CACHE_DIR,
+                max_bytes=int(CACHE_MAX_MB * 1024 * 1024),
+                max_age=CACHE_MAX_AGE_DAYS * 24 * 3600,
+            )
+        return _result_cache
+
+
+def get_duplicate_index() -> Optional[NearDuplicateIndex]:
+    """
+    Indexul comun de poze aproape identice sau None dacă e dezactivat
+    (PALD_DEDUP_MAX_DISTANCE=-1).
+    """
+    global _duplicate_index
+
+    if DEDUP_MAX_DISTANCE < 0:
+        return None
+
+    with _duplicate_index_lock:
+        if _duplicate_index is None:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            _duplicate_index = NearDuplicateIndex(
+                os.path.join(CACHE_DIR, "near_duplicates.jsonl"),
+                max_entries=DEDUP_MAX_ENTRIES,
+            )
+        return _duplicate_index
+
+
+def get_in_flight() -> SingleFlight:
+    """
+    Cererile de identificare aflate acum în zbor, după conținut + parametri.
+    """
+    return _in_flight
+
+
+def read_image_bytes(image_path: str) -> bytes:
+    with span("image.read"), open(image_path, "rb") as f:
+        return f.read()
 
 
 def encode_image_to_base64(image_path: str) -> str:
@@ -14,57 +383,395 @@ def encode_image_to_base64(image_path: str) -> str:
     Citește o imagine de pe disc și o convertește în string base64 (ASCII),
     format cerut de Plant.id.
     """
-    with open(image_path, "rb") as f:
-        return base64.b64encode(f.read()).decode("ascii")
+    image_bytes = read_image_bytes(image_path)
+    with span("image.base64"):
+        return base64.b64encode(image_bytes).decode("ascii")
 
 
-def identify_plant(image_path: str, max_suggestions: int = 3) -> Dict[str, Any]:
+def load_image_input(
+    image: ImageInput,
+    max_edge: int = UPLOAD_MAX_EDGE,
+    jpeg_quality: int = UPLOAD_JPEG_QUALITY,
+) -> Tuple[bytes, bool]:
     """
-    Trimite imaginea la Plant.id și întoarce un rezultat simplificat.
+    Aduce orice intrare acceptată la bytes de imagine codată.
 
-    Returnează un dict cu:
-    {
-        "is_plant": bool,
-        "suggestions": [
-            {
-                "name": str,
-                "probability": float,  # 0..1
-                "common_names": List[str],
-                "url": str | None
-            },
-            ...
-        ]
-    }
+    Întoarce (bytes, gata_de_trimis). Cadrele de la cameră sunt micșorate și
+    codate JPEG o singură dată, direct în memorie (fără fișier temporar),
+    deci nu mai trec prin preprocesare; căile și bytes-ii primiți da.
     """
-    image_b64 = encode_image_to_base64(image_path)
-    images = [image_b64]
+    if isinstance(image, (str, os.PathLike)):
+        return read_image_bytes(image), False
 
-    # param 'details' -> ce info suplimentar vrem (url, nume comune etc.)
-    params = {
-        "details": "url,common_names",
-    }
+    if isinstance(image, (bytes, bytearray, memoryview)):
+        return bytes(image), False
+
+    if hasattr(image, "shape"):
+        # import aici: OpenCV e mare și nu-l vrem când trimitem doar fișiere
+        from .camera import encode_frame_to_jpeg
+
+        with span("image.encode_frame"):
+            return encode_frame_to_jpeg(image, max_edge, jpeg_quality), True
+
+    raise TypeError(f"Tip de imagine nesuportat: {type(image).__name__}")
+
+
+def _hash_images(image_bytes: Union[bytes, Sequence[bytes]]) -> "hashlib._Hash":
+    parts = [image_bytes] if isinstance(image_bytes, (bytes, bytearray)) else list(image_bytes)
+
+    h = hashlib.sha256()
+    for i, part in enumerate(parts):
+        if i:
+            h.update(b"|next-image|")
+        h.update(part)
+    return h
+
+
+def compute_cache_key(
+    image_bytes: Union[bytes, Sequence[bytes]],
+    details: str,
+    max_suggestions: int,
+    max_edge: int = UPLOAD_MAX_EDGE,
+    jpeg_quality: int = UPLOAD_JPEG_QUALITY,
+) -> str:
+    """
+    Cheia din cache: hash pe conținutul imaginii + parametrii cererii,
+    deci aceeași poză găsită sub alt nume de fișier dă tot hit.
+    Preprocesarea intră și ea în cheie, pentru că schimbă ce vede modelul.
+    Pentru un grup de poze contează și ordinea lor; un grup de o singură
+    poză are aceeași cheie ca poza respectivă.
+    """
+    h = _hash_images(image_bytes)
+    h.update(_cache_key_params(details, max_suggestions, max_edge, jpeg_quality))
+    return h.hexdigest()
+
+
+def _cache_key_params(details: str, max_suggestions: int, max_edge: int, jpeg_quality: int) -> bytes:
+    return (
+        f"|details={details}|max_suggestions={max_suggestions}"
+        f"|max_edge={max_edge}|quality={jpeg_quality}".encode("utf-8")
+    )
+
+
+def compute_content_hash(image_bytes: Union[bytes, Sequence[bytes]]) -> str:
+    """
+    Hash-ul conținutului (sha256) pozei sau al grupului de poze, în ordine;
+    spre deosebire de cheia de cache nu depinde de parametrii cererii.
+    """
+    return _hash_images(image_bytes).hexdigest()
+
+
+def compute_file_hash(image_path: str, chunk_size: int = 1024 * 1024) -> str:
+    """
+    Ca compute_content_hash pentru o singură poză, dar citind fișierul pe
+    bucăți, fără să-l țină întreg în memorie.
+    """
+    return _hash_file(image_path, chunk_size).hexdigest()
+
+
+def compute_file_keys(
+    image_paths: Union[str, Sequence[str]],
+    details: str,
+    max_suggestions: int,
+    max_edge: int = UPLOAD_MAX_EDGE,
+    jpeg_quality: int = UPLOAD_JPEG_QUALITY,
+) -> Tuple[str, str]:
+    """
+    (cheia de cache, hash-ul conținutului) pentru un fișier sau un grup de
+    fișiere, cu o singură citire pe bucăți; aceleași valori ca la
+    compute_cache_key / compute_content_hash pe bytes-ii fișierelor.
+    """
+    paths = [image_paths] if isinstance(image_paths, str) else list(image_paths)
+
+    h = hashlib.sha256()
+    for i, path in enumerate(paths):
+        if i:
+            h.update(b"|next-image|")
+        _hash_file(path, h=h)
+    content_hash = h.hexdigest()
+    h.update(_cache_key_params(details, max_suggestions, max_edge, jpeg_quality))
+    return h.hexdigest(), content_hash
+
+
+def _hash_file(
+    image_path: str,
+    chunk_size: int = 1024 * 1024,
+    h: Optional["hashlib._Hash"] = None,
+) -> "hashlib._Hash":
+    h = h if h is not None else hashlib.sha256()
+    with span("image.hash"), open(image_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h
 
-    headers = {
-        "Api-Key": API_KEY,
+
+def _upload_stats(
+    original_bytes: int,
+    sent_bytes: int,
+    source: str,
+    **extra: Any,
+) -> Dict[str, Any]:
+    stats = {
+        "original_bytes": original_bytes,
+        "sent_bytes": sent_bytes,
+        "saved_bytes": original_bytes - sent_bytes,
+        "source": source,
     }
+    stats.update(extra)
+    return stats
+
+
+def _format_size(num_bytes: int) -> str:
+    if num_bytes >= 1024 * 1024:
+        return f"{num_bytes / (1024 * 1024):.1f} MB"
+    return f"{num_bytes / 1024:.1f} KB"
+
+
+def format_upload_stats(upload: Dict[str, Any]) -> str:
+    """
+    Text scurt despre cât am trimis la API, pentru CLI / GUI.
+    """
+    original = upload.get("original_bytes", 0)
+    sent = upload.get("sent_bytes", 0)
+    saved = upload.get("saved_bytes", 0)
+
+    if upload.get("source") == "cache":
+        return f"Rezultat din cache (nu am trimis nimic, economisit {_format_size(saved)})."
 
-    payload = {
-        "images": images,
-        # poți adăuga și alte opțiuni dacă vrei, de ex.:
-        # "classification_level": "species"
+    if upload.get("source") == "near_duplicate":
+        return (
+            "Poză aproape identică cu una deja identificată "
+            f"(diferență {upload.get('distance')}/64); am refolosit rezultatul, "
+            "nu am trimis nimic."
+        )
+
+    if upload.get("source") == "coalesced":
+        return "Aceeași poză era deja trimisă; am așteptat răspunsul acelei cereri."
+
+    percent = (saved / original * 100.0) if original else 0.0
+    return (
+        f"Upload: {_format_size(original)} -> {_format_size(sent)} "
+        f"(economisit {_format_size(saved)}, {percent:.0f}%)."
+    )
+
+
+def _get_preprocess_pool() -> ThreadPoolExecutor:
+    """
+    Pool comun pentru preprocesarea pozelor unui grup în paralel
+    (Pillow eliberează GIL-ul la decodare / redimensionare / codare).
+    """
+    global _preprocess_pool
+
+    with _preprocess_pool_lock:
+        if _preprocess_pool is None:
+            _preprocess_pool = ThreadPoolExecutor(
+                max_workers=min(MAX_IMAGES_PER_REQUEST, os.cpu_count() or 1),
+                thread_name_prefix="pald-preprocess",
+            )
+        return _preprocess_pool
+
+
+def _upload_source(
+    image: ImageSource,
+    ready: bool,
+    max_edge: int,
+    jpeg_quality: int,
+) -> Tuple[ImageSource, int]:
+    """
+    Preprocesarea unei singure poze; întoarce (ce trimitem, bytes trimiși).
+    Ce trimitem e fie imaginea micșorată (bytes), fie calea originalului,
+    citit din fișier abia la trimitere. Base64 se face tot atunci, pe bucăți.
+    """
+    if not ready:
+        with span("image.preprocess"):
+            image, _ = preprocess_image_bytes(image, max_edge, jpeg_quality)
+    return image, source_size(image)
+
+
+def _prepare_identification(
+    images: List[ImageInput],
+    max_suggestions: int,
+    details: str,
+    use_cache: bool,
+    max_edge: int,
+    jpeg_quality: int,
+    use_dedup: bool = True,
+    build_payload: bool = True,
+) -> Dict[str, Any]:
+    """
+    Partea de pregătire, comună clientului sincron și celui async:
+    citește pozele, caută în cache (exact, apoi poze aproape identice)
+    și, dacă nu găsește, construiește corpul cererii (preprocesare + base64).
+
+    Toate pozele din `images` sunt ale aceluiași exemplar și pleacă într-o
+    singură cerere. Dacă "result" nu e None, avem deja răspunsul fără apel la API.
+
+    Cu build_payload=False corpul cererii se construiește abia la
+    _build_payload(prepared), ca un apel unit cu altul identic să nu-l mai facă.
+    """
+    if not images:
+        raise ValueError("Trebuie cel puțin o imagine.")
+    if len(images) > MAX_IMAGES_PER_REQUEST:
+        raise ValueError(
+            f"Cel mult {MAX_IMAGES_PER_REQUEST} imagini într-o cerere (am primit {len(images)})."
+        )
+
+    if all(isinstance(image, (str, os.PathLike)) for image in images):
+        # fișierele nu le citim întregi: hash pe bucăți, Pillow citește
+        # singur la preprocesare, iar originalul pleacă direct din fișier
+        paths = [os.fspath(image) for image in images]
+        loaded: List[Tuple[ImageSource, bool]] = [(path, False) for path in paths]
+        cache_key, content_hash = compute_file_keys(
+            paths, details, max_suggestions, max_edge, jpeg_quality
+        )
+    else:
+        loaded = [load_image_input(image, max_edge, jpeg_quality) for image in images]
+        cache_key = compute_cache_key(
+            [image_bytes for image_bytes, _ in loaded],
+            details, max_suggestions, max_edge, jpeg_quality,
+        )
+        content_hash = compute_content_hash([image_bytes for image_bytes, _ in loaded])
+
+    prepared = _new_prepared(
+        cache_key,
+        content_hash,
+        sum(source_size(image) for image, _ in loaded),
+        max_suggestions, details, use_cache, max_edge, jpeg_quality,
+    )
+    if _lookup_cache(prepared):
+        return prepared
+
+    # poze aproape identice: comparăm doar cereri cu o singură poză
+    if use_dedup and len(loaded) == 1 and get_duplicate_index() is not None:
+        try:
+            with span("dedup.hash"):
+                image_hash = dhash(loaded[0][0])
+        except Exception:
+            # nu putem decoda imaginea aici; o lăsăm pe seama API-ului
+            image_hash = None
+        if _lookup_duplicate(prepared, image_hash):
+            return prepared
+
+    prepared["loaded"] = loaded
+    if build_payload:
+        _build_payload(prepared)
+    return prepared
+
+
+def _new_prepared(
+    cache_key: str,
+    content_hash: str,
+    original_bytes: int,
+    max_suggestions: int,
+    details: str,
+    use_cache: bool,
+    max_edge: int,
+    jpeg_quality: int,
+) -> Dict[str, Any]:
+    return {
+        "cache": get_result_cache() if use_cache else None,
+        "cache_key": cache_key,
+        "content_hash": content_hash,
+        "max_suggestions": max_suggestions,
+        "original_bytes": original_bytes,
+        "result": None,
+        "duplicate_index": None,
+        "details": details,
+        "max_edge": max_edge,
+        "jpeg_quality": jpeg_quality,
     }
 
-    response = requests.post(
-        PLANT_ID_ENDPOINT,
-        params=params,
-        headers=headers,
-        json=payload,
-        timeout=30,
+
+def _lookup_cache(prepared: Dict[str, Any]) -> bool:
+    """
+    Pune în prepared["result"] rezultatul din cache, dacă există.
+    """
+    cache = prepared["cache"]
+    if cache is None:
+        return False
+
+    with span("cache.lookup"):
+        cached = cache.get(prepared["cache_key"])
+    if cached is None:
+        return False
+
+    cached["upload"] = _upload_stats(
+        prepared["original_bytes"], 0, "cache", content_hash=prepared["content_hash"]
     )
+    prepared["result"] = cached
+    return True
+
+
+def _lookup_duplicate(prepared: Dict[str, Any], image_hash: Optional[int]) -> bool:
+    """
+    Caută o poză aproape identică deja identificată; dacă nu e, ține minte
+    hash-ul, ca rezultatul nou să intre în index.
+    """
+    duplicate_index = get_duplicate_index()
+    if duplicate_index is None or image_hash is None:
+        return False
+
+    # aceiași parametri ca în cheia de cache, inclusiv preprocesarea
+    signature = _cache_key_params(
+        prepared["details"], prepared["max_suggestions"],
+        prepared["max_edge"], prepared["jpeg_quality"],
+    ).decode("utf-8")
+    match = duplicate_index.find(image_hash, signature, DEDUP_MAX_DISTANCE)
+    if match is not None:
+        distance, known = match
+        # copie adâncă: cine modifică sugestiile nu trebuie să atingă indexul
+        result = copy.deepcopy(known)
+        result["upload"] = _upload_stats(
+            prepared["original_bytes"], 0, "near_duplicate",
+            distance=distance, content_hash=prepared["content_hash"],
+        )
+        prepared["result"] = result
+        return True
+
+    prepared["duplicate_index"] = duplicate_index
+    prepared["image_hash"] = image_hash
+    prepared["signature"] = signature
+    return False
+
+
+def _build_payload(prepared: Dict[str, Any]) -> None:
+    """
+    Preprocesare pentru pozele încărcate de _prepare_identification;
+    completează "sent_bytes", "params" și "payload". Corpul cererii
+    (base64 + JSON) e generat pe bucăți abia la trimitere, vezi JSONImagesBody.
+    """
+    loaded = prepared.pop("loaded")
+    max_edge, jpeg_quality = prepared["max_edge"], prepared["jpeg_quality"]
+
+    if len(loaded) == 1:
+        sources = [_upload_source(*loaded[0], max_edge, jpeg_quality)]
+    else:
+        pool = _get_preprocess_pool()
+        sources = list(
+            pool.map(
+                lambda item: _upload_source(item[0], item[1], max_edge, jpeg_quality),
+                loaded,
+            )
+        )
+    del loaded
+
+    prepared["sent_bytes"] = sum(sent for _, sent in sources)
+
+    # param 'details' -> ce info suplimentar vrem (url, nume comune etc.)
+    prepared["params"] = {
+        "details": prepared["details"],
+    }
+
+    # poți adăuga și alte opțiuni în `extra`, de ex.:
+    # {"classification_level": "species"}
+    prepared["payload"] = JSONImagesBody([source for source, _ in sources])
 
-    response.raise_for_status()
-    data = response.json()
 
+def simplify_result(data: Dict[str, Any], max_suggestions: int) -> Dict[str, Any]:
+    """
+    Transformă răspunsul brut Plant.id v3 în forma simplificată
+    (fără "upload", care ține de cerere, nu de răspuns).
+    """
     # Parsăm răspunsul într-o formă mai ușor de folosit
     result = data.get("result", {})
     is_plant = bool(result.get("is_plant", {}).get("binary", False))
@@ -88,4 +795,222 @@ def identify_plant(image_path: str, max_suggestions: int = 3) -> Dict[str, Any]:
     return {
         "is_plant": is_plant,
         "suggestions": suggestions,
-    }
\ No newline at end of file
+    }
+
+
+def _finish_identification(prepared: Dict[str, Any], data: Dict[str, Any]) -> Dict[str, Any]:
+    simplified = simplify_result(data, prepared["max_suggestions"])
+
+    cache = prepared["cache"]
+    if cache is not None:
+        cache.put(prepared["cache_key"], simplified)
+
+    duplicate_index = prepared["duplicate_index"]
+    if duplicate_index is not None:
+        duplicate_index.add(
+            prepared["image_hash"], prepared["signature"], copy.deepcopy(simplified)
+        )
+
+    simplified["upload"] = _upload_stats(
+        prepared["original_bytes"], prepared["sent_bytes"], "api",
+        content_hash=prepared["content_hash"],
+    )
+    return simplified
+
+
+def identify_plant(
+    image: ImageInput,
+    max_suggestions: int = 3,
+    details: str = DEFAULT_DETAILS,
+    use_cache: bool = True,
+    max_edge: int = UPLOAD_MAX_EDGE,
+    jpeg_quality: int = UPLOAD_JPEG_QUALITY,
+    client: Optional[PlantIdClient] = None,
+    use_dedup: bool = True,
+    priority: int = PRIORITY_INTERACTIVE,
+) -> Dict[str, Any]:
+    """
+    Trimite imaginea la Plant.id și întoarce un rezultat simplificat.
+    `image` poate fi o cale, bytes ai unei imagini sau un cadru numpy de
+    la cameră (vezi load_image_input).
+    Dacă aceeași imagine (același conținut) a mai fost identificată cu
+    aceiași parametri, rezultatul vine direct din cache, fără apel de rețea.
+    Înainte de upload imaginea e micșorată la `max_edge` și recomprimată
+    (vezi preprocess_image_bytes). Cererea pleacă prin `client`
+    (implicit clientul comun, cu conexiuni refolosite și reîncercări).
+    Cu `use_dedup`, o poză aproape identică (hash perceptual apropiat) cu
+    una deja identificată refolosește rezultatul acela.
+    `priority` (PRIORITY_INTERACTIVE / PRIORITY_BATCH) decide cine trece
+    primul când cererile trebuie să aștepte după limită.
+
+    Returnează un dict cu:
+    {
+        "is_plant": bool,
+        "suggestions": [
+            {
+                "name": str,
+                "probability": float,  # 0..1
+                "common_names": List[str],
+                "url": str | None
+            },
+            ...
+        ],
+        "upload": {
+            "original_bytes": int,  # mărimea fișierului original
+            "sent_bytes": int,      # cât am trimis efectiv (0 la cache hit)
+            "saved_bytes": int,
+            "source": str,          # "api", "cache", "near_duplicate" sau "coalesced"
+            "content_hash": str,    # sha256 al conținutului pozei (pozelor)
+        }
+    }
+    """
+    return identify_plant_group(
+        [image],
+        max_suggestions=max_suggestions,
+        details=details,
+        use_cache=use_cache,
+        max_edge=max_edge,
+        jpeg_quality=jpeg_quality,
+        client=client,
+        use_dedup=use_dedup,
+        priority=priority,
+    )
+
+
+def identify_plant_group(
+    images: List[ImageInput],
+    max_suggestions: int = 3,
+    details: str = DEFAULT_DETAILS,
+    use_cache: bool = True,
+    max_edge: int = UPLOAD_MAX_EDGE,
+    jpeg_quality: int = UPLOAD_JPEG_QUALITY,
+    client: Optional[PlantIdClient] = None,
+    use_dedup: bool = True,
+    priority: int = PRIORITY_INTERACTIVE,
+) -> Dict[str, Any]:
+    """
+    Ca identify_plant, dar pentru mai multe poze ale aceluiași exemplar
+    (frunză, floare, scoarță...), trimise împreună într-o singură cerere:
+    un singur apel plătit și, de obicei, o identificare mai sigură.
+
+    Pozele sunt preprocesate în paralel. Cel mult MAX_IMAGES_PER_REQUEST.
+    """
+    with span("identify_plant"):
+        prepared = _prepare_identification(
+            list(images), max_suggestions, details, use_cache, max_edge, jpeg_quality,
+            use_dedup, build_payload=False,
+        )
+        if prepared["result"] is not None:
+            return prepared["result"]
+        return _send_prepared(prepared, client or get_default_client(), priority)
+
+
+def _send_prepared(prepared: Dict[str, Any], client: PlantIdClient, priority: int) -> Dict[str, Any]:
+    def request() -> Dict[str, Any]:
+        _build_payload(prepared)
+        data = client.post_identification(
+            prepared.pop("payload"), prepared["params"], priority=priority
+        )
+        return _finish_identification(prepared, data)
+
+    # aceeași poză trimisă de două ori în paralel (dublu-click, același
+    # fișier ales din nou): o singură cerere, rezultatul e împărțit
+    key = f"{client.endpoint}|{prepared['cache_key']}"
+    result, shared = get_in_flight().do(key, request)
+    # fiecare apelant primește propria copie (adâncă): cine modifică
+    # sugestiile nu le strică pe ale celorlalți
+    result = copy.deepcopy(result)
+    if not shared:
+        return result
+
+    result["upload"] = _upload_stats(
+        prepared["original_bytes"], 0, "coalesced", content_hash=prepared["content_hash"]
+    )
+    return result
+
+
+# ---------- IDENTIFICARE PE ETAPE (pentru batch-uri mari) ----------
+# identify_plant face totul pe un singur thread. Pentru mii de poze, batch-ul
+# rupe aceiași pași în etape care pot rula în paralel pe resurse diferite:
+#   1. prepare_file_identification - hash pe bucăți + cache (thread-uri, disc)
+#   2. prepare_upload              - decodare, micșorare, JPEG (procese, CPU)
+#   3. identify_prepared           - poze aproape identice + upload (thread-uri, rețea)
+
+
+def prepare_file_identification(
+    image_path: str,
+    max_suggestions: int = 3,
+    details: str = DEFAULT_DETAILS,
+    use_cache: bool = True,
+    max_edge: int = UPLOAD_MAX_EDGE,
+    jpeg_quality: int = UPLOAD_JPEG_QUALITY,
+) -> Dict[str, Any]:
+    """
+    Etapa 1: cheia de cache și hash-ul conținutului, citind fișierul pe
+    bucăți (fără să-l țină în memorie), apoi căutarea în cache. Dacă
+    "result" nu e None, poza nu mai trebuie trimisă.
+    """
+    cache_key, content_hash = compute_file_keys(
+        image_path, details, max_suggestions, max_edge, jpeg_quality
+    )
+    prepared = _new_prepared(
+        cache_key, content_hash, os.path.getsize(image_path),
+        max_suggestions, details, use_cache, max_edge, jpeg_quality,
+    )
+    _lookup_cache(prepared)
+    return prepared
+
+
+def prepare_upload(
+    image_path: str,
+    max_edge: int = UPLOAD_MAX_EDGE,
+    jpeg_quality: int = UPLOAD_JPEG_QUALITY,
+    with_dhash: bool = True,
+) -> Tuple[ImageSource, Optional[int], Dict[str, float]]:
+    """
+    Etapa 2, partea grea pe CPU: calculează hash-ul perceptual și pregătește
+    poza pentru upload. Funcție la nivel de modul, cu argumente și rezultat
+    simple, ca să poată rula într-un ProcessPoolExecutor.
+    Întoarce (bytes de trimis sau calea originalului, hash perceptual sau None,
+    durate pe etape în secunde). Duratele măsurate într-un proces copil nu
+    ajung în profilul părintelui, așa că le întoarcem; le înregistrează cine
+    a cerut lucrul, cu profiling.record.
+    """
+    timings: Dict[str, float] = {}
+
+    image_hash = None
+    if with_dhash:
+        started = time.perf_counter()
+        try:
+            image_hash = dhash(image_path)
+        except Exception:
+            pass
+        timings["dedup.hash"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    upload, _ = preprocess_image_bytes(image_path, max_edge, jpeg_quality)
+    timings["image.preprocess"] = time.perf_counter() - started
+    return upload, image_hash, timings
+
+
+def identify_prepared(
+    prepared: Dict[str, Any],
+    upload: ImageSource,
+    image_hash: Optional[int] = None,
+    client: Optional[PlantIdClient] = None,
+    use_dedup: bool = True,
+    priority: int = PRIORITY_BATCH,
+) -> Dict[str, Any]:
+    """
+    Etapa 3: cu ce au dat etapele 1 și 2, caută o poză aproape identică și,
+    dacă nu e, trimite cererea. Rezultatul are aceeași formă ca la identify_plant.
+    """
+    with span("identify_plant"):
+        if prepared["result"] is not None:
+            return prepared["result"]
+        if use_dedup and _lookup_duplicate(prepared, image_hash):
+            return prepared["result"]
+
+        # deja preprocesată: _build_payload doar o pune în corpul cererii
+        prepared["loaded"] = [(upload, True)]
+        return _send_prepared(prepared, client or get_default_client(), priority)
@@ -0,0 +1,280 @@
+import asyncio
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+import aiohttp  # pip install aiohttp
+
+from .api_client import (
+    DEFAULT_DETAILS,
+    ImageInput,
+    PLANT_ID_ENDPOINT,
+    RETRY_STATUSES,
+    _finish_identification,
+    _parse_remaining,
+    _parse_retry_after,
+    _prepare_identification,
+    backoff_delay,
+    get_key_pool,
+    get_scheduler,
+)
+from .config import (
+    HTTP_BACKOFF_BASE,
+    HTTP_BACKOFF_MAX,
+    HTTP_MAX_RETRIES,
+    HTTP_POOL_SIZE,
+    HTTP_TIMEOUT,
+    UPLOAD_JPEG_QUALITY,
+    UPLOAD_MAX_EDGE,
+)
+from .keypool import AUTH_STATUSES, RATE_LIMIT_STATUS, KeyPool, NoKeyAvailableError
+from .request_body import JSONImagesBody
+from .scheduler import PRIORITY_BATCH, RateScheduler
+
+
+def _body_kwargs(payload: Union[Dict[str, Any], JSONImagesBody], key: str) -> Dict[str, Any]:
+    headers = {"Api-Key": key}
+    if isinstance(payload, JSONImagesBody):
+        # aiohttp nu știe lungimea unui generator async, așa că o dăm noi
+        headers["Content-Type"] = "application/json"
+        headers["Content-Length"] = str(len(payload))
+        return {"data": payload.aiter(), "headers": headers}
+    return {"json": payload, "headers": headers}
+
+
+class AsyncPlantIdClient:
+    """
+    Varianta asyncio a lui PlantIdClient: multe identificări în paralel
+    pe un singur event loop, fără câte un thread pentru fiecare cerere.
+
+    `max_concurrency` limitează (printr-un semafor) câte identificări sunt
+    în lucru simultan; restul așteaptă. Preprocesarea imaginii (CPU) rulează
+    în thread-uri prin asyncio.to_thread, ca să nu blocheze loop-ul.
+
+    Folosire:
+        async with AsyncPlantIdClient(max_concurrency=50) as client:
+            results = await client.identify_many(paths)
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        key_pool: Optional[KeyPool] = None,
+        endpoint: str = PLANT_ID_ENDPOINT,
+        max_concurrency: int = HTTP_POOL_SIZE,
+        max_retries: int = HTTP_MAX_RETRIES,
+        backoff_base: float = HTTP_BACKOFF_BASE,
+        backoff_max: float = HTTP_BACKOFF_MAX,
+        timeout: float = HTTP_TIMEOUT,
+        scheduler: Optional[RateScheduler] = None,
+    ):
+        self.key_pool = key_pool or (KeyPool([api_key]) if api_key else get_key_pool())
+        self.endpoint = endpoint
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.timeout = timeout
+        self.scheduler = scheduler or get_scheduler()
+
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    async def __aenter__(self) -> "AsyncPlantIdClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        # sesiunea se creează în interiorul loop-ului care o folosește
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.max_concurrency),
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+        return self._session
+
+    async def post_identification(
+        self,
+        payload: Union[Dict[str, Any], JSONImagesBody],
+        params: Optional[Dict[str, Any]] = None,
+        priority: int = PRIORITY_BATCH,
+    ) -> Dict[str, Any]:
+        """
+        Trimite o cerere de identificare și întoarce JSON-ul brut.
+        Aceeași politică de reîncercare ca PlantIdClient.post_identification.
+        Implicit cu prioritate de batch: clientul async e pentru volume mari.
+        """
+        session = self._get_session()
+        attempt = 0
+
+        while True:
+            try:
+                key = self.key_pool.acquire()
+            except NoKeyAvailableError as e:
+                if attempt >= self.max_retries or e.retry_after > self.backoff_max:
+                    raise
+                await asyncio.sleep(e.retry_after)
+                attempt += 1
+                continue
+
+            await self._acquire_slot(priority)
+            try:
+                async with session.post(
+                    self.endpoint, params=params, **_body_kwargs(payload, key)
+                ) as response:
+                    delay = backoff_delay(
+                        attempt,
+                        self.backoff_base,
+                        self.backoff_max,
+                        _parse_retry_after(response.headers.get("Retry-After")),
+                    )
+                    self.key_pool.report(
+                        key,
+                        response.status,
+                        retry_after=delay,
+                        remaining=_parse_remaining(response.headers),
+                    )
+
+                    if (
+                        response.status in AUTH_STATUSES + (RATE_LIMIT_STATUS,)
+                        and attempt < self.max_retries
+                        and not self.key_pool.is_available(key)
+                        and self.key_pool.available_count()
+                    ):
+                        # altă cheie, imediat
+                        delay = 0.0
+                    elif response.status not in RETRY_STATUSES or attempt >= self.max_retries:
+                        response.raise_for_status()
+                        return await response.json()
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                if attempt >= self.max_retries:
+                    raise
+                delay = backoff_delay(attempt, self.backoff_base, self.backoff_max)
+
+            if delay > 0:
+                await asyncio.sleep(delay)
+            attempt += 1
+
+    async def _acquire_slot(self, priority: int) -> None:
+        """
+        Așteaptă un token de la planificator (comun cu clientul sincron din
+        GUI) fără să țină ocupat un thread: întrebăm din când în când cu
+        try_acquire. Dacă task-ul e anulat, ieșim din coadă fără să consumăm
+        token sau cotă.
+        """
+        ticket = self.scheduler.reserve(priority)
+        try:
+            while True:
+                delay = self.scheduler.try_acquire(ticket)
+                if delay <= 0:
+                    return
+                await asyncio.sleep(delay)
+        except BaseException:
+            self.scheduler.release(ticket)
+            raise
+
+    async def identify(
+        self,
+        image: ImageInput,
+        max_suggestions: int = 3,
+        details: str = DEFAULT_DETAILS,
+        use_cache: bool = True,
+        max_edge: int = UPLOAD_MAX_EDGE,
+        jpeg_quality: int = UPLOAD_JPEG_QUALITY,
+        use_dedup: bool = True,
+        priority: int = PRIORITY_BATCH,
+    ) -> Dict[str, Any]:
+        """
+        Echivalentul async al lui identify_plant; întoarce același dict simplificat.
+        """
+        return await self.identify_group(
+            [image],
+            max_suggestions=max_suggestions,
+            details=details,
+            use_cache=use_cache,
+            max_edge=max_edge,
+            jpeg_quality=jpeg_quality,
+            use_dedup=use_dedup,
+            priority=priority,
+        )
+
+    async def identify_group(
+        self,
+        images: List[ImageInput],
+        max_suggestions: int = 3,
+        details: str = DEFAULT_DETAILS,
+        use_cache: bool = True,
+        max_edge: int = UPLOAD_MAX_EDGE,
+        jpeg_quality: int = UPLOAD_JPEG_QUALITY,
+        use_dedup: bool = True,
+        priority: int = PRIORITY_BATCH,
+    ) -> Dict[str, Any]:
+        """
+        Echivalentul async al lui identify_plant_group: mai multe poze ale
+        aceluiași exemplar într-o singură cerere.
+        """
+        async with self._semaphore:
+            prepared = await asyncio.to_thread(
+                _prepare_identification,
+                list(images), max_suggestions, details, use_cache, max_edge, jpeg_quality,
+                use_dedup,
+            )
+            if prepared["result"] is not None:
+                return prepared["result"]
+
+            data = await self.post_identification(
+                prepared.pop("payload"), prepared["params"], priority=priority
+            )
+            return await asyncio.to_thread(_finish_identification, prepared, data)
+
+    async def identify_many(
+        self,
+        images: Iterable[ImageInput],
+        return_exceptions: bool = True,
+        **kwargs: Any,
+    ) -> List[Any]:
+        """
+        Identifică toate imaginile concurent (limitat de `max_concurrency`)
+        și întoarce rezultatele în aceeași ordine.
+
+        Cu return_exceptions=True erorile apar în listă în locul rezultatului.
+        Altfel, prima eroare anulează cererile rămase. Dacă apelul însuși
+        este anulat, sunt anulate și toate cererile pornite de el.
+        """
+        tasks = [
+            asyncio.ensure_future(self.identify(image, **kwargs))
+            for image in images
+        ]
+        try:
+            return await asyncio.gather(*tasks, return_exceptions=return_exceptions)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+    async def close(self) -> None:
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+
+async def identify_plant_async(
+    image: ImageInput,
+    max_suggestions: int = 3,
+    client: Optional[AsyncPlantIdClient] = None,
+    **kwargs: Any,
+) -> Dict[str, Any]:
+    """
+    Varianta async a lui identify_plant.
+
+    Pentru multe cereri dă un `client` comun, altfel fiecare apel își
+    deschide (și închide) propria sesiune HTTP.
+    """
+    if client is not None:
+        return await client.identify(image, max_suggestions=max_suggestions, **kwargs)
+
+    async with AsyncPlantIdClient() as own_client:
+        return await own_client.identify(
+            image, max_suggestions=max_suggestions, **kwargs
+        )
@@ -0,0 +1,446 @@
+import argparse
+import datetime
+import json
+import multiprocessing
+import os
+import queue
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set
+
+from .api_client import (
+    DEFAULT_DETAILS,
+    identify_plant,
+    identify_prepared,
+    prepare_file_identification,
+    prepare_upload,
+)
+from .config import UPLOAD_JPEG_QUALITY, UPLOAD_MAX_EDGE
+from .profiling import dump_json, format_report, record as record_timing
+from .scheduler import PRIORITY_BATCH, QuotaExceededError
+
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp", ".gif", ".webp")
+
+DEFAULT_OUTPUT_NAME = "pald_results.jsonl"
+
+
+def find_images(directory: str, recursive: bool = True) -> List[str]:
+    """
+    Întoarce (sortat) toate imaginile din folder, după extensie.
+    """
+    found = []
+    if recursive:
+        for root, _, files in os.walk(directory):
+            for name in files:
+                if name.lower().endswith(IMAGE_EXTENSIONS):
+                    found.append(os.path.join(root, name))
+    else:
+        for name in os.listdir(directory):
+            path = os.path.join(directory, name)
+            if name.lower().endswith(IMAGE_EXTENSIONS) and os.path.isfile(path):
+                found.append(path)
+    found.sort()
+    return found
+
+
+def load_completed(output_path: str) -> Set[str]:
+    """
+    Citește fișierul de rezultate (JSONL) și întoarce căile deja identificate
+    cu succes, ca să le sărim la o rulare reluată. Erorile se reîncearcă.
+    """
+    done: Set[str] = set()
+    if not os.path.isfile(output_path):
+        return done
+
+    with open(output_path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # ultima linie poate fi tăiată dacă rularea a fost oprită brusc
+                continue
+            if record.get("status") == "ok":
+                done.add(os.path.abspath(record.get("image", "")))
+    return done
+
+
+def identify_record(
+    image_path: str,
+    max_suggestions: int,
+    identify_kwargs: Dict[str, Any],
+) -> Dict[str, Any]:
+    """
+    Identifică o imagine și întoarce linia de rezultat (status ok / error);
+    nu ridică excepții, eroarea ajunge în înregistrare.
+    """
+    started = time.perf_counter()
+    try:
+        result = identify_plant(image_path, max_suggestions=max_suggestions, **identify_kwargs)
+    except Exception as e:
+        return _make_record(image_path, started, error=e)
+    return _make_record(image_path, started, result=result)
+
+
+def _make_record(
+    image_path: str,
+    started: float,
+    result: Optional[Dict[str, Any]] = None,
+    error: Optional[BaseException] = None,
+) -> Dict[str, Any]:
+    record: Dict[str, Any] = {"image": os.path.abspath(image_path)}
+    if error is None:
+        record["result"] = result
+        record["status"] = "ok"
+    else:
+        record["status"] = "error"
+        record["error"] = str(error)
+        if isinstance(error, QuotaExceededError):
+            record["quota_exceeded"] = True
+    record["seconds"] = round(time.perf_counter() - started, 3)
+    record["time"] = datetime.datetime.now().isoformat(timespec="seconds")
+    return record
+
+
+def describe_record(record: Dict[str, Any]) -> str:
+    if record["status"] != "ok":
+        return f"EROARE: {record.get('error')}"
+
+    result = record["result"]
+    if not result.get("is_plant"):
+        return "nu pare plantă"
+
+    suggestions = result.get("suggestions") or []
+    if not suggestions:
+        return "fără sugestii"
+
+    top = suggestions[0]
+    prob = float(top.get("probability", 0.0)) * 100.0
+    return f"{top.get('name')} ({prob:.1f}%)"
+
+
+def run_batch(
+    image_paths: Iterable[str],
+    output_path: str,
+    workers: int = 8,
+    max_suggestions: int = 3,
+    resume: bool = True,
+    progress: bool = True,
+    identify_kwargs: Optional[Dict[str, Any]] = None,
+    processes: int = 0,
+) -> Dict[str, Any]:
+    """
+    Identifică toate imaginile în paralel, cu cel mult `workers` cereri simultan.
+
+    Cu `processes` > 0, munca pe CPU (decodare, micșorare, JPEG) rulează pe
+    atâtea procese, în paralel cu upload-urile (vezi _pipelined_records);
+    altfel fiecare din cele `workers` thread-uri face tot drumul pentru o poză.
+
+    Fiecare rezultat e adăugat imediat (o linie JSON) în `output_path`, așa că
+    o rulare întreruptă poate fi reluată: imaginile deja reușite sunt sărite.
+    `identify_kwargs` merg mai departe la identify_plant (de ex. client, use_cache).
+    Cererile pleacă cu prioritate de batch, deci cele din GUI trec înainte.
+    Dacă se termină cota zilnică, nu mai pornim imagini noi; o rulare
+    reluată mâine continuă de unde a rămas.
+    Întoarce un sumar cu numărul de reușite / erori / sărite.
+    """
+    identify_kwargs = dict(identify_kwargs or {})
+    identify_kwargs.setdefault("priority", PRIORITY_BATCH)
+    paths = [os.path.abspath(p) for p in image_paths]
+    completed = load_completed(output_path) if resume else set()
+    pending = [p for p in paths if p not in completed]
+
+    summary = {"total": len(paths), "skipped": len(paths) - len(pending), "ok": 0, "error": 0}
+    if summary["skipped"]:
+        print(f"Reluare: {summary['skipped']} imagini deja identificate, le sar.")
+
+    if not pending:
+        return summary
+
+    total = len(pending)
+    width = len(str(total))
+    started = time.perf_counter()
+    processed = 0
+
+    # după o eroare de cotă nu mai pornim imagini noi
+    stop = threading.Event()
+    if processes > 0:
+        records = _pipelined_records(
+            pending, workers, min(processes, total), max_suggestions, identify_kwargs, stop
+        )
+    else:
+        records = _threaded_records(pending, workers, max_suggestions, identify_kwargs, stop)
+
+    mode = "a" if resume else "w"
+    with open(output_path, mode, encoding="utf-8") as out:
+        try:
+            for record in records:
+                out.write(json.dumps(record, ensure_ascii=False) + "\n")
+                out.flush()
+
+                processed += 1
+                summary[record["status"]] += 1
+                if record.get("quota_exceeded") and not stop.is_set():
+                    stop.set()
+                    summary["stopped"] = "quota"
+                    if progress:
+                        print("Cota zilnică s-a terminat; nu mai pornesc imagini noi.")
+                if progress:
+                    print(
+                        f"[{processed:>{width}}/{total}] "
+                        f"{os.path.basename(record['image'])} -> {describe_record(record)}"
+                    )
+        finally:
+            stop.set()
+
+    elapsed = time.perf_counter() - started
+    rate = processed / elapsed if elapsed > 0 else 0.0
+    summary["seconds"] = elapsed
+    if not progress:
+        return summary
+    print(
+        f"\nGata: {summary['ok']} reușite, {summary['error']} erori "
+        f"în {elapsed:.1f}s ({rate:.2f} imagini/s)."
+    )
+    return summary
+
+
+def _threaded_records(
+    paths: List[str],
+    workers: int,
+    max_suggestions: int,
+    identify_kwargs: Dict[str, Any],
+    stop: threading.Event,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Fiecare poză face tot drumul (citire, preprocesare, upload) pe unul
+    din cele `workers` thread-uri.
+    """
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        remaining = iter(paths)
+        in_flight = set()
+
+        def submit_next() -> bool:
+            if stop.is_set():
+                return False
+            path = next(remaining, None)
+            if path is None:
+                return False
+            in_flight.add(
+                pool.submit(identify_record, path, max_suggestions, identify_kwargs)
+            )
+            return True
+
+        # nu punem mii de sarcini în coadă deodată, doar cât să țină pool-ul ocupat
+        for _ in range(workers * 2):
+            if not submit_next():
+                break
+
+        while in_flight:
+            finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in finished:
+                in_flight.discard(future)
+                yield future.result()
+                submit_next()
+
+
+_DONE = object()
+
+
+def _pipelined_records(
+    paths: List[str],
+    workers: int,
+    processes: int,
+    max_suggestions: int,
+    identify_kwargs: Dict[str, Any],
+    stop: threading.Event,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Aceleași identificări, pe etape care se suprapun:
+
+    - `processes` thread-uri de pregătire: hash pe bucăți + cache; la ratare
+      trimit poza la un ProcessPoolExecutor pentru decodare / micșorare /
+      JPEG (CPU, fără GIL comun) și așteaptă rezultatul
+    - `workers` thread-uri de upload: poze aproape identice + cererea HTTP
+
+    Între etape stă o coadă mărginită: când upload-ul rămâne în urmă,
+    pregătirea se oprește în loc să strângă poze în memorie. Deci în memorie
+    sunt cel mult processes + 3 * workers poze micșorate, oricât de mare e lotul.
+    """
+    kwargs = dict(identify_kwargs)
+    priority = kwargs.pop("priority", PRIORITY_BATCH)
+    client = kwargs.pop("client", None)
+    use_dedup = kwargs.pop("use_dedup", True)
+    use_cache = kwargs.pop("use_cache", True)
+    details = kwargs.pop("details", DEFAULT_DETAILS)
+    max_edge = kwargs.pop("max_edge", UPLOAD_MAX_EDGE)
+    jpeg_quality = kwargs.pop("jpeg_quality", UPLOAD_JPEG_QUALITY)
+    if kwargs:
+        raise TypeError(f"Argumente necunoscute pentru identificare: {', '.join(kwargs)}")
+
+    todo: "queue.Queue[str]" = queue.Queue()
+    for path in paths:
+        todo.put(path)
+    uploads: "queue.Queue[Any]" = queue.Queue(maxsize=workers * 2)
+    # rezultatele sunt mici și le golește bucla care scrie fișierul
+    results: "queue.Queue[Any]" = queue.Queue()
+
+    def prepare_stage(pool: ProcessPoolExecutor) -> None:
+        while not stop.is_set():
+            try:
+                path = todo.get_nowait()
+            except queue.Empty:
+                return
+            started = time.perf_counter()
+            try:
+                prepared = prepare_file_identification(
+                    path, max_suggestions, details, use_cache, max_edge, jpeg_quality
+                )
+                if prepared["result"] is not None:
+                    results.put(_make_record(path, started, result=prepared["result"]))
+                    continue
+                upload_bytes, image_hash, timings = pool.submit(
+                    prepare_upload, path, max_edge, jpeg_quality, use_dedup
+                ).result()
+                for name, seconds in timings.items():
+                    record_timing(name, seconds)
+            except Exception as e:
+                results.put(_make_record(path, started, error=e))
+                continue
+            # se blochează cât timp coada e plină: asta e frâna
+            uploads.put((path, started, prepared, upload_bytes, image_hash))
+
+    def upload_stage() -> None:
+        while True:
+            item = uploads.get()
+            if item is _DONE:
+                return
+            path, started, prepared, upload_bytes, image_hash = item
+            try:
+                result = identify_prepared(
+                    prepared, upload_bytes, image_hash,
+                    client=client, use_dedup=use_dedup, priority=priority,
+                )
+            except Exception as e:
+                results.put(_make_record(path, started, error=e))
+            else:
+                results.put(_make_record(path, started, result=result))
+
+    def run() -> None:
+        try:
+            # "spawn", nu fork: procesul are deja thread-uri (inclusiv acesta),
+            # iar un copil făcut cu fork poate moșteni un lock ținut de ele
+            with ProcessPoolExecutor(
+                max_workers=processes, mp_context=multiprocessing.get_context("spawn")
+            ) as pool:
+                preparers = [
+                    threading.Thread(target=prepare_stage, args=(pool,), daemon=True)
+                    for _ in range(processes)
+                ]
+                uploaders = [
+                    threading.Thread(target=upload_stage, daemon=True) for _ in range(workers)
+                ]
+                for thread in preparers + uploaders:
+                    thread.start()
+                for thread in preparers:
+                    thread.join()
+                for _ in uploaders:
+                    uploads.put(_DONE)
+                for thread in uploaders:
+                    thread.join()
+        finally:
+            results.put(_DONE)
+
+    threading.Thread(target=run, name="pald-batch-pipeline", daemon=True).start()
+    while True:
+        record = results.get()
+        if record is _DONE:
+            return
+        yield record
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m pald batch",
+        description="Identifică toate pozele dintr-un folder, fără interacțiune.",
+    )
+    parser.add_argument("directory", help="folderul cu poze")
+    parser.add_argument(
+        "-o", "--output",
+        help=f"fișierul JSONL cu rezultate (implicit <folder>/{DEFAULT_OUTPUT_NAME})",
+    )
+    parser.add_argument(
+        "-j", "--workers", type=int, default=8,
+        help="câte identificări rulează simultan (implicit 8)",
+    )
+    parser.add_argument(
+        "-p", "--processes", type=int, default=os.cpu_count() or 1,
+        help="câte procese micșorează pozele în paralel cu upload-ul "
+             "(implicit câte nuclee are procesorul; 0 = totul pe thread-urile de upload)",
+    )
+    parser.add_argument(
+        "-n", "--max-suggestions", type=int, default=3,
+        help="câte sugestii păstrăm per imagine (implicit 3)",
+    )
+    parser.add_argument(
+        "--no-recursive", action="store_true",
+        help="nu intra în subfoldere",
+    )
+    parser.add_argument(
+        "--restart", action="store_true",
+        help="ignoră rezultatele existente și ia totul de la capăt",
+    )
+    parser.add_argument(
+        "--profile", action="store_true",
+        help="la final afișează timpii pe etape (citire, preprocesare, upload...)",
+    )
+    parser.add_argument(
+        "--profile-json",
+        help="la final salvează timpii pe etape în acest fișier JSON",
+    )
+    args = parser.parse_args(argv)
+
+    if not os.path.isdir(args.directory):
+        print(f"Folderul nu există: {args.directory}")
+        return 2
+    if args.workers < 1:
+        print("Numărul de workeri trebuie să fie cel puțin 1.")
+        return 2
+    if args.processes < 0:
+        print("Numărul de procese nu poate fi negativ.")
+        return 2
+
+    output_path = args.output or os.path.join(args.directory, DEFAULT_OUTPUT_NAME)
+    images = find_images(args.directory, recursive=not args.no_recursive)
+    print(f"Am găsit {len(images)} imagini în {args.directory}.")
+
+    try:
+        summary = run_batch(
+            images,
+            output_path,
+            workers=args.workers,
+            max_suggestions=args.max_suggestions,
+            resume=not args.restart,
+            processes=args.processes,
+        )
+    except KeyboardInterrupt:
+        print("\nOprit. Rulează din nou aceeași comandă ca să continui.")
+        return 130
+    finally:
+        if args.profile:
+            print("\n=== Timpi pe etape ===")
+            print(format_report())
+        if args.profile_json:
+            dump_json(args.profile_json)
+
+    print(f"Rezultate în: {output_path}")
+    return 1 if summary["error"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
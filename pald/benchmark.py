@@ -0,0 +1,352 @@
+import argparse
+import json
+import math
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Optional
+
+from .api_client import (
+    DEFAULT_DETAILS,
+    PlantIdClient,
+    _prepare_identification,
+    encode_image_to_base64,
+    identify_plant,
+)
+from .batch import find_images, run_batch
+from .config import UPLOAD_JPEG_QUALITY, UPLOAD_MAX_EDGE
+from .mock_server import MockPlantIdServer
+from .scheduler import RateScheduler
+
+
+# module grele care nu ar trebui încărcate la pornirea modurilor fără interfață
+HEAVY_MODULES = ("cv2", "PIL", "numpy", "tkinter", "requests", "aiohttp")
+
+# ce importă fiecare mod la pornire
+STARTUP_TARGETS = {
+    "import pald": "import pald",
+    "batch": "import pald.batch",
+    "cli": "import pald.main",
+}
+
+_STARTUP_PROBE = (
+    "import json, sys, time\n"
+    "started = time.perf_counter()\n"
+    "{statement}\n"
+    "elapsed = time.perf_counter() - started\n"
+    "print(json.dumps({{'import_ms': elapsed * 1000.0,"
+    " 'heavy': [m for m in {heavy!r} if m in sys.modules]}}))\n"
+)
+
+
+def percentile(values: List[float], p: float) -> float:
+    """
+    Percentila `p` (0..100) prin metoda nearest-rank.
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(p / 100.0 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def summarize(latencies: List[float], elapsed: float, bytes_per_item: List[int]) -> Dict[str, Any]:
+    count = len(latencies)
+    return {
+        "count": count,
+        "p50_ms": percentile(latencies, 50) * 1000.0,
+        "p95_ms": percentile(latencies, 95) * 1000.0,
+        "p99_ms": percentile(latencies, 99) * 1000.0,
+        "mean_ms": (sum(latencies) / count * 1000.0) if count else 0.0,
+        "per_second": (count / elapsed) if elapsed > 0 else 0.0,
+        "bytes_per_image": (sum(bytes_per_item) / len(bytes_per_item)) if bytes_per_item else 0.0,
+    }
+
+
+def make_synthetic_images(directory: str, count: int, width: int, height: int) -> List[str]:
+    """
+    Generează poze JPEG de test (gradient + zgomot), de mărimea unor
+    poze de telefon, ca preprocesarea să aibă de lucru realist.
+    """
+    import numpy as np
+    from PIL import Image
+
+    rng = np.random.default_rng(0)
+    y, x = np.mgrid[0:height, 0:width]
+    paths = []
+    for i in range(count):
+        base = np.stack(
+            [
+                (x * 255 // max(1, width - 1) + i * 7) % 256,
+                (y * 255 // max(1, height - 1) + i * 13) % 256,
+                ((x + y) * 255 // max(1, width + height - 2)) % 256,
+            ],
+            axis=-1,
+        )
+        noise = rng.integers(0, 48, size=base.shape)
+        pixels = np.clip(base + noise, 0, 255).astype(np.uint8)
+
+        path = os.path.join(directory, f"bench_{i:04d}.jpg")
+        Image.fromarray(pixels).save(path, format="JPEG", quality=92)
+        paths.append(path)
+    return paths
+
+
+def bench_encode(paths: List[str]) -> Dict[str, Any]:
+    """
+    Doar partea locală: citire + preprocesare + base64, fără rețea.
+    Corpul cererii e generat abia la trimitere (JSONImagesBody), așa că îl
+    parcurgem aici, în timpul măsurat, ca să fie comparabil cu base64 brut.
+    """
+    raw_latencies, latencies, sent = [], [], []
+
+    for path in paths:
+        started = time.perf_counter()
+        encode_image_to_base64(path)
+        raw_latencies.append(time.perf_counter() - started)
+
+    started_all = time.perf_counter()
+    for path in paths:
+        started = time.perf_counter()
+        prepared = _prepare_identification(
+            [path], 3, DEFAULT_DETAILS, False, UPLOAD_MAX_EDGE, UPLOAD_JPEG_QUALITY,
+            use_dedup=False,
+        )
+        for _ in prepared["payload"].stream():
+            pass
+        latencies.append(time.perf_counter() - started)
+        sent.append(prepared["sent_bytes"])
+    elapsed = time.perf_counter() - started_all
+
+    summary = summarize(latencies, elapsed, sent)
+    summary["raw_base64_p50_ms"] = percentile(raw_latencies, 50) * 1000.0
+    summary["original_bytes_per_image"] = sum(os.path.getsize(p) for p in paths) / len(paths)
+    return summary
+
+
+def bench_identify(paths: List[str], client: PlantIdClient, server: MockPlantIdServer) -> Dict[str, Any]:
+    """
+    identify_plant secvențial, cap-coadă, contra serverului local.
+    """
+    server.reset_stats()
+    latencies, sent = [], []
+
+    started_all = time.perf_counter()
+    for path in paths:
+        started = time.perf_counter()
+        result = identify_plant(path, client=client, use_cache=False, use_dedup=False)
+        latencies.append(time.perf_counter() - started)
+        sent.append(result["upload"]["sent_bytes"])
+    elapsed = time.perf_counter() - started_all
+
+    summary = summarize(latencies, elapsed, sent)
+    summary["server"] = server.stats()
+    return summary
+
+
+def bench_batch(
+    paths: List[str],
+    client: PlantIdClient,
+    server: MockPlantIdServer,
+    workers: int,
+) -> Dict[str, Any]:
+    """
+    Calea de batch (run_batch) cu `workers` cereri simultan.
+    """
+    server.reset_stats()
+
+    with tempfile.TemporaryDirectory(prefix="pald_bench_out_") as out_dir:
+        output_path = os.path.join(out_dir, "results.jsonl")
+        started_all = time.perf_counter()
+        run_batch(
+            paths,
+            output_path,
+            workers=workers,
+            resume=False,
+            progress=False,
+            identify_kwargs={"client": client, "use_cache": False, "use_dedup": False},
+        )
+        elapsed = time.perf_counter() - started_all
+
+        latencies, sent = [], []
+        with open(output_path, "r", encoding="utf-8") as f:
+            for line in f:
+                record = json.loads(line)
+                latencies.append(record["seconds"])
+                if record["status"] == "ok":
+                    sent.append(record["result"]["upload"]["sent_bytes"])
+
+    summary = summarize(latencies, elapsed, sent)
+    summary["workers"] = workers
+    summary["server"] = server.stats()
+    return summary
+
+
+def bench_startup(runs: int = 5) -> Dict[str, Any]:
+    """
+    Pornirea la rece a modurilor fără interfață: câte un proces Python nou
+    pentru fiecare măsurătoare, ca nimic să nu fie deja importat.
+
+    Pentru fiecare mod: timpul total al procesului, cât din el e importul
+    pald și ce module grele (HEAVY_MODULES) au ajuns încărcate.
+    """
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+    def run(statement: str) -> Dict[str, Any]:
+        code = _STARTUP_PROBE.format(statement=statement, heavy=HEAVY_MODULES)
+        started = time.perf_counter()
+        out = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=root,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        data = json.loads(out.stdout.strip().splitlines()[-1])
+        data["process_ms"] = (time.perf_counter() - started) * 1000.0
+        return data
+
+    baseline = [run("pass")["process_ms"] for _ in range(runs)]
+    results: Dict[str, Any] = {"python_ms": percentile(baseline, 50)}
+
+    for name, statement in STARTUP_TARGETS.items():
+        samples = [run(statement) for _ in range(runs)]
+        results[name] = {
+            "process_ms": percentile([s["process_ms"] for s in samples], 50),
+            "import_ms": percentile([s["import_ms"] for s in samples], 50),
+            "heavy": samples[-1]["heavy"],
+        }
+    return results
+
+
+def _print_startup(results: Dict[str, Any], target_ms: float) -> bool:
+    """
+    Afișează rezultatele pornirii; întoarce False dacă vreun mod depășește
+    ținta sau încarcă module grele.
+    """
+    print(f"\n--- pornire la rece (ținta: import sub {target_ms:.0f} ms) ---")
+    print(f"  python gol: {results['python_ms']:.1f} ms")
+
+    ok = True
+    for name in STARTUP_TARGETS:
+        r = results[name]
+        problems = []
+        if r["import_ms"] > target_ms:
+            problems.append("peste țintă")
+        if r["heavy"]:
+            problems.append("încarcă " + ", ".join(r["heavy"]))
+        ok = ok and not problems
+        print(
+            f"  {name:<12} import {r['import_ms']:>7.1f} ms, proces {r['process_ms']:>7.1f} ms"
+            + (f"  <- {'; '.join(problems)}" if problems else "")
+        )
+    return ok
+
+
+def _print_summary(title: str, summary: Dict[str, Any]) -> None:
+    print(f"\n--- {title} ---")
+    print(
+        f"  n={summary['count']}  p50={summary['p50_ms']:.1f} ms  "
+        f"p95={summary['p95_ms']:.1f} ms  p99={summary['p99_ms']:.1f} ms  "
+        f"({summary['per_second']:.2f}/s)"
+    )
+    print(f"  bytes trimiși / imagine: {summary['bytes_per_image'] / 1024:.1f} KB")
+    if "original_bytes_per_image" in summary:
+        print(
+            f"  original / imagine: {summary['original_bytes_per_image'] / 1024:.1f} KB, "
+            f"base64 brut p50: {summary['raw_base64_p50_ms']:.1f} ms"
+        )
+    server = summary.get("server")
+    if server and server["requests"]:
+        print(
+            f"  server: {server['requests']} cereri, "
+            f"{server['bytes_received'] / server['requests'] / 1024:.1f} KB corp / cerere, "
+            f"statusuri {server['statuses']}"
+        )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m pald.benchmark",
+        description="Măsoară latența și debitul pald contra unui Plant.id simulat local.",
+    )
+    parser.add_argument("--images", help="folder cu poze reale (implicit: poze generate)")
+    parser.add_argument("--count", type=int, default=20, help="câte poze generăm")
+    parser.add_argument("--size", default="4000x3000", help="mărimea pozelor generate, LxÎ")
+    parser.add_argument("--workers", type=int, default=8, help="concurența pentru batch")
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--jitter", type=float, default=0.05)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--json", dest="json_path", help="salvează rezultatele și ca JSON")
+    parser.add_argument(
+        "--startup", action="store_true",
+        help="măsoară doar pornirea la rece a modurilor fără interfață",
+    )
+    parser.add_argument(
+        "--startup-target-ms", type=float, default=300.0,
+        help="ținta pentru importul unui mod fără interfață (implicit 300 ms)",
+    )
+    parser.add_argument("--runs", type=int, default=5, help="repetări pentru --startup")
+    args = parser.parse_args(argv)
+
+    if args.startup:
+        results = bench_startup(args.runs)
+        ok = _print_startup(results, args.startup_target_ms)
+        if args.json_path:
+            with open(args.json_path, "w", encoding="utf-8") as f:
+                json.dump(results, f, indent=2)
+        # cod de ieșire 1 dacă am depășit ținta, ca să poată fi folosit în CI
+        return 0 if ok else 1
+
+    with tempfile.TemporaryDirectory(prefix="pald_bench_") as tmp_dir:
+        if args.images:
+            paths = find_images(args.images)
+        else:
+            width, height = (int(v) for v in args.size.lower().split("x"))
+            print(f"Generez {args.count} poze {width}x{height}...")
+            paths = make_synthetic_images(tmp_dir, args.count, width, height)
+
+        if not paths:
+            print("Nu am găsit nicio imagine.")
+            return 2
+
+        server = MockPlantIdServer(
+            latency=args.latency,
+            jitter=args.jitter,
+            error_rate=args.error_rate,
+            rate_limit_rate=args.rate_limit_rate,
+            retry_after=0.1,
+            seed=0,
+        )
+        with server:
+            client = PlantIdClient(
+                api_key="mock-key",
+                endpoint=server.url,
+                pool_size=max(args.workers, 1),
+                backoff_base=0.05,
+                # măsurăm clientul, nu limita de cereri pe secundă
+                scheduler=RateScheduler(rate=0),
+            )
+            results = {
+                "encode": bench_encode(paths),
+                "identify_plant": bench_identify(paths, client, server),
+                "batch": bench_batch(paths, client, server, args.workers),
+            }
+            client.close()
+
+    _print_summary("encode (citire + preprocesare + base64)", results["encode"])
+    _print_summary("identify_plant (secvențial)", results["identify_plant"])
+    _print_summary(f"batch ({args.workers} workeri)", results["batch"])
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, default=str)
+        print(f"\nRezultate salvate în {args.json_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
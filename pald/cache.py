@@ -0,0 +1,191 @@
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+
+# cheile sunt hash-uri sha256; alte fișiere din folder nu sunt intrări de cache
+_KEY_RE = re.compile(r"[0-9a-f]{64}")
+
+
+class ResultCache:
+    """
+    Cache pe disc pentru rezultatele identificării.
+
+    Fiecare rezultat e salvat într-un fișier `<cheie>.json`, unde cheia este
+    un hash al conținutului imaginii + parametrii cererii. Ordinea LRU este
+    ținută în memorie și reconstruită din mtime-ul fișierelor la pornire.
+
+    Evacuare:
+    - după mărime: cele mai vechi accesate ies primele când depășim `max_bytes`
+    - după vârstă: intrările mai vechi de `max_age` secunde sunt ignorate și șterse
+    """
+
+    SUFFIX = ".json"
+
+    def __init__(self, directory: str, max_bytes: int, max_age: float):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._lock = threading.Lock()
+        # cheie -> (mărime în bytes, ultimul acces); cel mai recent la final
+        self._index: "OrderedDict[str, Tuple[int, float]]" = OrderedDict()
+        self._total_bytes = 0
+
+        os.makedirs(self.directory, exist_ok=True)
+        self._load_index()
+
+    # ------------ INTERN ------------
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + self.SUFFIX)
+
+    def _load_index(self) -> None:
+        entries = []
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if not entry.is_file() or not entry.name.endswith(self.SUFFIX):
+                    continue
+                key = entry.name[: -len(self.SUFFIX)]
+                if not _KEY_RE.fullmatch(key):
+                    continue
+                st = entry.stat()
+                entries.append((st.st_mtime, key, st.st_size))
+
+        for mtime, key, size in sorted(entries):
+            self._index[key] = (size, mtime)
+            self._total_bytes += size
+
+        self._evict_locked()
+
+    def _remove_locked(self, key: str) -> None:
+        size, _ = self._index.pop(key, (0, 0.0))
+        self._total_bytes -= size
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def _evict_locked(self) -> None:
+        now = time.time()
+
+        # întâi tot ce a expirat (ordinea LRU nu contează aici)
+        if self.max_age > 0:
+            expired = [
+                key for key, (_, accessed) in self._index.items()
+                if now - accessed > self.max_age
+            ]
+            for key in expired:
+                self._remove_locked(key)
+                self.evictions += 1
+
+        # apoi cele mai puțin folosite, până intrăm în limită
+        while self._index and self._total_bytes > self.max_bytes:
+            key = next(iter(self._index))
+            self._remove_locked(key)
+            self.evictions += 1
+
+    # ------------ API PUBLIC ------------
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            if key not in self._index:
+                self.misses += 1
+                return None
+
+            path = self._path(key)
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    record = json.load(f)
+            except (OSError, ValueError):
+                # fișier șters de alt proces sau corupt
+                self._remove_locked(key)
+                self.misses += 1
+                return None
+
+            if self.max_age > 0 and time.time() - record.get("created", 0) > self.max_age:
+                self._remove_locked(key)
+                self.evictions += 1
+                self.misses += 1
+                return None
+
+            now = time.time()
+            try:
+                os.utime(path, (now, now))
+            except OSError:
+                pass
+            size, _ = self._index[key]
+            self._index[key] = (size, now)
+            self._index.move_to_end(key)
+
+            self.hits += 1
+            return record.get("result")
+
+    def peek(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Ca get, dar fără să schimbe ordinea LRU sau statisticile; pentru
+        cine doar afișează ce știm (de ex. galeria).
+        """
+        with self._lock:
+            if key not in self._index:
+                return None
+            try:
+                with open(self._path(key), "r", encoding="utf-8") as f:
+                    record = json.load(f)
+            except (OSError, ValueError):
+                return None
+        if self.max_age > 0 and time.time() - record.get("created", 0) > self.max_age:
+            return None
+        return record.get("result")
+
+    def put(self, key: str, result: Dict[str, Any]) -> None:
+        record = {"created": time.time(), "result": result}
+        data = json.dumps(record, ensure_ascii=False).encode("utf-8")
+
+        with self._lock:
+            # scriem atomic: fișier temporar + rename, ca să nu lăsăm JSON pe jumătate
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(data)
+                os.replace(tmp_path, self._path(key))
+            except OSError:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+                return
+
+            if key in self._index:
+                old_size, _ = self._index.pop(key)
+                self._total_bytes -= old_size
+
+            self._index[key] = (len(data), time.time())
+            self._total_bytes += len(data)
+            self._evict_locked()
+
+    def clear(self) -> None:
+        with self._lock:
+            for key in list(self._index):
+                self._remove_locked(key)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._index),
+                "bytes": self._total_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": (self.hits / lookups) if lookups else 0.0,
+            }
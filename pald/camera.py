@@ -1,43 +1,439 @@
-import cv2
-import os
-import tempfile
-from typing import Optional
+import threading
+import time
+from collections import deque
+from typing import Dict, Optional
 
+from .config import (
+    CAMERA_AUTOCAPTURE_WINDOW,
+    CAMERA_DEVICE,
+    CAMERA_FOCUS_THRESHOLD,
+    CAMERA_FPS,
+    CAMERA_HEIGHT,
+    CAMERA_IDLE_TIMEOUT,
+    CAMERA_PREVIEW_FPS,
+    CAMERA_WIDTH,
+)
 
-def capture_image_from_camera() -> Optional[str]:
+
+# cv2 (OpenCV) se importă abia în funcțiile care îl folosesc: durează
+# sute de ms și modurile fără cameră (batch, CLI din galerie) nu au nevoie de el
+
+
+class FrameGrabber:
+    """
+    Citește continuu cadre dintr-o cameră deja deschisă, pe un thread
+    separat, într-un buffer circular mic, și servește mereu cel mai nou cadru.
+
+    Driverele țin de obicei câteva cadre în coadă; dacă citim doar când
+    avem nevoie, primim o imagine veche. Citind non-stop, golim coada
+    driverului și `latest()` întoarce ce vede camera acum.
+    """
+
+    def __init__(self, cap, buffer_size: int = 2):
+        self._cap = cap
+        self._buffer = deque(maxlen=buffer_size)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._release_on_exit = False
+        # crește la fiecare cadru nou, ca cine afișează să știe dacă e ceva nou
+        self.frame_id = 0
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="pald-camera", daemon=True
+        )
+        self._thread.start()
+
+    def _run(self) -> None:
+        try:
+            while not self._stop.is_set():
+                ret, frame = self._cap.read()
+                if not ret:
+                    time.sleep(0.01)
+                    continue
+                with self._lock:
+                    self._buffer.append(frame)
+                    self.frame_id += 1
+        finally:
+            if self._release_on_exit:
+                self._cap.release()
+
+    def latest(self):
+        """
+        Cel mai nou cadru (numpy array BGR) sau None dacă încă nu avem niciunul.
+        """
+        with self._lock:
+            if not self._buffer:
+                return None
+            return self._buffer[-1]
+
+    def stop(self, release_capture: bool = False) -> None:
+        """
+        Oprește citirea. Cu `release_capture`, eliberează și camera, dar
+        abia după ce thread-ul a ieșit: dacă un `read()` blocat nu se
+        termină în timpul de așteptare, îl eliberează thread-ul la ieșire,
+        nu noi de sub el.
+        """
+        self._release_on_exit = release_capture
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+        elif release_capture:
+            self._cap.release()
+        with self._lock:
+            self._buffer.clear()
+
+
+class CameraSession:
+    """
+    Camera ținută deschisă între capturi.
+
+    Deschiderea dispozitivului + stabilizarea expunerii automate durează
+    1-2 s, așa că nu închidem camera după fiecare poză. Sesiunea se
+    deschide explicit (`open()`) sau la prima cerere de cadru și se
+    eliberează singură după `idle_timeout` secunde fără folosire.
+
+    La deschidere cerem rezoluția / FPS-ul din config; ce a acceptat de
+    fapt driverul se găsește în `negotiated`.
+    """
+
+    def __init__(
+        self,
+        device: int = CAMERA_DEVICE,
+        width: int = CAMERA_WIDTH,
+        height: int = CAMERA_HEIGHT,
+        fps: int = CAMERA_FPS,
+        idle_timeout: float = CAMERA_IDLE_TIMEOUT,
+    ):
+        self.device = device
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.idle_timeout = idle_timeout
+        self.negotiated: Dict[str, float] = {}
+
+        self._lock = threading.RLock()
+        self._cap = None
+        self._grabber: Optional[FrameGrabber] = None
+        self._last_used = 0.0
+        self._idle_timer: Optional[threading.Timer] = None
+
+    @property
+    def is_open(self) -> bool:
+        return self._grabber is not None and self._grabber.running
+
+    @property
+    def frame_id(self) -> int:
+        grabber = self._grabber
+        return grabber.frame_id if grabber is not None else 0
+
+    def open(self) -> bool:
+        """
+        Deschide camera (dacă nu e deja deschisă) și pornește citirea cadrelor.
+        Întoarce False dacă nu s-a putut deschide camera.
+        """
+        import cv2
+
+        with self._lock:
+            self._touch()
+            if self.is_open:
+                return True
+
+            cap = cv2.VideoCapture(self.device)
+            if not cap.isOpened():
+                cap.release()
+                return False
+
+            # unde driverul permite, nu ținem cadre vechi în coadă
+            cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+            if self.width > 0 and self.height > 0:
+                cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.width)
+                cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.height)
+            if self.fps > 0:
+                cap.set(cv2.CAP_PROP_FPS, self.fps)
+
+            # driverul alege cel mai apropiat mod suportat; citim ce a ieșit
+            self.negotiated = {
+                "width": cap.get(cv2.CAP_PROP_FRAME_WIDTH),
+                "height": cap.get(cv2.CAP_PROP_FRAME_HEIGHT),
+                "fps": cap.get(cv2.CAP_PROP_FPS),
+            }
+
+            self._cap = cap
+            self._grabber = FrameGrabber(cap)
+            self._grabber.start()
+            self._schedule_idle_check()
+            return True
+
+    def close(self) -> None:
+        with self._lock:
+            if self._idle_timer is not None:
+                self._idle_timer.cancel()
+                self._idle_timer = None
+            if self._grabber is not None:
+                self._grabber.stop(release_capture=True)
+                self._grabber = None
+            elif self._cap is not None:
+                self._cap.release()
+            self._cap = None
+
+    def latest(self):
+        """
+        Cel mai nou cadru; deschide camera dacă a fost eliberată între timp.
+        """
+        # sub lock: altfel _idle_check poate închide camera între verificare și citire
+        with self._lock:
+            if not self.is_open and not self.open():
+                return None
+            self._touch()
+            grabber = self._grabber
+        return grabber.latest()
+
+    def wait_for_frame(self, timeout: float = 2.0):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            frame = self.latest()
+            if frame is not None:
+                return frame
+            time.sleep(0.01)
+        return None
+
+    # ------------ INTERN ------------
+
+    def _touch(self) -> None:
+        self._last_used = time.monotonic()
+
+    def _schedule_idle_check(self) -> None:
+        if self.idle_timeout <= 0:
+            return
+        self._idle_timer = threading.Timer(self.idle_timeout, self._idle_check)
+        self._idle_timer.daemon = True
+        self._idle_timer.start()
+
+    def _idle_check(self) -> None:
+        with self._lock:
+            self._idle_timer = None
+            if not self.is_open:
+                return
+            idle_for = time.monotonic() - self._last_used
+            if idle_for >= self.idle_timeout:
+                self.close()
+                return
+            # a fost folosită între timp: verificăm din nou când ar expira
+            self._idle_timer = threading.Timer(
+                self.idle_timeout - idle_for, self._idle_check
+            )
+            self._idle_timer.daemon = True
+            self._idle_timer.start()
+
+
+_session: Optional[CameraSession] = None
+_session_lock = threading.Lock()
+
+
+def get_camera_session() -> CameraSession:
+    """
+    Sesiunea de cameră comună aplicației (una singură pe dispozitiv).
+    """
+    global _session
+
+    with _session_lock:
+        if _session is None:
+            _session = CameraSession()
+        return _session
+
+
+def frame_to_rgb(frame):
+    """
+    OpenCV dă cadrele în BGR; PIL / Tk vor RGB.
+    """
+    import cv2
+
+    return cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+
+
+def focus_measure(frame, max_edge: int = 640) -> float:
+    """
+    Cât de clar e cadrul: varianța Laplacianului pe imaginea gri.
+    Marginile nete dau valori mari, pozele mișcate / nefocalizate valori mici.
+
+    Scorăm pe o copie micșorată la `max_edge`, ca valorile să fie comparabile
+    între rezoluții și calculul să rămână de ordinul milisecundelor.
+    """
+    import cv2
+
+    gray = frame if frame.ndim == 2 else cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+
+    h, w = gray.shape[:2]
+    scale = max_edge / max(h, w)
+    if scale < 1.0:
+        gray = cv2.resize(
+            gray,
+            (max(1, round(w * scale)), max(1, round(h * scale))),
+            interpolation=cv2.INTER_AREA,
+        )
+
+    return float(cv2.Laplacian(gray, cv2.CV_64F).var())
+
+
+class AutoCapture:
+    """
+    Alege singur momentul pozei, după claritate.
+
+    Fiecare cadru primit prin `update()` e scorat cu focus_measure. Când
+    un cadru atinge pragul, mai urmărim încă `window` secunde și apoi
+    întoarcem cel mai clar cadru văzut; până atunci `update()` întoarce None.
+
+    `last_score` / `best_score` pot fi afișate ca indicator de focalizare.
+    """
+
+    def __init__(
+        self,
+        threshold: float = CAMERA_FOCUS_THRESHOLD,
+        window: float = CAMERA_AUTOCAPTURE_WINDOW,
+    ):
+        self.threshold = threshold
+        self.window = window
+        self.last_score = 0.0
+        self.reset()
+
+    def reset(self) -> None:
+        self.best_score = 0.0
+        self._best_frame = None
+        self._armed_at: Optional[float] = None
+
+    def update(self, frame, now: Optional[float] = None):
+        if now is None:
+            now = time.monotonic()
+
+        score = focus_measure(frame)
+        self.last_score = score
+
+        if score > self.best_score:
+            self.best_score = score
+            self._best_frame = frame
+
+        if self._armed_at is None:
+            if score < self.threshold:
+                return None
+            self._armed_at = now
+
+        if now - self._armed_at < self.window:
+            return None
+
+        best = self._best_frame
+        self.reset()
+        return best
+
+
+def encode_frame_to_jpeg(frame, max_edge: int = 0, jpeg_quality: int = 90) -> bytes:
     """
-    Deschide camera și captează o imagine când utilizatorul apasă SPACE.
-    ESC = anulare.
+    Codează un cadru (BGR) ca JPEG direct în memorie, micșorându-l înainte
+    dacă latura mare depășește `max_edge` (0 = fără micșorare).
+    """
+    import cv2
+
+    if max_edge > 0:
+        h, w = frame.shape[:2]
+        scale = max_edge / max(h, w)
+        if scale < 1.0:
+            frame = cv2.resize(
+                frame,
+                (max(1, round(w * scale)), max(1, round(h * scale))),
+                interpolation=cv2.INTER_AREA,
+            )
 
-    Returnează calea imaginii salvate sau None dacă utilizatorul renunță.
+    ok, buf = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, jpeg_quality])
+    if not ok:
+        raise ValueError("Nu am putut coda cadrul ca JPEG.")
+    return buf.tobytes()
+
+
+def capture_frame_from_camera(auto: bool = False):
+    """
+    Deschide camera și captează un cadru când utilizatorul apasă SPACE.
+    ESC = anulare, A = pornește / oprește captura automată.
+
+    Cu captura automată (`auto` sau tasta A), fiecare cadru e scorat cu
+    AutoCapture, la fel ca în GUI: claritatea apare peste imagine, iar
+    poza se face singură cu cel mai clar cadru, după ce imaginea e clară.
+
+    Camera rămâne deschisă după captură (vezi CameraSession), ca
+    următoarea poză să pornească imediat.
+
+    Returnează cadrul (numpy array BGR) sau None dacă utilizatorul renunță.
+    Cadrul poate fi dat direct lui identify_plant, fără fișier pe disc.
     """
+    import cv2
 
-    cap = cv2.VideoCapture(0)
-    if not cap.isOpened():
+    session = get_camera_session()
+    if not session.open():
         print("Nu s-a putut deschide camera!")
         return None
 
-    print("Camera pornită. Apasă SPACE pentru a face poza, ESC pentru a renunța.")
+    print(
+        "Camera pornită. Apasă SPACE pentru a face poza, A pentru captură "
+        "automată, ESC pentru a renunța."
+    )
+
+    captured = None
+    auto_capture = AutoCapture()
+    # cadrele vin de la thread-ul de citire; fereastra o redesenăm doar la FPS-ul dorit
+    delay_ms = max(1, int(1000 / max(1, CAMERA_PREVIEW_FPS)))
 
-    img_path = None
+    if session.wait_for_frame() is None:
+        print("Nu pot citi frame de la camera.")
+        return None
 
     while True:
-        ret, frame = cap.read()
-        if not ret:
+        frame = session.latest()
+        if frame is None:
             print("Nu pot citi frame de la camera.")
             break
 
+        if auto:
+            best = auto_capture.update(frame)
+            if best is not None:
+                captured = best
+                print(f"Poză făcută automat (claritate {auto_capture.last_score:.0f}).")
+                break
+            state = "clar" if auto_capture.last_score >= auto_capture.threshold else "neclar"
+            # desenăm pe o copie: cadrul din buffer poate ajunge la API
+            frame = frame.copy()
+            cv2.putText(
+                frame,
+                f"Auto - claritate: {auto_capture.last_score:.0f} ({state})",
+                (10, 30),
+                cv2.FONT_HERSHEY_SIMPLEX,
+                0.8,
+                (0, 200, 0) if state == "clar" else (0, 0, 255),
+                2,
+            )
+
         cv2.imshow("pald - Camera", frame)
-        key = cv2.waitKey(1) & 0xFF
+        key = cv2.waitKey(delay_ms) & 0xFF
+
+        # A
+        if key in (ord("a"), ord("A")):
+            auto = not auto
+            auto_capture.reset()
+            print("Captură automată " + ("pornită." if auto else "oprită."))
+            continue
 
         # SPACE
         if key == 32:
-            # salvăm într-un fișier temporar
-            fd, temp_path = tempfile.mkstemp(suffix=".jpg", prefix="pald_")
-            os.close(fd)  # nu ne mai trebuie descriptorul, doar calea
-            cv2.imwrite(temp_path, frame)
-            img_path = temp_path
-            print(f"Poză salvată în: {img_path}")
+            # luăm cel mai nou cadru, nu pe cel afișat acum câteva ms
+            captured = session.latest()
+            print("Poză făcută.")
             break
 
         # ESC
@@ -45,7 +441,6 @@ def capture_image_from_camera() -> Optional[str]:
             print("Captură anulată de utilizator.")
             break
 
-    cap.release()
     cv2.destroyAllWindows()
 
-    return img_path
+    return captured
@@ -3,7 +3,130 @@ import os
 
 load_dotenv()  # încarcă automat valorile din fișierul .env
 
+
+def _env_float(name: str, default: float) -> float:
+    value = os.getenv(name)
+    if value is None or not value.strip():
+        return default
+    return float(value)
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.getenv(name)
+    if value is None or not value.strip():
+        return default
+    return int(value)
+
+
+def _read_keys_file(path: str) -> list:
+    # o cheie pe rând; rândurile goale și cele care încep cu # sunt ignorate
+    with open(path, "r", encoding="utf-8") as f:
+        return [
+            line.strip() for line in f
+            if line.strip() and not line.strip().startswith("#")
+        ]
+
+
 API_KEY = os.getenv("PLANT_ID_API_KEY")
 
-if not API_KEY:
-    raise RuntimeError("Cheia de API nu este setată!")
+
+def get_api_keys() -> list:
+    """
+    Toate cheile Plant.id configurate, fără duplicate, PLANT_ID_API_KEY prima.
+    Mai multe chei, folosite prin rotație: PLANT_ID_API_KEYS=cheie1,cheie2,...
+    și/sau PLANT_ID_API_KEYS_FILE=cale spre un fișier cu câte o cheie pe rând.
+
+    Verificarea se face abia aici, la prima cerere, nu la importul modulului,
+    ca modurile care nu vorbesc cu API-ul să pornească și fără cheie.
+    """
+    keys = [k.strip() for k in os.getenv("PLANT_ID_API_KEYS", "").split(",") if k.strip()]
+    if os.getenv("PLANT_ID_API_KEYS_FILE"):
+        keys += _read_keys_file(os.getenv("PLANT_ID_API_KEYS_FILE"))
+    if API_KEY:
+        keys.insert(0, API_KEY)
+
+    keys = list(dict.fromkeys(keys))
+    if not keys:
+        raise RuntimeError("Cheia de API nu este setată!")
+    return keys
+
+
+# se poate schimba, de ex. spre serverul local de test (python -m pald.mock_server)
+PLANT_ID_ENDPOINT = os.getenv(
+    "PALD_PLANT_ID_ENDPOINT", "https://api.plant.id/v3/identification"
+)
+
+# ---------- CACHE REZULTATE ----------
+# folderul în care păstrăm rezultatele deja identificate
+CACHE_DIR = os.getenv("PALD_CACHE_DIR") or os.path.join(
+    os.path.expanduser("~"), ".cache", "pald"
+)
+# dimensiunea maximă a cache-ului pe disc (0 = cache dezactivat)
+CACHE_MAX_MB = _env_float("PALD_CACHE_MAX_MB", 50.0)
+# după câte zile considerăm un rezultat expirat
+CACHE_MAX_AGE_DAYS = _env_float("PALD_CACHE_MAX_AGE_DAYS", 30.0)
+
+# ---------- MINIATURI ----------
+# cât ocupă pe disc miniaturile de previzualizare (în CACHE_DIR/thumbnails)
+THUMB_CACHE_MAX_MB = _env_float("PALD_THUMB_CACHE_MAX_MB", 100.0)
+# câte miniaturi gata de afișat ținem în memorie
+THUMB_MEMORY_ITEMS = _env_int("PALD_THUMB_MEMORY_ITEMS", 200)
+
+# ---------- ISTORIC ----------
+# baza SQLite cu toate identificările (păstrată între porniri)
+HISTORY_DB = os.getenv("PALD_HISTORY_DB") or os.path.join(
+    os.path.expanduser("~"), ".local", "share", "pald", "history.sqlite3"
+)
+
+# ---------- PREPROCESARE IMAGINE ----------
+# latura maximă (pixeli) a imaginii trimise la API (0 = trimitem originalul)
+UPLOAD_MAX_EDGE = _env_int("PALD_UPLOAD_MAX_EDGE", 1500)
+# calitatea JPEG la recomprimare (1..95)
+UPLOAD_JPEG_QUALITY = _env_int("PALD_UPLOAD_JPEG_QUALITY", 85)
+
+# ---------- CLIENT HTTP ----------
+# câte conexiuni keep-alive ținem deschise spre Plant.id
+HTTP_POOL_SIZE = _env_int("PALD_HTTP_POOL_SIZE", 10)
+# câte reîncercări la 429 / 5xx / erori de rețea
+HTTP_MAX_RETRIES = _env_int("PALD_HTTP_MAX_RETRIES", 4)
+# backoff exponențial: base * 2^încercare (cu jitter), plafonat la max secunde
+HTTP_BACKOFF_BASE = _env_float("PALD_HTTP_BACKOFF_BASE", 0.5)
+HTTP_BACKOFF_MAX = _env_float("PALD_HTTP_BACKOFF_MAX", 30.0)
+HTTP_TIMEOUT = _env_float("PALD_HTTP_TIMEOUT", 30.0)
+# cât stă deoparte o cheie după 401/403 (greșită sau expirată), în secunde;
+# după 429 stă cât spune Retry-After / backoff-ul. Ultima cheie disponibilă
+# nu e pusă deoparte: cererea eșuează direct cu eroarea de autentificare
+KEY_AUTH_QUARANTINE = _env_float("PALD_KEY_AUTH_QUARANTINE", 3600.0)
+
+# ---------- LIMITARE CERERI ----------
+# câte cereri pe secundă trimitem în medie, per cheie (0 = fără limită), și
+# cât de mare poate fi o rafală; cererile din GUI trec înaintea celor din batch
+RATE_LIMIT = _env_float("PALD_RATE_LIMIT", 5.0)
+RATE_BURST = _env_int("PALD_RATE_BURST", 10)
+# câte cereri pe zi avem voie, per cheie (0 = fără cotă)
+DAILY_QUOTA = _env_int("PALD_DAILY_QUOTA", 0)
+# ce fracțiune din cota zilnică păstrăm doar pentru cererile interactive
+QUOTA_INTERACTIVE_RESERVE = _env_float("PALD_QUOTA_INTERACTIVE_RESERVE", 0.1)
+
+# ---------- CAMERĂ ----------
+# indexul camerei pentru OpenCV (0 = camera implicită)
+CAMERA_DEVICE = _env_int("PALD_CAMERA_DEVICE", 0)
+# câte cadre afișăm pe secundă în previzualizare (limitat ca să nu încărcăm Tk)
+CAMERA_PREVIEW_FPS = _env_int("PALD_CAMERA_PREVIEW_FPS", 15)
+# rezoluția / FPS-ul cerut camerei (0 = ce alege driverul); driverul poate da altceva
+CAMERA_WIDTH = _env_int("PALD_CAMERA_WIDTH", 1280)
+CAMERA_HEIGHT = _env_int("PALD_CAMERA_HEIGHT", 720)
+CAMERA_FPS = _env_int("PALD_CAMERA_FPS", 30)
+# după câte secunde fără folosire eliberăm camera (0 = niciodată)
+CAMERA_IDLE_TIMEOUT = _env_float("PALD_CAMERA_IDLE_TIMEOUT", 60.0)
+# auto-captură: scorul minim de claritate (varianța Laplacianului) și cât
+# timp (secunde) mai căutăm un cadru mai clar după ce am atins pragul
+CAMERA_FOCUS_THRESHOLD = _env_float("PALD_CAMERA_FOCUS_THRESHOLD", 120.0)
+CAMERA_AUTOCAPTURE_WINDOW = _env_float("PALD_CAMERA_AUTOCAPTURE_WINDOW", 0.7)
+
+# ---------- POZE APROAPE IDENTICE ----------
+# distanța Hamming maximă (din 64 de biți) la care două poze sunt considerate
+# aceeași și refolosim rezultatul (-1 = dezactivat)
+DEDUP_MAX_DISTANCE = _env_int("PALD_DEDUP_MAX_DISTANCE", 6)
+# câte hash-uri păstrăm în index
+DEDUP_MAX_ENTRIES = _env_int("PALD_DEDUP_MAX_ENTRIES", 10000)
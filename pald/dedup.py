@@ -0,0 +1,182 @@
+import io
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+
+def dhash(image_bytes: Union[bytes, str], hash_size: int = 8) -> int:
+    """
+    Hash perceptual (dHash) pe 64 de biți: imaginea gri micșorată la
+    (hash_size + 1) x hash_size, apoi câte un bit pentru fiecare pereche de
+    pixeli vecini pe orizontală (stânga mai luminos decât dreapta sau nu).
+
+    Două poze aproape identice (aceeași plantă, cadru ușor mișcat,
+    altă compresie) dau hash-uri la distanță Hamming mică.
+    `image_bytes` poate fi și calea fișierului.
+    """
+    import numpy as np
+    from PIL import Image, ImageOps  # pip install pillow
+
+    img = Image.open(image_bytes if isinstance(image_bytes, str) else io.BytesIO(image_bytes))
+    if img.format == "JPEG":
+        # nu avem nevoie de rezoluție mare pentru 9x8 pixeli
+        img.draft("L", (hash_size * 8, hash_size * 8))
+    img = ImageOps.exif_transpose(img)
+
+    small = img.convert("L").resize((hash_size + 1, hash_size), Image.LANCZOS)
+    pixels = np.asarray(small, dtype=np.int16)
+
+    bits = pixels[:, 1:] > pixels[:, :-1]
+    return int.from_bytes(np.packbits(bits.ravel()).tobytes(), "big")
+
+
+def hamming_distance(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+class BKTree:
+    """
+    Arbore Burkhard-Keller pe distanța Hamming: găsește toate hash-urile
+    aflate la cel mult `max_distance` de o valoare fără să le compare pe toate.
+
+    Fiecare nod e [hash, valori, {distanță: copil}].
+    """
+
+    def __init__(self):
+        self._root: Optional[list] = None
+        self.size = 0
+
+    def add(self, key: int, value: Any) -> None:
+        self.size += 1
+        if self._root is None:
+            self._root = [key, [value], {}]
+            return
+
+        node = self._root
+        while True:
+            dist = hamming_distance(key, node[0])
+            if dist == 0:
+                node[1].append(value)
+                return
+            child = node[2].get(dist)
+            if child is None:
+                node[2][dist] = [key, [value], {}]
+                return
+            node = child
+
+    def search(self, key: int, max_distance: int) -> List[Tuple[int, Any]]:
+        """
+        Toate valorile la distanță <= max_distance, cele mai apropiate primele.
+        """
+        if self._root is None:
+            return []
+
+        found = []
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            dist = hamming_distance(key, node[0])
+            if dist <= max_distance:
+                found.extend((dist, value) for value in node[1])
+            # inegalitatea triunghiului: doar copiii din [dist - d, dist + d] pot conține potriviri
+            low, high = dist - max_distance, dist + max_distance
+            for child_dist, child in node[2].items():
+                if low <= child_dist <= high:
+                    stack.append(child)
+
+        found.sort(key=lambda item: item[0])
+        return found
+
+
+class NearDuplicateIndex:
+    """
+    Index de hash-uri perceptuale pentru imaginile deja identificate,
+    ca o poză aproape identică cu una recentă să refolosească rezultatul.
+
+    Intrările sunt ținute într-un BKTree în memorie și adăugate într-un
+    fișier JSONL, ca indexul să supraviețuiască repornirii. Un rezultat e
+    refolosit doar pentru aceiași parametri ai cererii (`signature`).
+    """
+
+    def __init__(self, path: str, max_entries: int = 10000):
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._entries: List[Dict[str, Any]] = []
+        self._tree = BKTree()
+        self._load()
+
+    def _load(self) -> None:
+        if not os.path.isfile(self.path):
+            return
+
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                self._entries.append(entry)
+
+        if len(self._entries) > self.max_entries:
+            self._compact_locked()
+        else:
+            for entry in self._entries:
+                self._tree.add(entry["hash"], entry)
+
+    def _compact_locked(self) -> None:
+        # păstrăm cele mai noi 3/4, ca să nu rescriem fișierul la fiecare adăugare
+        self._entries = self._entries[-(self.max_entries * 3 // 4):]
+        self._tree = BKTree()
+        for entry in self._entries:
+            self._tree.add(entry["hash"], entry)
+
+        tmp_path = self.path + ".tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                for entry in self._entries:
+                    f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            os.replace(tmp_path, self.path)
+        except OSError:
+            pass
+
+    def find(
+        self,
+        image_hash: int,
+        signature: str,
+        max_distance: int,
+    ) -> Optional[Tuple[int, Dict[str, Any]]]:
+        """
+        Cel mai apropiat rezultat cunoscut (distanță, rezultat) sau None.
+        """
+        with self._lock:
+            for dist, entry in self._tree.search(image_hash, max_distance):
+                if entry["signature"] == signature:
+                    self.hits += 1
+                    return dist, entry["result"]
+            self.misses += 1
+            return None
+
+    def add(self, image_hash: int, signature: str, result: Dict[str, Any]) -> None:
+        entry = {
+            "hash": image_hash,
+            "signature": signature,
+            "time": time.time(),
+            "result": result,
+        }
+        with self._lock:
+            self._entries.append(entry)
+            self._tree.add(image_hash, entry)
+            try:
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            except OSError:
+                pass
+
+            if len(self._entries) > self.max_entries:
+                self._compact_locked()
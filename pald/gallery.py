@@ -0,0 +1,483 @@
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+import tkinter as tk
+from tkinter import filedialog, ttk
+
+from .api_client import (
+    DEFAULT_DETAILS,
+    MAX_IMAGES_PER_REQUEST,
+    compute_file_keys,
+    get_result_cache,
+)
+from .batch import find_images
+from .history import get_history_store
+from .tasks import Task, TkTaskRunner
+from .thumbnails import get_thumbnail_cache
+
+
+# mărimea miniaturii și a celulei din grilă (pixeli)
+GRID_THUMB_SIZE = (128, 128)
+CELL_WIDTH = 148
+CELL_HEIGHT = 176
+# câte miniaturi decodăm în paralel și câte PhotoImage-uri păstrăm
+GALLERY_WORKERS = min(4, os.cpu_count() or 1)
+GALLERY_PHOTO_CACHE = 300
+# câte hash-uri ținem minte: (cale, mtime, mărime) -> (cheie de cache, sha256)
+GALLERY_HASH_MEMO = 20000
+# parametrii impliciți ai identificării (GUI, batch, watch), pentru cheia de cache
+GALLERY_MAX_SUGGESTIONS = 3
+
+_hash_memo: "OrderedDict[Tuple[str, int, int], Tuple[str, str]]" = OrderedDict()
+_hash_memo_lock = threading.Lock()
+
+
+def file_keys(image_path: str) -> Tuple[str, str]:
+    """
+    (cheia de cache, hash-ul conținutului) ca la compute_file_keys, cu
+    parametrii impliciți; fișierul e citit o singură dată cât timp nu se
+    schimbă (aceeași cale, mtime și mărime), oricât derulăm prin galerie.
+    """
+    st = os.stat(image_path)
+    key = (os.path.abspath(image_path), st.st_mtime_ns, st.st_size)
+    with _hash_memo_lock:
+        keys = _hash_memo.get(key)
+        if keys is not None:
+            _hash_memo.move_to_end(key)
+            return keys
+
+    keys = compute_file_keys(image_path, DEFAULT_DETAILS, GALLERY_MAX_SUGGESTIONS)
+    with _hash_memo_lock:
+        _hash_memo[key] = keys
+        while len(_hash_memo) > GALLERY_HASH_MEMO:
+            _hash_memo.popitem(last=False)
+    return keys
+
+
+def lookup_status(image_path: str) -> Dict[str, Any]:
+    """
+    Ce știm deja despre poză: specia și probabilitatea ultimei identificări.
+    Căutăm întâi în istoric (după hash-ul conținutului), apoi în cache-ul de
+    rezultate, unde ajung și pozele trimise cu `batch` sau cu
+    `watch --no-history`, care nu scriu în istoric. Din cache găsim doar rezultatele cerute cu
+    parametrii impliciți (3 sugestii, preprocesarea din config).
+    """
+    cache_key, content_hash = file_keys(image_path)
+    rows = get_history_store().page(limit=1, image_hash=content_hash)
+    if rows:
+        return {
+            "hash": content_hash,
+            "species": rows[0]["species"] or "Fără sugestii",
+            "probability": rows[0]["probability"],
+        }
+
+    cache = get_result_cache()
+    result = cache.peek(cache_key) if cache is not None else None
+    if result is None:
+        return {"hash": content_hash, "species": None, "probability": None}
+    suggestions = result.get("suggestions") or []
+    top = suggestions[0] if suggestions else {}
+    return {
+        "hash": content_hash,
+        "species": top.get("name") or "Fără sugestii",
+        "probability": top.get("probability"),
+    }
+
+
+def _load_cell(image_path: str):
+    # rulează pe un thread de lucru: decodare (sau cache); starea din istoric
+    # o cerem separat, după ce miniatura e pe ecran
+    return get_thumbnail_cache().load(image_path, GRID_THUMB_SIZE)
+
+
+class GalleryWindow(tk.Toplevel):
+    """
+    Galerie cu miniaturi pentru un folder întreg (mii de poze).
+
+    Grila e desenată pe un Canvas doar pentru rândurile vizibile; miniaturile
+    se decodează în fundal (prin cache-ul de miniaturi) tot doar pentru
+    celulele vizibile, iar cererile pentru celulele derulate deja din
+    fereastră se anulează dacă nu au pornit. Sub fiecare poză apare ce știm
+    din istoric (specia, dacă a mai fost identificată); starea se caută abia
+    după miniatură, ca derularea să nu aștepte după hash-ul fișierelor.
+
+    Click = selectează, Ctrl+click = adaugă / scoate, Shift+click = interval,
+    dublu-click = identifică poza. Selecția pleacă la `on_identify` (fiecare
+    poză separat) sau la `on_identify_group` (o singură cerere).
+    """
+
+    def __init__(
+        self,
+        master,
+        on_identify: Callable[[List[str]], None],
+        on_identify_group: Callable[[List[str]], None],
+        folder: Optional[str] = None,
+    ):
+        super().__init__(master)
+        self.title("Pald • Galerie")
+        self.geometry("820x600")
+        self.configure(bg="white")
+
+        self.on_identify = on_identify
+        self.on_identify_group = on_identify_group
+
+        self.folder: Optional[str] = None
+        self.paths: List[str] = []
+        self.selected: Set[int] = set()
+        self._anchor: Optional[int] = None
+        self._offset = 0
+        self._redraw_pending = False
+
+        self._photos: "OrderedDict[str, Any]" = OrderedDict()
+        # None = starea nu a putut fi citită
+        self._status: Dict[str, Optional[Dict[str, Any]]] = {}
+        self._failed: Set[str] = set()
+        self._pending: Dict[str, Task] = {}
+        self._status_pending: Dict[str, Task] = {}
+
+        self.tasks = TkTaskRunner(self, max_workers=GALLERY_WORKERS)
+
+        self._build_ui()
+        self.protocol("WM_DELETE_WINDOW", self.close)
+
+        if folder:
+            self.open_folder(folder)
+
+    # ------------ UI ------------
+
+    def _build_ui(self):
+        self.rowconfigure(1, weight=1)
+        self.columnconfigure(0, weight=1)
+
+        toolbar = tk.Frame(self, bg="white")
+        toolbar.grid(row=0, column=0, columnspan=2, sticky="ew", padx=10, pady=8)
+        toolbar.columnconfigure(1, weight=1)
+
+        ttk.Button(
+            toolbar,
+            text="📁 Alege folder",
+            command=self.on_choose_folder,
+            style="Secondary.TButton",
+        ).grid(row=0, column=0, padx=(0, 8))
+
+        self.info_label = tk.Label(
+            toolbar,
+            text="Niciun folder deschis.",
+            bg="white",
+            fg="#6b7280",
+            font=("Segoe UI", 9),
+            anchor="w",
+        )
+        self.info_label.grid(row=0, column=1, sticky="ew")
+
+        self.btn_identify = ttk.Button(
+            toolbar,
+            text="Identifică separat",
+            command=self.on_identify_selected,
+            style="Accent.TButton",
+            state=tk.DISABLED,
+        )
+        self.btn_identify.grid(row=0, column=2, padx=(8, 0))
+
+        self.btn_identify_group = ttk.Button(
+            toolbar,
+            text="Identifică împreună",
+            command=self.on_identify_selected_group,
+            style="Secondary.TButton",
+            state=tk.DISABLED,
+        )
+        self.btn_identify_group.grid(row=0, column=3, padx=(8, 0))
+
+        self.canvas = tk.Canvas(self, bg="#f9fafb", highlightthickness=0, borderwidth=0)
+        self.canvas.grid(row=1, column=0, sticky="nsew", padx=(10, 0), pady=(0, 10))
+        self.scrollbar = tk.Scrollbar(self, orient="vertical", command=self.yview)
+        self.scrollbar.grid(row=1, column=1, sticky="ns", padx=(0, 10), pady=(0, 10))
+
+        self.canvas.bind("<Configure>", lambda e: self.redraw())
+        self.canvas.bind("<Button-1>", self._on_click)
+        self.canvas.bind("<Control-Button-1>", lambda e: self._on_click(e, toggle=True))
+        self.canvas.bind("<Shift-Button-1>", lambda e: self._on_click(e, extend=True))
+        self.canvas.bind("<Double-1>", self._on_double_click)
+        self.canvas.bind("<MouseWheel>", self._on_mousewheel)
+        self.canvas.bind("<Button-4>", lambda e: self.yview("scroll", -1, "units"))
+        self.canvas.bind("<Button-5>", lambda e: self.yview("scroll", 1, "units"))
+        self.bind("<Control-a>", lambda e: self._select_all())
+
+    # ------------ FOLDER ------------
+
+    def on_choose_folder(self):
+        folder = filedialog.askdirectory(parent=self, title="Alege un folder cu poze")
+        if folder:
+            self.open_folder(folder)
+
+    def open_folder(self, folder: str):
+        self.folder = folder
+        self.info_label.config(text=f"Caut poze în {folder}...")
+        # pe un disc de rețea listarea poate dura; nu blocăm fereastra
+        self.tasks.submit(
+            find_images,
+            folder,
+            False,
+            description=folder,
+            on_success=self._on_folder_listed,
+            on_error=lambda e: self.info_label.config(text=f"Nu pot citi folderul: {e}"),
+        )
+
+    def _on_folder_listed(self, paths: List[str]):
+        self.tasks.cancel_all()
+        self._pending.clear()
+        self._status_pending.clear()
+        self.paths = paths
+        self.selected.clear()
+        self._anchor = None
+        self._offset = 0
+        self._update_selection_ui()
+        self.redraw()
+
+    # ------------ IDENTIFICARE ------------
+
+    def selected_paths(self) -> List[str]:
+        return [self.paths[i] for i in sorted(self.selected)]
+
+    def on_identify_selected(self):
+        paths = self.selected_paths()
+        if paths:
+            self.on_identify(paths)
+
+    def on_identify_selected_group(self):
+        paths = self.selected_paths()
+        if 2 <= len(paths) <= MAX_IMAGES_PER_REQUEST:
+            self.on_identify_group(paths)
+
+    def mark_identified(self, image_path: str, result: dict):
+        """
+        Actualizează starea unei poze după ce a fost identificată din GUI.
+        """
+        if image_path not in self._status:
+            return
+        suggestions = result.get("suggestions") or []
+        top = suggestions[0] if suggestions else {}
+        self._status[image_path] = dict(
+            self._status[image_path] or {},
+            species=top.get("name") or "Fără sugestii",
+            probability=top.get("probability"),
+        )
+        self.redraw()
+
+    def close(self):
+        self.tasks.shutdown()
+        self._photos.clear()
+        self.destroy()
+
+    # ------------ GRILĂ ------------
+
+    def redraw(self):
+        if not self._redraw_pending:
+            self._redraw_pending = True
+            self.after_idle(self._redraw)
+
+    def yview(self, *args):
+        if not args:
+            return
+        if args[0] == "moveto":
+            self._offset = int(float(args[1]) * self._total_height())
+        elif args[0] == "scroll":
+            step = self.canvas.winfo_height() if args[2] == "pages" else CELL_HEIGHT // 2
+            self._offset += int(args[1]) * step
+        self._clamp_offset()
+        self.redraw()
+
+    def _columns(self) -> int:
+        return max(1, self.canvas.winfo_width() // CELL_WIDTH)
+
+    def _total_height(self) -> int:
+        rows = (len(self.paths) + self._columns() - 1) // self._columns()
+        return rows * CELL_HEIGHT
+
+    def _clamp_offset(self):
+        max_offset = max(0, self._total_height() - self.canvas.winfo_height())
+        self._offset = max(0, min(self._offset, max_offset))
+
+    def _visible_range(self):
+        columns = self._columns()
+        first_row = self._offset // CELL_HEIGHT
+        last_row = (self._offset + self.canvas.winfo_height()) // CELL_HEIGHT
+        return first_row * columns, min(len(self.paths), (last_row + 1) * columns)
+
+    def _redraw(self):
+        self._redraw_pending = False
+        self._clamp_offset()
+        self.canvas.delete("cell")
+
+        columns = self._columns()
+        first, last = self._visible_range()
+        visible_paths = set()
+
+        for index in range(first, last):
+            path = self.paths[index]
+            visible_paths.add(path)
+            x = (index % columns) * CELL_WIDTH
+            y = (index // columns) * CELL_HEIGHT - self._offset
+            self._draw_cell(index, path, x, y)
+
+            if path in self._photos:
+                if path not in self._status:
+                    self._request_status(path)
+            elif path not in self._failed:
+                self._request(path)
+
+        # ce a ieșit din fereastră și încă n-a pornit nu mai merită decodat
+        for pending in (self._pending, self._status_pending):
+            for path, task in list(pending.items()):
+                if path not in visible_paths and not task.future.running():
+                    task.cancel()
+                    del pending[path]
+
+        total = self._total_height()
+        height = self.canvas.winfo_height()
+        if total <= height:
+            self.scrollbar.set(0.0, 1.0)
+        else:
+            self.scrollbar.set(self._offset / total, (self._offset + height) / total)
+
+    def _draw_cell(self, index: int, path: str, x: int, y: int):
+        if index in self.selected:
+            self.canvas.create_rectangle(
+                x + 2, y + 2, x + CELL_WIDTH - 2, y + CELL_HEIGHT - 2,
+                fill="#dbeafe", outline="#2563eb", width=2, tags="cell",
+            )
+
+        thumb_center = (x + CELL_WIDTH // 2, y + 8 + GRID_THUMB_SIZE[1] // 2)
+        photo = self._photos.get(path)
+        if photo is not None:
+            self._photos.move_to_end(path)
+            self.canvas.create_image(*thumb_center, image=photo, tags="cell")
+        else:
+            placeholder = "⚠" if path in self._failed else "…"
+            self.canvas.create_text(*thumb_center, text=placeholder, fill="#9ca3af", tags="cell")
+
+        name = os.path.basename(path)
+        if len(name) > 22:
+            name = name[:10] + "…" + name[-10:]
+        text_y = y + GRID_THUMB_SIZE[1] + 20
+        self.canvas.create_text(
+            x + CELL_WIDTH // 2, text_y, text=name,
+            font=("Segoe UI", 8), fill="#111827", tags="cell",
+        )
+
+        status_text, color = self._status_text(path)
+        self.canvas.create_text(
+            x + CELL_WIDTH // 2, text_y + 16, text=status_text,
+            font=("Segoe UI", 8), fill=color, width=CELL_WIDTH - 8, tags="cell",
+        )
+
+    def _status_text(self, path: str):
+        status = self._status.get(path)
+        if status is None:
+            return "", "#6b7280"
+        if status["species"] is None:
+            return "neidentificată", "#9ca3af"
+        species = status["species"]
+        if len(species) > 20:
+            species = species[:19] + "…"
+        if status["probability"] is not None:
+            return f"✔ {species} ({status['probability'] * 100.0:.0f}%)", "#15803d"
+        return f"✔ {species}", "#15803d"
+
+    def _request(self, path: str):
+        if path in self._pending:
+            return
+        self._pending[path] = self.tasks.submit(
+            _load_cell,
+            path,
+            description=os.path.basename(path),
+            on_success=lambda loaded, p=path: self._on_cell_loaded(p, loaded),
+            on_error=lambda e, p=path: self._on_cell_failed(p),
+        )
+
+    def _request_status(self, path: str):
+        if path in self._status_pending:
+            return
+        self._status_pending[path] = self.tasks.submit(
+            lookup_status,
+            path,
+            description=os.path.basename(path),
+            on_success=lambda status, p=path: self._on_status_loaded(p, status),
+            on_error=lambda e, p=path: self._on_status_loaded(p, None),
+        )
+
+    def _on_cell_loaded(self, path: str, img):
+        from PIL import ImageTk  # pip install pillow
+
+        self._pending.pop(path, None)
+        # PhotoImage doar pe thread-ul Tk
+        self._photos[path] = ImageTk.PhotoImage(img)
+        while len(self._photos) > GALLERY_PHOTO_CACHE:
+            self._photos.popitem(last=False)
+        self.redraw()
+
+    def _on_status_loaded(self, path: str, status: Optional[Dict[str, Any]]):
+        self._status_pending.pop(path, None)
+        self._status[path] = status
+        self.redraw()
+
+    def _on_cell_failed(self, path: str):
+        self._pending.pop(path, None)
+        self._failed.add(path)
+        self.redraw()
+
+    # ------------ SELECȚIE ------------
+
+    def _index_at(self, x: int, y: int) -> Optional[int]:
+        column = x // CELL_WIDTH
+        if column >= self._columns():
+            return None
+        index = ((self._offset + y) // CELL_HEIGHT) * self._columns() + column
+        return index if 0 <= index < len(self.paths) else None
+
+    def _on_click(self, event, toggle: bool = False, extend: bool = False):
+        index = self._index_at(event.x, event.y)
+        if index is None:
+            return
+
+        if extend and self._anchor is not None:
+            low, high = sorted((self._anchor, index))
+            self.selected.update(range(low, high + 1))
+        elif toggle:
+            self.selected.symmetric_difference_update({index})
+            self._anchor = index
+        else:
+            self.selected = {index}
+            self._anchor = index
+
+        self._update_selection_ui()
+        self.redraw()
+
+    def _on_double_click(self, event):
+        index = self._index_at(event.x, event.y)
+        if index is not None:
+            self.on_identify([self.paths[index]])
+
+    def _on_mousewheel(self, event):
+        delta = event.delta // 120 if abs(event.delta) >= 120 else event.delta
+        self.yview("scroll", -delta, "units")
+
+    def _select_all(self):
+        self.selected = set(range(len(self.paths)))
+        self._update_selection_ui()
+        self.redraw()
+
+    def _update_selection_ui(self):
+        count = len(self.selected)
+        self.info_label.config(
+            text=f"{len(self.paths)} poze în {self.folder}"
+            + (f" • {count} selectate" if count else "")
+        )
+        self.btn_identify.config(
+            text=f"Identifică separat ({count})" if count else "Identifică separat",
+            state=tk.NORMAL if count else tk.DISABLED,
+        )
+        self.btn_identify_group.config(
+            state=tk.NORMAL if 2 <= count <= MAX_IMAGES_PER_REQUEST else tk.DISABLED
+        )
@@ -1,5 +1,8 @@
+import io
 import os
 import datetime
+from collections import OrderedDict
+from typing import List, Optional
 import tkinter as tk
 from tkinter import filedialog, messagebox
 from tkinter.scrolledtext import ScrolledText
@@ -7,9 +10,59 @@ from tkinter import ttk
 
 from PIL import Image, ImageTk  # pip install pillow
 
-from .api_client import identify_plant
-from .camera import capture_image_from_camera
-from .config import API_KEY
+from .api_client import (
+    MAX_IMAGES_PER_REQUEST,
+    format_upload_stats,
+    get_key_pool,
+    get_scheduler,
+    identify_plant,
+    identify_plant_group,
+)
+from .camera import AutoCapture, frame_to_rgb, get_camera_session
+from .config import CAMERA_PREVIEW_FPS
+from .history import get_history_store, result_names
+from .name_index import NameIndex
+from .profiling import dump_json, format_report, reset as reset_profiling, timed
+from .tasks import TkTaskRunner
+from .thumbnails import get_thumbnail_cache
+from .widgets import VirtualList
+
+
+# câte rânduri sumare din istoric ținem în memorie pentru lista afișată
+HISTORY_ROW_CACHE = 2000
+
+# ---------- DIAGNOSTIC ----------
+
+def format_scheduler_stats() -> str:
+    try:
+        scheduler = get_scheduler()
+    except RuntimeError:
+        # nicio cheie configurată: fereastra de diagnostic merge și fără
+        return "Cereri: cheia API nu este setată (vezi „Test API”)."
+    stats = scheduler.stats()
+    depth = scheduler.queue_depth()
+
+    quota = (
+        f"{stats['used_today']}/{stats['daily_quota']} azi"
+        if stats["daily_quota"]
+        else f"{stats['used_today']} azi, fără cotă"
+    )
+    rate = f"{stats['rate']:g}/s" if stats["rate"] > 0 else "fără limită"
+    return (
+        f"Cereri: {rate} (rafală {stats['burst']}), {quota}\n"
+        f"În așteptare: {depth['interactive']} interactive, {depth['batch']} batch\n"
+        f"Așteptare medie {stats['wait_mean_ms']:.1f} ms, maximă {stats['wait_max_ms']:.1f} ms"
+    )
+
+
+def format_thumbnail_stats() -> str:
+    stats = get_thumbnail_cache().stats()
+    return (
+        f"Miniaturi: {stats['memory_entries']} în memorie, {stats['disk_entries']} pe disc "
+        f"({stats['disk_bytes'] / 1024 / 1024:.1f} MB)\n"
+        f"Găsite în memorie {stats['memory_hits']}, pe disc {stats['disk_hits']}, "
+        f"decodate {stats['misses']} (rată {stats['hit_rate'] * 100:.0f}%)"
+    )
 
 
 # ---------- FORMATĂM REZULTATUL PENTRU TEXT ----------
@@ -49,6 +102,9 @@ def format_identification_result_from_data(image_path: str, result: dict) -> str
             lines.append(f"   Info: {url}")
         lines.append("")
 
+    if result.get("upload"):
+        lines.append(format_upload_stats(result["upload"]))
+
     return "\n".join(lines)
 
 
@@ -196,13 +252,76 @@ class PaldApp(tk.Tk):
         )
         self.btn_gallery.grid(row=0, column=1, padx=(4, 0), pady=2, sticky="ew")
 
+        self.btn_group = ttk.Button(
+            buttons_frame,
+            text="🌿 Mai multe poze (același exemplar)",
+            command=self.on_choose_group,
+            style="Secondary.TButton",
+        )
+        self.btn_group.grid(row=3, column=0, columnspan=2, pady=(6, 0), sticky="ew")
+
+        self.btn_folder = ttk.Button(
+            buttons_frame,
+            text="🗂️ Galerie folder",
+            command=self.on_open_gallery,
+            style="Secondary.TButton",
+        )
+        self.btn_folder.grid(row=4, column=0, columnspan=2, pady=(6, 0), sticky="ew")
+
         self.btn_test_api = ttk.Button(
             buttons_frame,
             text="🔑 Test API",
             command=self.on_test_api,
             style="Secondary.TButton",
         )
-        self.btn_test_api.grid(row=1, column=0, columnspan=2, pady=(6, 0), sticky="ew")
+        self.btn_test_api.grid(row=2, column=0, padx=(0, 4), pady=(6, 0), sticky="ew")
+
+        self.btn_diagnostics = ttk.Button(
+            buttons_frame,
+            text="📊 Diagnostic",
+            command=self.on_diagnostics,
+            style="Secondary.TButton",
+        )
+        self.btn_diagnostics.grid(row=2, column=1, padx=(4, 0), pady=(6, 0), sticky="ew")
+
+        # apar doar cât timp rulează previzualizarea camerei
+        self.camera_controls = tk.Frame(buttons_frame, bg="white")
+        self.camera_controls.grid(row=1, column=0, columnspan=2, pady=(6, 0), sticky="ew")
+        self.camera_controls.columnconfigure(1, weight=1)
+
+        self.btn_camera_stop = ttk.Button(
+            self.camera_controls,
+            text="⏹ Oprește camera",
+            command=self.stop_camera_preview,
+            style="Secondary.TButton",
+        )
+        self.btn_camera_stop.grid(row=0, column=0, columnspan=2, sticky="ew")
+
+        self.auto_capture_var = tk.BooleanVar(value=False)
+        auto_check = tk.Checkbutton(
+            self.camera_controls,
+            text="Poză automată când imaginea e clară",
+            variable=self.auto_capture_var,
+            bg="white",
+            activebackground="white",
+            font=("Segoe UI", 9),
+            anchor="w",
+        )
+        auto_check.grid(row=1, column=0, columnspan=2, sticky="w", pady=(4, 0))
+
+        self.focus_label = tk.Label(
+            self.camera_controls,
+            text="Claritate: -",
+            bg="white",
+            fg="#4b5563",
+            font=("Segoe UI", 8),
+        )
+        self.focus_label.grid(row=2, column=0, sticky="w", padx=(0, 6))
+
+        self.focus_meter = ttk.Progressbar(self.camera_controls, mode="determinate", maximum=100)
+        self.focus_meter.grid(row=2, column=1, sticky="ew")
+
+        self.camera_controls.grid_remove()
 
         # ---------- CARD DREAPTA: TEXT + ISTORIC ----------
         right_card = ttk.Frame(content, style="Card.TFrame")
@@ -245,29 +364,49 @@ class PaldApp(tk.Tk):
 
         history_frame = tk.Frame(right_card, bg="white")
         history_frame.grid(row=3, column=0, sticky="nsew", padx=14, pady=(0, 12))
-        history_frame.rowconfigure(0, weight=1)
+        history_frame.rowconfigure(1, weight=1)
         history_frame.columnconfigure(0, weight=1)
 
-        self.history_listbox = tk.Listbox(
-            history_frame,
-            bg="#f9fafb",
-            fg="#111827",
-            font=("Segoe UI", 9),
-            borderwidth=0,
-            activestyle="none",
-        )
-        self.history_listbox.grid(row=0, column=0, sticky="nsew")
+        # căutare după specie (nume științific sau comun), pe măsură ce tastăm
+        search_bar = tk.Frame(history_frame, bg="white")
+        search_bar.grid(row=0, column=0, sticky="ew", pady=(0, 4))
+        search_bar.columnconfigure(1, weight=1)
 
-        scrollbar = tk.Scrollbar(history_frame, orient="vertical")
-        scrollbar.grid(row=0, column=1, sticky="ns")
-        self.history_listbox.config(yscrollcommand=scrollbar.set)
-        scrollbar.config(command=self.history_listbox.yview)
+        tk.Label(
+            search_bar, text="🔎", bg="white", fg="#6b7280", font=("Segoe UI", 9)
+        ).grid(row=0, column=0, padx=(0, 4))
 
-        # 🔹 aici facem LISTA clicabilă
-        self.history_listbox.bind("<Double-1>", self.on_history_double_click)
+        self.history_query = tk.StringVar()
+        self.history_search = ttk.Entry(search_bar, textvariable=self.history_query)
+        self.history_search.grid(row=0, column=1, sticky="ew")
+        self.history_search.bind("<KeyRelease>", lambda e: self._schedule_history_search())
 
-        # listă internă cu datele fiecărei identificări
-        self.history_entries = []
+        self.history_count_label = tk.Label(
+            search_bar,
+            text="Se încarcă istoricul...",
+            bg="white",
+            fg="#6b7280",
+            font=("Segoe UI", 8),
+        )
+        self.history_count_label.grid(row=0, column=2, padx=(6, 0))
+
+        # 🔹 aici facem LISTA clicabilă; desenează doar rândurile vizibile
+        self.history_list = VirtualList(
+            history_frame,
+            row_text=self._history_row_at,
+            on_activate=self.on_history_activate,
+            on_visible=self._prefetch_history_rows,
+        )
+        self.history_list.grid(row=1, column=0, sticky="nsew")
+
+        # istoricul stă în SQLite; lista afișată e doar o listă de id-uri
+        # (toate sau cele găsite la căutare), iar rândurile sumare se citesc
+        # abia când devin vizibile (rezultatul complet la dublu-click)
+        self.history = get_history_store()
+        self.name_index: Optional[NameIndex] = None
+        self.history_ids: List[int] = []
+        self._history_rows: "OrderedDict[int, dict]" = OrderedDict()
+        self._history_search_job = None
 
         # ---------- STATUS ----------
         status_bar = tk.Frame(self, bg="#f3f4f6")
@@ -281,21 +420,57 @@ class PaldApp(tk.Tk):
             font=("Segoe UI", 8),
             anchor="w",
         )
-        self.status_label.pack(fill="x")
+        self.status_label.pack(side="left", fill="x", expand=True)
+
+        self.btn_cancel = ttk.Button(
+            status_bar,
+            text="✖ Anulează",
+            command=self.on_cancel,
+            style="Secondary.TButton",
+            state=tk.DISABLED,
+        )
+        self.btn_cancel.pack(side="right", padx=(8, 0))
+
+        self.progress = ttk.Progressbar(status_bar, mode="indeterminate", length=140)
+        self.progress.pack(side="right")
+
+        # ---------- LUCRU ÎN FUNDAL ----------
+        # camera și apelurile Plant.id rulează pe thread-uri separate,
+        # ca fereastra să nu înghețe cât așteptăm răspunsul
+        self.tasks = TkTaskRunner(self, max_workers=3, on_change=self._on_tasks_changed)
+        self._camera_task = None
+        self._progress_running = False
+        self._build_name_index()
+
+        # ---------- CAMERĂ LIVE ----------
+        # camera rămâne deschisă între poze (se eliberează singură după o
+        # perioadă fără folosire); cadrele vin pe thread-ul ei, aici doar le desenăm
+        self.camera = get_camera_session()
+        self._previewing = False
+        self._preview_job = None
+        self.auto_capture = AutoCapture()
+        self._preview_frame_id = -1
+
+        # fereastra de galerie, dacă e deschisă
+        self.gallery = None
+
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
 
     # ------------ UTILS ------------
 
+    @timed("gui.set_result_text")
     def set_result_text(self, text: str):
         self.result_text.configure(state=tk.NORMAL)
         self.result_text.delete("1.0", tk.END)
         self.result_text.insert(tk.END, text)
         self.result_text.configure(state=tk.DISABLED)
 
+    @timed("gui.show_image_preview")
     def show_image_preview(self, image_path: str):
+        # miniatura vine din cache (memorie / disc); la prima afișare e
+        # decodată direct la rezoluție redusă
         try:
-            img = Image.open(image_path)
-            img.thumbnail((350, 350))
-            self._current_image_tk = ImageTk.PhotoImage(img)
+            photo = get_thumbnail_cache().photo(image_path)
         except Exception as e:
             self._current_image_tk = None
             self.image_label.config(
@@ -304,65 +479,312 @@ class PaldApp(tk.Tk):
             )
             return
 
+        self._current_image_tk = photo
+        self.image_label.config(image=self._current_image_tk, text="")
+
+    @timed("gui.show_pil_preview")
+    def show_pil_preview(self, img):
+        self._current_image_tk = ImageTk.PhotoImage(img)
         self.image_label.config(image=self._current_image_tk, text="")
 
-    def add_to_history(self, image_path: str, result: dict):
+    def add_to_history(
+        self,
+        image_path: Optional[str],
+        result: dict,
+        label: Optional[str] = None,
+        preview=None,
+    ):
         """
-        Adaugă o intrare în panoul de istoric.
+        Salvează identificarea în istoric și o pune în capul listei.
+        Pozele de la cameră nu au fișier pe disc: pentru ele păstrăm
+        `label` (ce afișăm în loc de nume) și o miniatură JPEG a lui `preview`.
         """
-        suggestions = result.get("suggestions") or []
-        if suggestions:
-            top = suggestions[0]
-            name = top.get("name", "Necunoscut")
-            prob = float(top.get("probability", 0.0)) * 100.0
-            main_text = f"{name} ({prob:.1f}%)"
+        thumbnail = None
+        if preview is not None and not (image_path and os.path.isfile(image_path)):
+            buf = io.BytesIO()
+            preview.convert("RGB").save(buf, format="JPEG", quality=80)
+            thumbnail = buf.getvalue()
+
+        entry_id = self.history.add(
+            result, image_path=image_path, label=label, thumbnail=thumbnail
+        )
+
+        # cât timp indexul se construiește, intrarea nouă o prinde construirea
+        if self.name_index is not None:
+            self.name_index.add(entry_id, "|".join(result_names(result)))
+            # cel mai nou sus, dacă se potrivește cu ce căutăm acum
+            self._run_history_search(keep_position=True)
+
+    def _history_row_text(self, row: dict) -> str:
+        if row["species"]:
+            main_text = f"{row['species']} ({(row['probability'] or 0.0) * 100.0:.1f}%)"
         else:
             main_text = "Fără sugestii"
 
-        timestamp = datetime.datetime.now().strftime("%H:%M:%S")
-        filename = os.path.basename(image_path)
+        created = datetime.datetime.fromtimestamp(row["created"])
+        if created.date() == datetime.date.today():
+            timestamp = created.strftime("%H:%M:%S")
+        else:
+            timestamp = created.strftime("%d.%m.%Y %H:%M")
 
-        entry_text = f"[{timestamp}] {main_text}  —  {filename}"
-        # cel mai nou sus
-        self.history_listbox.insert(0, entry_text)
+        filename = row["label"] or os.path.basename(row["image_path"] or "")
+        return f"[{timestamp}] {main_text}  —  {filename}"
 
-        self.history_entries.insert(
-            0,
-            {
-                "time": timestamp,
-                "image": image_path,
-                "summary": main_text,
-                "raw": result,
-            },
+    def _history_row_at(self, index: int) -> str:
+        row = self._history_rows.get(self.history_ids[index])
+        return self._history_row_text(row) if row is not None else "..."
+
+    def _prefetch_history_rows(self, first: int, last: int):
+        """
+        Citește dintr-o singură interogare rândurile vizibile care lipsesc
+        din cache; cache-ul e LRU, limitat la HISTORY_ROW_CACHE rânduri.
+        """
+        visible = self.history_ids[first:last]
+        missing = [i for i in visible if i not in self._history_rows]
+        if missing:
+            self._history_rows.update(self.history.summaries(missing))
+
+        for entry_id in visible:
+            if entry_id in self._history_rows:
+                self._history_rows.move_to_end(entry_id)
+        while len(self._history_rows) > HISTORY_ROW_CACHE:
+            self._history_rows.popitem(last=False)
+
+    def _build_name_index(self):
+        # citim numele din toată baza pe un thread de lucru, nu pe cel Tk
+        self.tasks.submit(
+            lambda: NameIndex().build(self.history.iter_names()),
+            description="index istoric",
+            on_success=self._on_name_index_built,
+            on_error=lambda e: self.history_count_label.config(text=f"Istoric indisponibil: {e}"),
         )
 
-    # ------------ HANDLERE BUTOANE ------------
+    def _on_name_index_built(self, index: NameIndex):
+        # intrările salvate cât rula construirea (dacă au scăpat)
+        index.build(self.history.iter_names(after_id=index.last_id))
+        self.name_index = index
+        self._run_history_search()
 
-    def on_take_photo(self):
-        self.set_result_text("Pornește camera... Închide fereastra de cameră după ce faci poza.")
-        self.update_idletasks()
+    def _schedule_history_search(self):
+        # o singură căutare per rafală de taste
+        if self._history_search_job is None:
+            self._history_search_job = self.after_idle(self._run_history_search)
 
-        image_path = capture_image_from_camera()
-        if not image_path:
-            self.set_result_text("Captură anulată sau a apărut o problemă la cameră.")
+    def _run_history_search(self, keep_position: bool = False):
+        self._history_search_job = None
+        if self.name_index is None:
             return
 
+        query = self.history_query.get().strip()
+        self.history_ids = self.name_index.search(query)
+        self.history_list.set_count(len(self.history_ids), keep_position=keep_position)
+
+        total = len(self.name_index)
+        if query:
+            self.history_count_label.config(text=f"{len(self.history_ids)} din {total}")
+        else:
+            self.history_count_label.config(text=f"{total} intrări")
+
+    # ------------ IDENTIFICARE ÎN FUNDAL ------------
+
+    def _start_identification(self, image_path: str):
+        """
+        Pune identificarea în coadă; rezultatul vine prin _on_identified.
+        Se pot pune mai multe una după alta, UI-ul rămâne liber.
+        """
         self.show_image_preview(image_path)
+        self.set_result_text("Identificare în curs, te rog așteaptă...")
+
+        self.tasks.submit(
+            identify_plant,
+            image_path,
+            description=os.path.basename(image_path),
+            on_success=lambda result, p=image_path: self._on_identified(p, result),
+            on_error=lambda e: self.set_result_text(f"Eroare la apelul Plant.id:\n{e}"),
+        )
 
+    def _start_group_identification(self, image_paths: List[str]):
+        """
+        Mai multe poze ale aceluiași exemplar, trimise într-o singură cerere.
+        În previzualizare și în istoric apare prima poză.
+        """
+        names = ", ".join(os.path.basename(p) for p in image_paths)
+        label = f"{len(image_paths)} poze: {names}"
+
+        self.show_image_preview(image_paths[0])
         self.set_result_text("Identificare în curs, te rog așteaptă...")
-        self.update_idletasks()
 
-        try:
-            result = identify_plant(image_path)
-        except Exception as e:
-            self.set_result_text(f"Eroare la apelul Plant.id:\n{e}")
-            return
+        self.tasks.submit(
+            identify_plant_group,
+            image_paths,
+            description=label,
+            on_success=lambda result, p=image_paths[0]: self._on_identified(
+                p, result, label=label
+            ),
+            on_error=lambda e: self.set_result_text(f"Eroare la apelul Plant.id:\n{e}"),
+        )
+
+    def _start_frame_identification(self, frame):
+        """
+        Ca _start_identification, dar pentru un cadru de la cameră: cadrul
+        merge direct în cerere (codat JPEG în memorie), fără fișier temporar.
+        """
+        preview = Image.fromarray(frame_to_rgb(frame))
+        preview.thumbnail((350, 350))
+        label = "Captură cameră " + datetime.datetime.now().strftime("%H:%M:%S")
+
+        self.show_pil_preview(preview)
+        self.set_result_text("Identificare în curs, te rog așteaptă...")
+
+        self.tasks.submit(
+            identify_plant,
+            frame,
+            description=label,
+            on_success=lambda result: self._on_identified(
+                None, result, label=label, preview=preview
+            ),
+            on_error=lambda e: self.set_result_text(f"Eroare la apelul Plant.id:\n{e}"),
+        )
 
-        text = format_identification_result_from_data(image_path, result)
+    def _on_identified(
+        self,
+        image_path: Optional[str],
+        result: dict,
+        label: Optional[str] = None,
+        preview=None,
+    ):
+        if preview is not None:
+            self.show_pil_preview(preview)
+        else:
+            self.show_image_preview(image_path)
+        text = format_identification_result_from_data(label or image_path, result)
         self.set_result_text(text)
-        self.add_to_history(image_path, result)
+
+        if self.gallery is not None and image_path and label is None:
+            self.gallery.mark_identified(image_path, result)
+
+        # aceeași plantă pozată de mai multe ori sau aceeași poză trimisă de
+        # două ori în paralel: intrarea din istoric există deja
+        if (result.get("upload") or {}).get("source") in ("near_duplicate", "coalesced"):
+            return
+        self.add_to_history(image_path, result, label=label, preview=preview)
+
+    def _on_tasks_changed(self, active: int):
+        if self._camera_task is not None and (
+            self._camera_task.cancelled or self._camera_task.future.done()
+        ):
+            self._camera_task = None
+            self.btn_camera.config(state=tk.NORMAL)
+
+        if active:
+            if not self._progress_running:
+                self.progress.start(12)
+                self._progress_running = True
+            self.btn_cancel.config(state=tk.NORMAL)
+            self.status_label.config(text=f"În lucru: {active}")
+        else:
+            if self._progress_running:
+                self.progress.stop()
+                self._progress_running = False
+            self.btn_cancel.config(state=tk.DISABLED)
+            self.status_label.config(text="")
+
+    # ------------ CAMERĂ LIVE ------------
+
+    def start_camera_preview(self):
+        self.set_result_text("Pornește camera...")
+        # dacă a fost eliberată, redeschiderea poate dura 1-2 s, deci nu pe thread-ul Tk
+        self.btn_camera.config(state=tk.DISABLED)
+        self._camera_task = self.tasks.submit(
+            self.camera.open,
+            description="cameră",
+            on_success=self._on_camera_started,
+            on_error=lambda e: self.set_result_text(f"Eroare la cameră:\n{e}"),
+        )
+
+    def _on_camera_started(self, opened: bool):
+        if not opened:
+            self.set_result_text("Nu s-a putut deschide camera!")
+            return
+
+        self._previewing = True
+        self.btn_camera.config(text="📸 Fă poza")
+        self.camera_controls.grid()
+        self.set_result_text("Camera pornită. Apasă „Fă poza” când planta e în cadru.")
+        self._preview_frame_id = -1
+        self.auto_capture.reset()
+        self._preview_tick()
+
+    def _preview_tick(self):
+        """
+        Desenează cel mai nou cadru în panoul de imagine, de cel mult
+        CAMERA_PREVIEW_FPS ori pe secundă.
+        """
+        self._preview_job = None
+        if not self._previewing or not self.camera.is_open:
+            return
+
+        # desenăm doar dacă a venit un cadru nou de la ultima desenare
+        frame_id = self.camera.frame_id
+        frame = self.camera.latest()
+        if frame is not None and frame_id != self._preview_frame_id:
+            self._preview_frame_id = frame_id
+            img = Image.fromarray(frame_to_rgb(frame))
+            img.thumbnail((350, 350))
+            self._current_image_tk = ImageTk.PhotoImage(img)
+            self.image_label.config(image=self._current_image_tk, text="")
+
+            # scorul de claritate merge și la indicator, și la auto-captură
+            best = self.auto_capture.update(frame)
+            self._update_focus_meter(self.auto_capture.last_score)
+            if best is not None and self.auto_capture_var.get():
+                self.stop_camera_preview()
+                self._start_frame_identification(best)
+                return
+
+        delay_ms = max(1, int(1000 / max(1, CAMERA_PREVIEW_FPS)))
+        self._preview_job = self.after(delay_ms, self._preview_tick)
+
+    def _update_focus_meter(self, score: float):
+        threshold = self.auto_capture.threshold
+        # bara e plină la dublul pragului; pragul e la jumătate
+        self.focus_meter["value"] = min(100.0, score / (2 * threshold) * 100.0)
+        state = "clar" if score >= threshold else "neclar"
+        self.focus_label.config(text=f"Claritate: {score:.0f} ({state})")
+
+    def stop_camera_preview(self):
+        if self._preview_job is not None:
+            self.after_cancel(self._preview_job)
+            self._preview_job = None
+
+        # nu închidem camera: următoarea poză pornește instant
+        self._previewing = False
+
+        self.btn_camera.config(text="📷 Fă poză cu camera")
+        self.camera_controls.grid_remove()
+
+    def snap_photo(self):
+        frame = self.camera.latest()
+        self.stop_camera_preview()
+
+        if frame is None:
+            self.set_result_text("Nu pot citi frame de la camera.")
+            return
+
+        self._start_frame_identification(frame)
+
+    # ------------ HANDLERE BUTOANE ------------
+
+    def on_take_photo(self):
+        # primul click pornește previzualizarea, al doilea face poza
+        if self._previewing:
+            self.snap_photo()
+        else:
+            self.start_camera_preview()
 
     def on_choose_from_gallery(self):
+        self.stop_camera_preview()
+
         filetypes = [
             ("Imagini", "*.jpg *.jpeg *.png *.bmp *.gif"),
             ("Toate fișierele", "*.*"),
@@ -379,71 +801,190 @@ class PaldApp(tk.Tk):
             messagebox.showerror("Eroare", "Fișierul selectat nu există.")
             return
 
-        self.show_image_preview(filename)
+        self._start_identification(filename)
 
-        self.set_result_text("Identificare în curs, te rog așteaptă...")
-        self.update_idletasks()
+    def on_choose_group(self):
+        self.stop_camera_preview()
 
-        try:
-            result = identify_plant(filename)
-        except Exception as e:
-            self.set_result_text(f"Eroare la apelul Plant.id:\n{e}")
+        filetypes = [
+            ("Imagini", "*.jpg *.jpeg *.png *.bmp *.gif"),
+            ("Toate fișierele", "*.*"),
+        ]
+        filenames = filedialog.askopenfilenames(
+            title="Alege mai multe poze ale aceleiași plante (frunză, floare, tulpină...)",
+            filetypes=filetypes,
+        )
+
+        filenames = [f for f in filenames if os.path.isfile(f)]
+        if not filenames:
             return
 
-        text = format_identification_result_from_data(filename, result)
-        self.set_result_text(text)
-        self.add_to_history(filename, result)
+        if len(filenames) > MAX_IMAGES_PER_REQUEST:
+            messagebox.showerror(
+                "Eroare",
+                f"Poți alege cel mult {MAX_IMAGES_PER_REQUEST} poze pentru un exemplar.",
+            )
+            return
+
+        if len(filenames) == 1:
+            self._start_identification(filenames[0])
+        else:
+            self._start_group_identification(filenames)
+
+    def on_open_gallery(self):
+        self.stop_camera_preview()
+
+        if self.gallery is not None and self.gallery.winfo_exists():
+            self.gallery.lift()
+            self.gallery.on_choose_folder()
+            return
+
+        folder = filedialog.askdirectory(title="Alege un folder cu poze")
+        if not folder:
+            return
+
+        # importat abia aici: galeria nu e necesară la pornire
+        from .gallery import GalleryWindow
+
+        self.gallery = GalleryWindow(
+            self,
+            on_identify=self._identify_from_gallery,
+            on_identify_group=self._start_group_identification,
+            folder=folder,
+        )
+        self.gallery.bind(
+            "<Destroy>",
+            lambda e: setattr(self, "gallery", None) if e.widget is self.gallery else None,
+        )
+
+    def _identify_from_gallery(self, image_paths: List[str]):
+        # fiecare poză e o cerere separată; coada de task-uri le ia pe rând
+        for image_path in image_paths:
+            self._start_identification(image_path)
+
+    def on_cancel(self):
+        cancelled = self.tasks.cancel_all()
+        if cancelled:
+            self.set_result_text(f"Am anulat {cancelled} operații în curs / în coadă.")
+        # indexul istoricului nu e o operație a utilizatorului: îl repornim
+        if self.name_index is None:
+            self._build_name_index()
+
+    def on_close(self):
+        self.stop_camera_preview()
+        self.camera.close()
+        self.tasks.shutdown()
+        self.destroy()
 
     def on_test_api(self):
-        if not API_KEY:
+        try:
+            keys = get_key_pool().stats()
+        except RuntimeError:
+            # nicio cheie configurată
+            keys = []
+        if not keys:
             messagebox.showerror(
                 "Test API",
                 "Cheia API nu este setată.\n\n"
                 "Verifică fișierul .env:\n"
-                "PLANT_ID_API_KEY=... și repornește aplicația.",
+                "PLANT_ID_API_KEY=... (sau PLANT_ID_API_KEYS=cheie1,cheie2) "
+                "și repornește aplicația.",
             )
             return
 
-        masked_start = API_KEY[:4]
-        length = len(API_KEY)
+        lines = []
+        for k in keys:
+            if k["available"]:
+                state = "disponibilă"
+            else:
+                state = f"blocată încă {k['quarantined_for']:.0f}s (ultimul status {k['last_status']})"
+            lines.append(f"  {k['key']}  —  {state}, {k['used_today']} cereri azi")
 
         message = (
-            "Cheia API a fost găsită și încărcată din .env.\n\n"
-            f"Primele caractere: {masked_start}***\n"
-            f"Lungime: {length} caractere\n\n"
-            "Asta înseamnă că aplicația poate folosi cheia.\n"
+            f"Am găsit {len(keys)} cheie/chei API:\n\n"
+            + "\n".join(lines)
+            + "\n\nCererile sunt împărțite între chei; o cheie care primește "
+            "401/403 sau 429 e pusă deoparte o vreme și se folosesc celelalte.\n"
             "Pentru a testa complet, încearcă să identifici o poză.\n"
             "Dacă primești eroare 401/403, cheia este greșită sau expirată."
         )
 
         messagebox.showinfo("Test API", message)
 
+    def on_diagnostics(self):
+        """
+        Fereastră cu timpii pe etape (citire, preprocesare, upload, randare...),
+        ca să vedem unde se duce timpul unei identificări lente.
+        """
+        window = tk.Toplevel(self)
+        window.title("Pald • Diagnostic")
+        window.geometry("640x360")
+        window.configure(bg="white")
+
+        report = ScrolledText(
+            window,
+            wrap=tk.NONE,
+            font=("Consolas", 9),
+            bg="#f9fafb",
+            fg="#111827",
+            borderwidth=0,
+        )
+        report.pack(fill="both", expand=True, padx=10, pady=(10, 6))
+
+        def refresh():
+            report.configure(state=tk.NORMAL)
+            report.delete("1.0", tk.END)
+            report.insert(tk.END, format_report())
+            report.insert(tk.END, "\n\n" + format_scheduler_stats())
+            report.insert(tk.END, "\n\n" + format_thumbnail_stats())
+            report.configure(state=tk.DISABLED)
+
+        def save_json():
+            path = filedialog.asksaveasfilename(
+                parent=window,
+                title="Salvează măsurătorile",
+                defaultextension=".json",
+                filetypes=[("JSON", "*.json")],
+            )
+            if path:
+                dump_json(path)
+
+        def clear():
+            reset_profiling()
+            refresh()
+
+        actions = tk.Frame(window, bg="white")
+        actions.pack(fill="x", padx=10, pady=(0, 10))
+        ttk.Button(actions, text="Reîmprospătează", command=refresh, style="Secondary.TButton").pack(side="left")
+        ttk.Button(actions, text="Salvează JSON…", command=save_json, style="Secondary.TButton").pack(side="left", padx=6)
+        ttk.Button(actions, text="Resetează", command=clear, style="Secondary.TButton").pack(side="left")
+
+        refresh()
+
     # ---------- HANDLER DUBLU-CLICK PE ISTORIC ----------
 
-    def on_history_double_click(self, event):
+    def on_history_activate(self, index: int):
         """
-        La dublu-click pe o intrare din istoric:
+        La dublu-click (sau Enter) pe o intrare din istoric:
         - reafișăm poza
-        - reafișăm rezultatul complet
+        - reafișăm rezultatul complet (citit acum din baza de date)
         """
-        selection = self.history_listbox.curselection()
-        if selection:
-            index = selection[0]
-        else:
-            # dacă dintr-un motiv nu e selectat nimic, luăm linia cea mai apropiată de click
-            index = self.history_listbox.nearest(event.y)
-
-        if index < 0 or index >= len(self.history_entries):
+        if index < 0 or index >= len(self.history_ids):
             return
 
-        entry = self.history_entries[index]
-        image_path = entry["image"]
-        result = entry["raw"]
+        entry = self.history.get(self.history_ids[index])
+        if entry is None:
+            return
+        image_path = entry["image_path"]
 
-        if os.path.isfile(image_path):
+        if image_path and os.path.isfile(image_path):
             self.show_image_preview(image_path)
+        elif entry["thumbnail"]:
+            self.show_pil_preview(Image.open(io.BytesIO(entry["thumbnail"])))
 
-        text = format_identification_result_from_data(image_path, result)
+        text = format_identification_result_from_data(
+            entry["label"] or image_path, entry["result"]
+        )
         self.set_result_text(text)
 
 
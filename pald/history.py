@@ -0,0 +1,323 @@
+import argparse
+import datetime
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from .config import HISTORY_DB
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS identifications (
+    id INTEGER PRIMARY KEY,
+    created REAL NOT NULL,
+    image_path TEXT,
+    image_hash TEXT,
+    label TEXT,
+    species TEXT,
+    probability REAL,
+    names TEXT NOT NULL DEFAULT '',
+    is_plant INTEGER NOT NULL DEFAULT 0,
+    result TEXT NOT NULL,
+    thumbnail BLOB
+);
+CREATE INDEX IF NOT EXISTS idx_identifications_created ON identifications (created);
+CREATE INDEX IF NOT EXISTS idx_identifications_species ON identifications (species COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_identifications_image_hash ON identifications (image_hash);
+"""
+
+# coloanele pentru liste: fără rezultatul complet și fără miniatură
+_SUMMARY_COLUMNS = "id, created, image_path, image_hash, label, species, probability, is_plant"
+
+
+def result_names(result: Dict[str, Any]) -> List[str]:
+    """
+    Numele speciei propuse (științific + comune), pentru căutare.
+    """
+    suggestions = result.get("suggestions") or []
+    if not suggestions:
+        return []
+    top = suggestions[0]
+    names = [top.get("name") or ""] + list(top.get("common_names") or [])
+    return [n for n in names if n]
+
+
+class HistoryStore:
+    """
+    Istoricul identificărilor, într-o bază SQLite pe disc.
+
+    Rândurile se citesc pe pagini (`page`) sau după id (`summaries`), deci
+    interfața ține în memorie doar ce afișează; rezultatul complet și
+    miniatura se încarcă abia la `get`. Baza e în modul WAL, ca GUI-ul
+    și `python -m pald history` să o poată folosi în același timp.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=10.0)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # cu WAL, NORMAL e sigur la căderi de aplicație și mult mai rapid la scriere
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+
+    def add(
+        self,
+        result: Dict[str, Any],
+        image_path: Optional[str] = None,
+        label: Optional[str] = None,
+        image_hash: Optional[str] = None,
+        thumbnail: Optional[bytes] = None,
+        created: Optional[float] = None,
+    ) -> int:
+        """
+        Salvează o identificare; întoarce id-ul ei. `thumbnail` (JPEG mic)
+        e pentru pozele care nu există ca fișier, de ex. capturile de cameră.
+        """
+        suggestions = result.get("suggestions") or []
+        top = suggestions[0] if suggestions else {}
+        if image_hash is None:
+            image_hash = (result.get("upload") or {}).get("content_hash")
+
+        row = (
+            created if created is not None else time.time(),
+            image_path,
+            image_hash,
+            label,
+            top.get("name"),
+            float(top["probability"]) if "probability" in top else None,
+            "|".join(result_names(result)).lower(),
+            int(bool(result.get("is_plant"))),
+            json.dumps(result, ensure_ascii=False),
+            thumbnail,
+        )
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT INTO identifications (created, image_path, image_hash, label,"
+                " species, probability, names, is_plant, result, thumbnail)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                row,
+            )
+            self._conn.commit()
+            return cursor.lastrowid
+
+    def count(self, species: Optional[str] = None) -> int:
+        where, params = self._filters(species=species)
+        with self._lock:
+            return self._conn.execute(
+                f"SELECT COUNT(*) FROM identifications{where}", params
+            ).fetchone()[0]
+
+    def page(
+        self,
+        offset: int = 0,
+        limit: int = 100,
+        species: Optional[str] = None,
+        image_hash: Optional[str] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        O pagină de rânduri sumare (fără rezultatul complet), cele mai noi primele.
+        `species` caută după începutul numelui științific.
+        """
+        where, params = self._filters(species, image_hash, since, until)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {_SUMMARY_COLUMNS} FROM identifications{where}"
+                " ORDER BY created DESC, id DESC LIMIT ? OFFSET ?",
+                params + [limit, offset],
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def summary(self, entry_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Rândul sumar (ca în `page`) al unei singure intrări.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {_SUMMARY_COLUMNS} FROM identifications WHERE id = ?", (entry_id,)
+            ).fetchone()
+        return dict(row) if row is not None else None
+
+    def summaries(self, ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        """
+        Rândurile sumare pentru mai multe id-uri odată (de ex. rândurile
+        vizibile într-o listă), după id. Id-urile care nu există lipsesc.
+        """
+        if not ids:
+            return {}
+        placeholders = ", ".join("?" * len(ids))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {_SUMMARY_COLUMNS} FROM identifications WHERE id IN ({placeholders})",
+                list(ids),
+            ).fetchall()
+        return {row["id"]: dict(row) for row in rows}
+
+    def get(self, entry_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Intrarea completă: rezultatul (dict) și miniatura (bytes sau None).
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM identifications WHERE id = ?", (entry_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        entry = dict(row)
+        entry["result"] = json.loads(entry["result"])
+        return entry
+
+    def iter_names(self, after_id: int = 0, batch_size: int = 5000):
+        """
+        (id, names) pentru intrările cu id > `after_id`, în ordinea inserării,
+        citite pe bucăți; pentru construirea indexului de căutare.
+        """
+        last_id = after_id
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT id, names FROM identifications"
+                    " WHERE id > ? ORDER BY id LIMIT ?",
+                    (last_id, batch_size),
+                ).fetchall()
+            if not rows:
+                return
+            for row in rows:
+                yield row["id"], row["names"]
+            last_id = rows[-1]["id"]
+
+    def delete(self, entry_id: int) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM identifications WHERE id = ?", (entry_id,))
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    # ------------ INTERN ------------
+
+    @staticmethod
+    def _filters(
+        species: Optional[str] = None,
+        image_hash: Optional[str] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+    ):
+        clauses, params = [], []
+        if species:
+            # prefix pe coloana indexată COLLATE NOCASE: SQLite folosește indexul
+            clauses.append("species LIKE ? ESCAPE '\\'")
+            escaped = species.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            params.append(escaped + "%")
+        if image_hash:
+            clauses.append("image_hash = ?")
+            params.append(image_hash)
+        if since is not None:
+            clauses.append("created >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("created < ?")
+            params.append(until)
+        where = (" WHERE " + " AND ".join(clauses)) if clauses else ""
+        return where, params
+
+
+_store: Optional[HistoryStore] = None
+_store_lock = threading.Lock()
+
+
+def get_history_store() -> HistoryStore:
+    """
+    Istoricul comun aplicației (PALD_HISTORY_DB), deschis la prima folosire.
+    """
+    global _store
+
+    with _store_lock:
+        if _store is None:
+            _store = HistoryStore(HISTORY_DB)
+        return _store
+
+
+def _parse_date(value: str) -> float:
+    return datetime.datetime.fromisoformat(value).timestamp()
+
+
+def format_entry(entry: Dict[str, Any]) -> str:
+    when = datetime.datetime.fromtimestamp(entry["created"]).strftime("%Y-%m-%d %H:%M:%S")
+    if entry["species"]:
+        what = f"{entry['species']} ({(entry['probability'] or 0.0) * 100.0:.1f}%)"
+    else:
+        what = "Fără sugestii"
+    where = entry["label"] or entry["image_path"] or ""
+    return f"#{entry['id']:<6} [{when}] {what}  —  {where}"
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m pald history",
+        description="Caută în istoricul identificărilor.",
+    )
+    parser.add_argument("-s", "--species", help="numele științific începe cu...")
+    parser.add_argument("--hash", dest="image_hash", help="hash-ul conținutului imaginii")
+    parser.add_argument("--since", help="de la data (AAAA-LL-ZZ[THH:MM])")
+    parser.add_argument("--until", help="până la data (AAAA-LL-ZZ[THH:MM])")
+    parser.add_argument("-n", "--limit", type=int, default=20, help="câte rânduri (implicit 20)")
+    parser.add_argument("--offset", type=int, default=0)
+    parser.add_argument("--show", type=int, metavar="ID", help="afișează rezultatul complet")
+    parser.add_argument("--json", action="store_true", help="ieșire JSON")
+    args = parser.parse_args(argv)
+
+    store = get_history_store()
+
+    if args.show is not None:
+        entry = store.get(args.show)
+        if entry is None:
+            print(f"Nu există intrarea #{args.show}.")
+            return 1
+        entry.pop("thumbnail", None)
+        print(json.dumps(entry, indent=2, ensure_ascii=False))
+        return 0
+
+    try:
+        since = _parse_date(args.since) if args.since else None
+        until = _parse_date(args.until) if args.until else None
+    except ValueError as e:
+        print(f"Dată invalidă: {e}")
+        return 2
+
+    entries = store.page(
+        offset=args.offset,
+        limit=args.limit,
+        species=args.species,
+        image_hash=args.image_hash,
+        since=since,
+        until=until,
+    )
+
+    if args.json:
+        print(json.dumps(entries, indent=2, ensure_ascii=False))
+        return 0
+
+    if not entries:
+        print("Nicio identificare găsită.")
+        return 0
+    for entry in entries:
+        print(format_entry(entry))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,177 @@
+import datetime
+import itertools
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+
+# statusuri după care punem o cheie deoparte o vreme
+AUTH_STATUSES = (401, 403)
+RATE_LIMIT_STATUS = 429
+
+
+class NoKeyAvailableError(RuntimeError):
+    """
+    Toate cheile sunt în carantină; `retry_after` spune peste câte secunde
+    se eliberează prima.
+    """
+
+    def __init__(self, retry_after: float):
+        super().__init__(
+            f"Toate cheile Plant.id sunt blocate temporar (prima se eliberează în {retry_after:.0f}s)."
+        )
+        self.retry_after = retry_after
+
+
+def mask_key(key: str) -> str:
+    return f"{key[:4]}***" if len(key) > 4 else "***"
+
+
+class _KeyState:
+    def __init__(self, key: str):
+        self.key = key
+        self.quarantined_until = 0.0
+        self.last_status: Optional[int] = None
+        # din header-ele răspunsului, dacă API-ul le trimite
+        self.remaining: Optional[int] = None
+        self.used_today = 0
+        self.requests = 0
+        self.failures = 0
+
+
+class KeyPool:
+    """
+    Mai multe chei Plant.id folosite prin rotație, ca debitul total să
+    poată depăși limita unei singure chei.
+
+    `acquire()` alege, dintre cheile disponibile, pe cea cu cea mai mare
+    cotă rămasă (după header-ele de rate limit, dacă există, altfel după
+    câte cereri a făcut azi); la egalitate merge round-robin.
+
+    O cheie care primește 401/403 (greșită, expirată) sau 429 (limită
+    atinsă) e pusă în carantină: `auth_quarantine` secunde, respectiv
+    Retry-After sau `quarantine` secunde. Între timp cererile merg pe celelalte.
+    Ultima cheie disponibilă nu intră în carantină după 401/403: n-ar avea
+    cine să o înlocuiască, iar un 401 trecător ar bloca aplicația o oră;
+    cererea eșuează imediat cu eroarea de autentificare.
+    """
+
+    def __init__(
+        self,
+        keys: List[str],
+        quarantine: float = 60.0,
+        auth_quarantine: float = 3600.0,
+    ):
+        keys = list(dict.fromkeys(k for k in keys if k))
+        if not keys:
+            raise ValueError("Trebuie cel puțin o cheie Plant.id.")
+
+        self.quarantine = quarantine
+        self.auth_quarantine = auth_quarantine
+
+        self._lock = threading.Lock()
+        self._keys = [_KeyState(key) for key in keys]
+        self._rotation = itertools.count()
+        self._day = datetime.date.today().isoformat()
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def acquire(self) -> str:
+        """
+        Cheia pentru următoarea cerere. Ridică NoKeyAvailableError dacă
+        toate cheile sunt în carantină.
+        """
+        now = time.monotonic()
+        with self._lock:
+            self._roll_day()
+            available = [k for k in self._keys if k.quarantined_until <= now]
+            if not available:
+                wait = min(k.quarantined_until for k in self._keys) - now
+                raise NoKeyAvailableError(max(0.0, wait))
+
+            # rotim lista înainte de max(), ca egalitățile să se împartă pe rând
+            start = next(self._rotation) % len(available)
+            rotated = available[start:] + available[:start]
+            chosen = max(rotated, key=self._headroom)
+            chosen.requests += 1
+            chosen.used_today += 1
+            return chosen.key
+
+    def report(
+        self,
+        key: str,
+        status: int,
+        retry_after: Optional[float] = None,
+        remaining: Optional[int] = None,
+    ) -> None:
+        """
+        Spune pool-ului cum a răspuns API-ul pentru `key`; 401/403/429 pun
+        cheia în carantină.
+        """
+        with self._lock:
+            state = self._find(key)
+            if state is None:
+                return
+            state.last_status = status
+            if remaining is not None:
+                state.remaining = remaining
+
+            if status in AUTH_STATUSES:
+                state.failures += 1
+                now = time.monotonic()
+                if any(k is not state and k.quarantined_until <= now for k in self._keys):
+                    state.quarantined_until = now + self.auth_quarantine
+            elif status == RATE_LIMIT_STATUS:
+                state.failures += 1
+                delay = retry_after if retry_after is not None else self.quarantine
+                state.quarantined_until = time.monotonic() + delay
+
+    def is_available(self, key: str) -> bool:
+        now = time.monotonic()
+        with self._lock:
+            state = self._find(key)
+            return state is not None and state.quarantined_until <= now
+
+    def available_count(self) -> int:
+        now = time.monotonic()
+        with self._lock:
+            return sum(1 for k in self._keys if k.quarantined_until <= now)
+
+    def stats(self) -> List[Dict[str, Any]]:
+        now = time.monotonic()
+        with self._lock:
+            return [
+                {
+                    "key": mask_key(k.key),
+                    "available": k.quarantined_until <= now,
+                    "quarantined_for": max(0.0, k.quarantined_until - now),
+                    "last_status": k.last_status,
+                    "remaining": k.remaining,
+                    "used_today": k.used_today,
+                    "requests": k.requests,
+                    "failures": k.failures,
+                }
+                for k in self._keys
+            ]
+
+    # ------------ INTERN ------------
+
+    def _find(self, key: str) -> Optional[_KeyState]:
+        for state in self._keys:
+            if state.key == key:
+                return state
+        return None
+
+    @staticmethod
+    def _headroom(state: _KeyState) -> Tuple[float, int]:
+        # cota rămasă necunoscută = o considerăm mare; apoi cea mai puțin folosită azi
+        remaining = float("inf") if state.remaining is None else float(state.remaining)
+        return remaining, -state.used_today
+
+    def _roll_day(self) -> None:
+        today = datetime.date.today().isoformat()
+        if today != self._day:
+            self._day = today
+            for state in self._keys:
+                state.used_today = 0
@@ -1,19 +1,36 @@
+import argparse
+import datetime
 import os
-from typing import Optional
-
-from .api_client import identify_plant
-from .camera import capture_image_from_camera
-
-
-def _print_identification_result(image_path: str) -> None:
+from typing import List, Optional
+
+from .api_client import (
+    MAX_IMAGES_PER_REQUEST,
+    format_upload_stats,
+    identify_plant,
+    identify_plant_group,
+)
+from .history import get_history_store
+from .profiling import dump_json, format_report
+
+
+def _print_identification_result(image) -> None:
+    """
+    `image` poate fi o cale, un cadru de la cameră sau o listă de căi
+    (mai multe poze ale aceluiași exemplar, trimise într-o singură cerere).
+    """
     print("\n=== Trimit poza la Plant.id pentru identificare... ===\n")
 
     try:
-        result = identify_plant(image_path)
+        if isinstance(image, list):
+            result = identify_plant_group(image)
+        else:
+            result = identify_plant(image)
     except Exception as e:
         print(f"Eroare la apelul Plant.id: {e}")
         return
 
+    _save_to_history(image, result)
+
     if not result["is_plant"]:
         print("Rezultat: imaginea NU pare să fie o plantă (sau modelul nu e sigur).")
         return
@@ -39,6 +56,32 @@ def _print_identification_result(image_path: str) -> None:
             print(f"   Info: {url}")
         print()
 
+    if result.get("upload"):
+        print(format_upload_stats(result["upload"]))
+
+
+def _save_to_history(image, result) -> None:
+    # aceeași poză deja salvată (aproape identică / trimisă în paralel): nu o dublăm
+    if (result.get("upload") or {}).get("source") in ("near_duplicate", "coalesced"):
+        return
+
+    image_path, label, thumbnail = None, None, None
+    if isinstance(image, list):
+        image_path = image[0]
+        label = f"{len(image)} poze: " + ", ".join(os.path.basename(p) for p in image)
+    elif isinstance(image, str):
+        image_path = image
+    else:
+        from .camera import encode_frame_to_jpeg
+
+        label = "Captură cameră " + datetime.datetime.now().strftime("%H:%M:%S")
+        thumbnail = encode_frame_to_jpeg(image, max_edge=350, jpeg_quality=80)
+
+    try:
+        get_history_store().add(result, image_path=image_path, label=label, thumbnail=thumbnail)
+    except Exception as e:
+        print(f"Nu am putut salva în istoric: {e}")
+
 
 def _choose_image_from_gallery() -> Optional[str]:
     path = input("Introdu calea către imagine (ex: C:\\poze\\plant.jpg): ").strip()
@@ -53,23 +96,82 @@ def _choose_image_from_gallery() -> Optional[str]:
     return path
 
 
-def main():
+def _choose_image_group() -> Optional[List[str]]:
+    raw = input(
+        f"Introdu căile pozelor (cel mult {MAX_IMAGES_PER_REQUEST}), separate prin ';': "
+    ).strip()
+    paths = [p.strip().strip('"') for p in raw.split(";") if p.strip()]
+    if not paths:
+        print("Nu ai introdus nicio cale.")
+        return None
+
+    missing = [p for p in paths if not os.path.isfile(p)]
+    if missing:
+        print(f"Fișiere inexistente: {', '.join(missing)}")
+        return None
+
+    if len(paths) > MAX_IMAGES_PER_REQUEST:
+        print(f"Cel mult {MAX_IMAGES_PER_REQUEST} poze pentru un exemplar.")
+        return None
+
+    return paths
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(
+        prog="python -m pald cli",
+        description="pald în linia de comandă.",
+    )
+    parser.add_argument(
+        "--auto-capture", action="store_true",
+        help="camera face poza singură când imaginea e clară (tasta A o pornește / oprește)",
+    )
+    parser.add_argument(
+        "--profile", action="store_true",
+        help="la ieșire afișează timpii pe etape (citire, preprocesare, upload...)",
+    )
+    parser.add_argument(
+        "--profile-json",
+        help="la ieșire salvează timpii pe etape în acest fișier JSON",
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        _menu_loop(auto_capture=args.auto_capture)
+    finally:
+        if args.profile:
+            print("\n=== Timpi pe etape ===")
+            print(format_report())
+        if args.profile_json:
+            dump_json(args.profile_json)
+
+
+def _menu_loop(auto_capture: bool = False):
     while True:
         print("\n========== pald - Plant Identifier ==========")
         print("1. Fă o poză cu camera (webcam)")
         print("2. Alege o poză din galerie (fișier de pe disc)")
-        print("3. Ieșire")
-        choice = input("Alege o opțiune (1/2/3): ").strip()
+        print("3. Mai multe poze ale aceluiași exemplar (o singură cerere)")
+        print("4. Ieșire")
+        choice = input("Alege o opțiune (1/2/3/4): ").strip()
 
         if choice == "1":
-            image_path = capture_image_from_camera()
-            if image_path:
-                _print_identification_result(image_path)
+            # OpenCV se încarcă doar dacă folosim camera
+            from .camera import capture_frame_from_camera
+
+            # cadrul merge direct la API, fără fișier temporar
+            frame = capture_frame_from_camera(auto=auto_capture)
+            if frame is not None:
+                _print_identification_result(frame)
         elif choice == "2":
             image_path = _choose_image_from_gallery()
             if image_path:
                 _print_identification_result(image_path)
         elif choice == "3":
+            image_paths = _choose_image_group()
+            if image_paths:
+                _print_identification_result(image_paths)
+        elif choice == "4":
             print("La revedere! 🌿")
             break
         else:
@@ -0,0 +1,302 @@
+import argparse
+import hashlib
+import json
+import random
+import sys
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+
+
+# câteva specii reale, ca răspunsurile să arate ca cele de la Plant.id
+SPECIES = [
+    ("Quercus robur", ["English oak", "pedunculate oak"], "Quercus_robur"),
+    ("Taraxacum officinale", ["common dandelion", "dandelion"], "Taraxacum_officinale"),
+    ("Monstera deliciosa", ["Swiss cheese plant", "split-leaf philodendron"], "Monstera_deliciosa"),
+    ("Ficus lyrata", ["fiddle-leaf fig"], "Ficus_lyrata"),
+    ("Bellis perennis", ["daisy", "common daisy"], "Bellis_perennis"),
+    ("Hedera helix", ["common ivy", "English ivy"], "Hedera_helix"),
+    ("Rosa canina", ["dog rose"], "Rosa_canina"),
+    ("Lavandula angustifolia", ["English lavender", "true lavender"], "Lavandula_angustifolia"),
+    ("Urtica dioica", ["stinging nettle", "common nettle"], "Urtica_dioica"),
+    ("Acer platanoides", ["Norway maple"], "Acer_platanoides"),
+]
+
+IDENTIFICATION_PATH = "/v3/identification"
+
+
+def build_identification_response(images: List[str], rng: random.Random) -> Dict[str, Any]:
+    """
+    Un răspuns în formatul Plant.id v3 (câmpurile pe care le folosește pald
+    plus cele mai comune din rest). `rng` e inițializat din conținutul
+    imaginilor, deci aceeași poză primește mereu aceleași sugestii.
+    """
+    count = rng.randint(3, 6)
+    picks = rng.sample(SPECIES, count)
+
+    weights = sorted((rng.random() for _ in picks), reverse=True)
+    total = sum(weights) or 1.0
+
+    suggestions = []
+    for (name, common_names, slug), weight in zip(picks, weights):
+        suggestions.append(
+            {
+                "id": uuid.UUID(int=rng.getrandbits(128)).hex[:16],
+                "name": name,
+                "probability": round(weight / total, 4),
+                "similar_images": [],
+                "details": {
+                    "common_names": common_names,
+                    "url": f"https://en.wikipedia.org/wiki/{slug}",
+                    "language": "en",
+                    "entity_id": uuid.UUID(int=rng.getrandbits(128)).hex[:16],
+                },
+            }
+        )
+
+    now = time.time()
+    plant_probability = round(rng.uniform(0.6, 0.999), 4)
+    return {
+        "access_token": uuid.UUID(int=rng.getrandbits(128)).hex,
+        "model_version": "plant_id:3.6.0",
+        "custom_id": None,
+        "input": {
+            "latitude": None,
+            "longitude": None,
+            "similar_images": False,
+            "images": [
+                f"https://plant.id/media/imgs/{uuid.uuid4().hex}.jpg" for _ in images
+            ],
+            "datetime": time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(now)),
+        },
+        "result": {
+            "is_plant": {
+                "probability": plant_probability,
+                "binary": plant_probability >= 0.5,
+                "threshold": 0.5,
+            },
+            "classification": {"suggestions": suggestions},
+        },
+        "status": "COMPLETED",
+        "sla_compliant_client": True,
+        "sla_compliant_system": True,
+        "created": now,
+        "completed": now,
+    }
+
+
+class MockPlantIdServer:
+    """
+    Înlocuitor local pentru endpoint-ul Plant.id, pentru teste și benchmark
+    fără să consumăm din cota API-ului.
+
+    Fiecare cerere așteaptă `latency` ± `jitter` secunde, apoi răspunde cu:
+    - 429 + Retry-After, cu probabilitatea `rate_limit_rate`
+    - 500, cu probabilitatea `error_rate`
+    - altfel un răspuns de identificare realist
+
+    `stats()` spune câte cereri și câți bytes au sosit.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.2,
+        jitter: float = 0.05,
+        error_rate: float = 0.0,
+        rate_limit_rate: float = 0.0,
+        retry_after: float = 1.0,
+        seed: Optional[int] = None,
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._stats = {"requests": 0, "bytes_received": 0, "images": 0, "statuses": {}}
+
+        self._httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}{IDENTIFICATION_PATH}"
+
+    def start(self) -> "MockPlantIdServer":
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever, name="pald-mock-server", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        """
+        Rulează serverul pe thread-ul curent (pentru linia de comandă).
+        """
+        try:
+            self._httpd.serve_forever()
+        finally:
+            self._httpd.server_close()
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+
+    def __enter__(self) -> "MockPlantIdServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["statuses"] = dict(self._stats["statuses"])
+            return stats
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self._stats = {"requests": 0, "bytes_received": 0, "images": 0, "statuses": {}}
+
+    # ------------ INTERN ------------
+
+    def _record(self, status: int, body_bytes: int, images: int) -> None:
+        with self._lock:
+            self._stats["requests"] += 1
+            self._stats["bytes_received"] += body_bytes
+            self._stats["images"] += images
+            statuses = self._stats["statuses"]
+            statuses[status] = statuses.get(status, 0) + 1
+
+    def _draw(self) -> float:
+        with self._lock:
+            return self._rng.random()
+
+    def _delay(self) -> float:
+        with self._lock:
+            return max(0.0, self._rng.uniform(self.latency - self.jitter, self.latency + self.jitter))
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                # fără un rând în consolă pentru fiecare cerere
+                pass
+
+            def _read_body(self) -> bytes:
+                if self.headers.get("Transfer-Encoding", "").lower() == "chunked":
+                    chunks = []
+                    while True:
+                        size = int(self.rfile.readline().strip() or b"0", 16)
+                        if size == 0:
+                            self.rfile.readline()
+                            break
+                        chunks.append(self.rfile.read(size))
+                        self.rfile.readline()
+                    return b"".join(chunks)
+                length = int(self.headers.get("Content-Length") or 0)
+                return self.rfile.read(length)
+
+            def _send_json(self, status: int, data: Dict[str, Any], headers=None) -> None:
+                body = json.dumps(data).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_POST(self):
+                body = self._read_body()
+
+                if self.path.split("?", 1)[0] != IDENTIFICATION_PATH:
+                    server._record(404, len(body), 0)
+                    self._send_json(404, {"error": "Not found"})
+                    return
+
+                try:
+                    images = json.loads(body or b"{}").get("images") or []
+                except ValueError:
+                    server._record(400, len(body), 0)
+                    self._send_json(400, {"error": "Invalid JSON"})
+                    return
+
+                if not images:
+                    server._record(400, len(body), 0)
+                    self._send_json(400, {"error": "No images"})
+                    return
+
+                time.sleep(server._delay())
+
+                draw = server._draw()
+                if draw < server.rate_limit_rate:
+                    server._record(429, len(body), len(images))
+                    self._send_json(
+                        429,
+                        {"error": "Too many requests"},
+                        {"Retry-After": f"{server.retry_after:g}"},
+                    )
+                    return
+                if draw < server.rate_limit_rate + server.error_rate:
+                    server._record(500, len(body), len(images))
+                    self._send_json(500, {"error": "Internal server error"})
+                    return
+
+                digest = hashlib.sha256("".join(images).encode("ascii", "ignore")).digest()
+                rng = random.Random(digest)
+                server._record(201, len(body), len(images))
+                self._send_json(201, build_identification_response(images, rng))
+
+        return Handler
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m pald.mock_server",
+        description="Server local care imită Plant.id v3, pentru teste și benchmark.",
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.2, help="secunde per cerere")
+    parser.add_argument("--jitter", type=float, default=0.05, help="± secunde")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fracțiunea de răspunsuri 500")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="fracțiunea de răspunsuri 429")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="Retry-After la 429 (secunde)")
+    args = parser.parse_args(argv)
+
+    server = MockPlantIdServer(
+        host=args.host,
+        port=args.port,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        retry_after=args.retry_after,
+    )
+    print(f"Mock Plant.id pornit la {server.url}")
+    print(f"Folosește: PALD_PLANT_ID_ENDPOINT={server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    print(f"\nStatistici: {server.stats()}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,148 @@
+import bisect
+import threading
+from array import array
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+
+def _trigrams(text: str) -> Set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def _words(names: str) -> Set[str]:
+    words = set()
+    for name in names.split("|"):
+        words.update(name.split())
+    return words
+
+
+class NameIndex:
+    """
+    Index în memorie pe numele speciilor din istoric (științific + comune),
+    pentru căutare în timp ce utilizatorul tastează.
+
+    Multe identificări au aceleași nume (aceeași specie pozată des), așa că
+    indexăm doar textele distincte de nume; fiecare ține lista id-urilor
+    care îl au. Peste texte:
+    - trigrame (index inversat) pentru căutare în interiorul numelui (>= 3 litere)
+    - o listă sortată de cuvinte pentru căutare după început (1-2 litere)
+
+    Mai mulți termeni separați prin spațiu trebuie să se potrivească toți.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # text de nume ("quercus robur|english oak") -> id-uri, crescător
+        self._ids_by_names: Dict[str, array] = {}
+        self._trigrams: Dict[str, Set[str]] = {}
+        # cuvânt -> textele care îl conțin, plus cuvintele sortate pentru bisect
+        self._texts_by_word: Dict[str, Set[str]] = {}
+        self._sorted_words: List[str] = []
+        self._words_dirty = False
+        self._all_ids = array("q")
+        self._all_sorted = True
+
+    def __len__(self) -> int:
+        return len(self._all_ids)
+
+    def build(self, rows: Iterable[Tuple[int, str]]) -> "NameIndex":
+        """
+        Adaugă toate (id, nume) odată, de ex. din HistoryStore.iter_names.
+        """
+        for entry_id, names in rows:
+            self.add(entry_id, names)
+        return self
+
+    def add(self, entry_id: int, names: str) -> None:
+        names = (names or "").lower()
+        with self._lock:
+            if self._all_ids and entry_id < self._all_ids[-1]:
+                self._all_sorted = False
+            self._all_ids.append(entry_id)
+
+            ids = self._ids_by_names.get(names)
+            if ids is not None:
+                ids.append(entry_id)
+                return
+            self._ids_by_names[names] = array("q", [entry_id])
+
+            for gram in _trigrams(names):
+                self._trigrams.setdefault(gram, set()).add(names)
+            for word in _words(names):
+                texts = self._texts_by_word.get(word)
+                if texts is None:
+                    texts = self._texts_by_word[word] = set()
+                    self._words_dirty = True
+                texts.add(names)
+
+    @property
+    def last_id(self) -> int:
+        """
+        Cel mai mare id indexat (0 dacă indexul e gol).
+        """
+        with self._lock:
+            return max(self._all_ids) if self._all_ids else 0
+
+    def all_ids(self) -> List[int]:
+        """
+        Toate id-urile, cele mai noi primele.
+        """
+        with self._lock:
+            if not self._all_sorted:
+                self._all_ids = array("q", sorted(self._all_ids))
+                self._all_sorted = True
+            return list(reversed(self._all_ids))
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[int]:
+        """
+        Id-urile intrărilor ale căror nume conțin toți termenii din `query`,
+        cele mai noi primele. Termenii scurți (sub 3 litere) se potrivesc
+        doar la începutul unui cuvânt.
+        """
+        terms = query.lower().split()
+        if not terms:
+            return self.all_ids()[:limit] if limit else self.all_ids()
+
+        with self._lock:
+            texts: Optional[Set[str]] = None
+            # termenii lungi întâi: au mai puțini candidați
+            for term in sorted(terms, key=len, reverse=True):
+                matched = self._match_term(term, texts)
+                texts = matched if texts is None else texts & matched
+                if not texts:
+                    return []
+
+            ids: List[int] = []
+            for text in texts:
+                ids.extend(self._ids_by_names[text])
+
+        ids.sort(reverse=True)
+        return ids[:limit] if limit else ids
+
+    # ------------ INTERN ------------
+
+    def _match_term(self, term: str, within: Optional[Set[str]]) -> Set[str]:
+        if len(term) < 3:
+            return self._match_prefix(term)
+
+        grams = sorted((self._trigrams.get(g, set()) for g in _trigrams(term)), key=len)
+        if not grams or not grams[0]:
+            return set()
+
+        # pornim de la trigrama cea mai rară și verificăm direct textul
+        candidates = grams[0] if within is None else grams[0] & within
+        return {text for text in candidates if term in text}
+
+    def _match_prefix(self, prefix: str) -> Set[str]:
+        if self._words_dirty:
+            self._sorted_words = sorted(self._texts_by_word)
+            self._words_dirty = False
+
+        words = self._sorted_words
+        start = bisect.bisect_left(words, prefix)
+        # toate cuvintele care încep cu `prefix` sunt consecutive în lista sortată
+        end = bisect.bisect_left(words, prefix + "\uffff", lo=start)
+
+        matched: Set[str] = set()
+        for word in words[start:end]:
+            matched |= self._texts_by_word[word]
+        return matched
@@ -0,0 +1,66 @@
+import io
+import os
+from typing import Any, Dict, Tuple, Union
+
+
+def preprocess_image_bytes(
+    image_bytes: Union[bytes, str],
+    max_edge: int,
+    jpeg_quality: int,
+) -> Tuple[Union[bytes, str], Dict[str, Any]]:
+    """
+    Pregătește imaginea pentru upload:
+    - rotește conform orientării EXIF (pozele de pe telefon vin des "culcate")
+    - micșorează astfel încât latura mare să fie cel mult `max_edge` pixeli
+    - recomprimă ca JPEG cu calitatea `jpeg_quality`
+
+    Întoarce (bytes de trimis, info), unde info conține dimensiunile
+    înainte/după. Dacă imaginea nu poate fi decodată sau varianta nouă ar
+    ieși mai mare decât originalul, trimitem originalul neschimbat.
+
+    `image_bytes` poate fi și o cale de fișier: Pillow îl citește singur,
+    fără să-l ținem întreg în memorie; în cazurile de mai sus întoarcem
+    atunci calea (originalul se trimite direct din fișier).
+    """
+    is_path = isinstance(image_bytes, str)
+    original_bytes = os.path.getsize(image_bytes) if is_path else len(image_bytes)
+    info: Dict[str, Any] = {
+        "original_bytes": original_bytes,
+        "original_size": None,
+        "size": None,
+        "reencoded": False,
+    }
+
+    if max_edge <= 0:
+        return image_bytes, info
+
+    # Pillow e importat abia la prima imagine, nu la pornirea aplicației
+    from PIL import Image, ImageOps  # pip install pillow
+
+    try:
+        img = Image.open(image_bytes if is_path else io.BytesIO(image_bytes))
+        info["original_size"] = img.size
+
+        # la JPEG putem decoda direct la o rezoluție redusă (mult mai rapid)
+        if img.format == "JPEG":
+            img.draft("RGB", (max_edge, max_edge))
+
+        img = ImageOps.exif_transpose(img)
+        if max(img.size) > max_edge:
+            img.thumbnail((max_edge, max_edge), Image.LANCZOS)
+
+        if img.mode != "RGB":
+            img = img.convert("RGB")
+
+        out = io.BytesIO()
+        img.save(out, format="JPEG", quality=jpeg_quality, optimize=True)
+        processed = out.getvalue()
+    except Exception:
+        return image_bytes, info
+
+    info["size"] = img.size
+    if len(processed) >= original_bytes:
+        return image_bytes, info
+
+    info["reencoded"] = True
+    return processed, info
@@ -0,0 +1,155 @@
+import bisect
+import functools
+import json
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+
+# limitele de sus ale bucket-urilor, în milisecunde (aproximativ logaritmic)
+BUCKET_BOUNDS_MS = [
+    0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500,
+    1000, 2500, 5000, 10000, 30000, 60000,
+]
+
+
+class Histogram:
+    """
+    Histogramă cu bucket-uri fixe pentru durate: memorie constantă
+    oricâte măsurători primește, percentile aproximative din bucket-uri.
+    """
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKET_BOUNDS_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.min_ms = float("inf")
+        self.max_ms = 0.0
+
+    def add(self, ms: float) -> None:
+        self.counts[bisect.bisect_left(BUCKET_BOUNDS_MS, ms)] += 1
+        self.count += 1
+        self.total_ms += ms
+        self.min_ms = min(self.min_ms, ms)
+        self.max_ms = max(self.max_ms, ms)
+
+    def percentile(self, p: float) -> float:
+        """
+        Limita de sus a bucket-ului în care cade percentila `p` (0..100),
+        plafonată la maximul văzut.
+        """
+        if not self.count:
+            return 0.0
+        target = p / 100.0 * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= target and n:
+                bound = BUCKET_BOUNDS_MS[i] if i < len(BUCKET_BOUNDS_MS) else self.max_ms
+                return min(bound, self.max_ms)
+        return self.max_ms
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "total_ms": round(self.total_ms, 3),
+            "mean_ms": round(self.total_ms / self.count, 3) if self.count else 0.0,
+            "min_ms": round(self.min_ms, 3) if self.count else 0.0,
+            "max_ms": round(self.max_ms, 3),
+            "p50_ms": self.percentile(50),
+            "p95_ms": self.percentile(95),
+            "p99_ms": self.percentile(99),
+            "buckets": {
+                (f"<={bound}" if i < len(BUCKET_BOUNDS_MS) else f">{BUCKET_BOUNDS_MS[-1]}"): n
+                for i, (bound, n) in enumerate(
+                    zip(BUCKET_BOUNDS_MS + [None], self.counts)
+                )
+                if n
+            },
+        }
+
+
+_lock = threading.Lock()
+_histograms: Dict[str, Histogram] = {}
+
+
+def record(name: str, seconds: float) -> None:
+    """
+    Adaugă o durată (în secunde) la histograma etapei `name`.
+    """
+    ms = seconds * 1000.0
+    with _lock:
+        hist = _histograms.get(name)
+        if hist is None:
+            hist = _histograms[name] = Histogram()
+        hist.add(ms)
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """
+    Măsoară blocul și îl adaugă la histograma `name`:
+
+        with span("preprocess"):
+            ...
+    """
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, time.perf_counter() - started)
+
+
+def timed(name: str) -> Callable:
+    """
+    Varianta de decorator a lui span().
+    """
+    def decorator(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def snapshot() -> Dict[str, Dict[str, Any]]:
+    with _lock:
+        return {name: hist.to_dict() for name, hist in sorted(_histograms.items())}
+
+
+def reset() -> None:
+    with _lock:
+        _histograms.clear()
+
+
+def dump_json(path: Optional[str] = None) -> str:
+    """
+    Toate histogramele ca JSON; dacă e dat `path`, le și scrie acolo.
+    """
+    text = json.dumps(snapshot(), indent=2)
+    if path:
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+    return text
+
+
+def format_report() -> str:
+    """
+    Tabel text cu timpii pe etape, pentru CLI (--profile) și panoul din GUI.
+    """
+    data = snapshot()
+    if not data:
+        return "Nicio măsurătoare încă."
+
+    width = max(len("etapă"), max(len(name) for name in data))
+    lines: List[str] = [
+        f"{'etapă':<{width}}  {'n':>6}  {'medie':>9}  {'p50':>9}  {'p95':>9}  {'max':>9}",
+    ]
+    for name, h in data.items():
+        lines.append(
+            f"{name:<{width}}  {h['count']:>6}  {h['mean_ms']:>7.1f}ms  "
+            f"{h['p50_ms']:>7.1f}ms  {h['p95_ms']:>7.1f}ms  {h['max_ms']:>7.1f}ms"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,137 @@
+import base64
+import json
+import os
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Union
+
+
+# câți bytes din imagine codăm odată; multiplu de 3, ca base64 să nu pună
+# padding ("=") în mijlocul șirului
+CHUNK_SIZE = 3 * 64 * 1024
+
+# bytes = imagine deja în memorie (de ex. micșorată), str = cale de fișier
+ImageSource = Union[bytes, str]
+
+
+def base64_length(num_bytes: int) -> int:
+    return 4 * ((num_bytes + 2) // 3)
+
+
+def source_size(source: ImageSource) -> int:
+    return os.path.getsize(source) if isinstance(source, str) else len(source)
+
+
+class JSONImagesBody:
+    """
+    Corpul cererii Plant.id, {"images": ["<base64>", ...], ...}, generat pe
+    bucăți în timp ce se trimite: nu construim nici șirul base64, nici JSON-ul
+    întreg în memorie, iar o imagine dată ca fișier e citită tot pe bucăți.
+    Pe cerere, memoria e O(chunk_size), nu O(imagine).
+
+    Lungimea se știe dinainte (base64 are mărime fixă), deci cererea pleacă
+    cu Content-Length, nu chunked. `stream()` dă un corp nou la fiecare
+    încercare, pentru că un generator consumat nu mai poate fi retrimis.
+    """
+
+    def __init__(
+        self,
+        images: List[ImageSource],
+        extra: Optional[Dict[str, Any]] = None,
+        chunk_size: int = CHUNK_SIZE,
+    ):
+        if chunk_size % 3:
+            raise ValueError("chunk_size trebuie să fie multiplu de 3.")
+        self.images = list(images)
+        self.extra = dict(extra or {})
+        self.chunk_size = chunk_size
+        # mărimile le luăm acum: dacă un fișier se schimbă, nu trimitem altceva
+        self._sizes = [source_size(image) for image in self.images]
+
+    def __len__(self) -> int:
+        total = len(self._prefix()) + len(self._suffix())
+        total += sum(base64_length(size) for size in self._sizes)
+        total += len(self._separator()) * max(0, len(self.images) - 1)
+        return total
+
+    def __iter__(self) -> Iterator[bytes]:
+        yield self._prefix()
+        for i, (image, size) in enumerate(zip(self.images, self._sizes)):
+            if i:
+                yield self._separator()
+            if isinstance(image, str):
+                yield from self._encode_file(image, size)
+            else:
+                view = memoryview(image)
+                for start in range(0, size, self.chunk_size):
+                    yield base64.b64encode(view[start:start + self.chunk_size])
+        yield self._suffix()
+
+    def stream(self) -> "BodyStream":
+        """
+        Un corp gata de trimis (iterabil, cu lungime) pentru o încercare.
+        """
+        return BodyStream(self)
+
+    async def aiter(self) -> AsyncIterator[bytes]:
+        """
+        Aceleași bucăți, pentru aiohttp; citirea din fișier rulează într-un
+        thread, ca să nu blocheze loop-ul.
+        """
+        import asyncio
+
+        chunks = iter(self)
+        while True:
+            chunk = await asyncio.to_thread(next, chunks, None)
+            if chunk is None:
+                return
+            yield chunk
+
+    def to_json(self) -> Dict[str, Any]:
+        """
+        Corpul ca dict (totul în memorie); pentru teste și depanare.
+        """
+        return json.loads(b"".join(self))
+
+    # ------------ INTERN ------------
+
+    @staticmethod
+    def _prefix() -> bytes:
+        return b'{"images": ["'
+
+    @staticmethod
+    def _separator() -> bytes:
+        return b'", "'
+
+    def _suffix(self) -> bytes:
+        parts = [b'"]']
+        for key, value in self.extra.items():
+            parts.append(b", " + json.dumps(key).encode("utf-8") + b": ")
+            parts.append(json.dumps(value, ensure_ascii=False).encode("utf-8"))
+        parts.append(b"}")
+        return b"".join(parts)
+
+    def _encode_file(self, path: str, size: int) -> Iterator[bytes]:
+        remaining = size
+        with open(path, "rb") as f:
+            while remaining > 0:
+                chunk = f.read(min(self.chunk_size, remaining))
+                if not chunk:
+                    raise OSError(f"Fișierul s-a micșorat în timpul trimiterii: {path}")
+                remaining -= len(chunk)
+                yield base64.b64encode(chunk)
+
+
+class BodyStream:
+    """
+    O singură trecere prin JSONImagesBody. `requests` vede `__len__` și
+    trimite Content-Length în loc de Transfer-Encoding: chunked.
+    """
+
+    def __init__(self, body: JSONImagesBody):
+        self._body = body
+        self._length = len(body)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __iter__(self) -> Iterator[bytes]:
+        return iter(self._body)
@@ -0,0 +1,333 @@
+import datetime
+import heapq
+import itertools
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from .profiling import record
+
+
+# numere mici = prioritate mare
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BATCH = 10
+
+# (prioritate, nr. de ordine, momentul intrării la coadă)
+Ticket = Tuple[int, int, float]
+
+# cât de des întreabă try_acquire un apelant care nu e primul la coadă
+POLL_INTERVAL = 0.05
+
+
+class QuotaExceededError(RuntimeError):
+    """
+    Cota zilnică de cereri spre Plant.id s-a terminat (pentru prioritatea dată).
+    """
+
+
+def _priority_name(priority: int) -> str:
+    return "interactive" if priority <= PRIORITY_INTERACTIVE else "batch"
+
+
+class RateScheduler:
+    """
+    Dozează cererile spre Plant.id când aceeași cheie e folosită și din GUI,
+    și din joburi batch.
+
+    - token bucket: cel mult `rate` cereri pe secundă în medie, cu rafale
+      de până la `burst` (rate <= 0 = fără limită)
+    - cotă zilnică: cel mult `daily_quota` cereri pe zi (0 = fără cotă);
+      ultimii `interactive_reserve` (fracțiune) din cotă sunt păstrați pentru
+      cererile interactive, ca un batch să nu lase GUI-ul fără cereri
+    - priorități: cine așteaptă un token e servit după prioritate, apoi în
+      ordinea sosirii, deci o identificare din GUI trece înaintea batch-ului
+
+    Cota folosită azi e ținută într-o bază SQLite (`state_path`), comună
+    tuturor proceselor (GUI, `batch`, `watch`): fiecare cerere e numărată
+    într-o tranzacție, deci cota zilei e respectată și între procese și
+    supraviețuiește repornirii. Tokenii și coada de priorități sunt în
+    schimb per proces: GUI-ul trece înaintea batch-ului din același proces,
+    dar un batch pornit separat are propria limită pe secundă.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int = 1,
+        daily_quota: int = 0,
+        interactive_reserve: float = 0.1,
+        state_path: Optional[str] = None,
+    ):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.daily_quota = daily_quota
+        self.interactive_reserve = interactive_reserve
+        self.state_path = state_path
+
+        self._cond = threading.Condition()
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._waiting: List[Ticket] = []
+        self._seq = itertools.count()
+
+        self._day = self._today()
+        self._used = 0
+        self._conn = self._open_state()
+        self._refresh_used()
+
+        self.granted = 0
+        self.rejected = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    def acquire(self, priority: int = PRIORITY_BATCH, timeout: Optional[float] = None) -> float:
+        """
+        Blochează până când cererea are voie să plece; întoarce cât a așteptat
+        (secunde). Ridică QuotaExceededError dacă cota zilei s-a terminat și
+        TimeoutError dacă nu a primit un token în `timeout` secunde.
+        """
+        ticket = self.reserve(priority)
+        deadline = None if timeout is None else ticket[2] + timeout
+
+        with self._cond:
+            try:
+                while True:
+                    delay: Optional[float] = None
+                    if self._waiting[0] == ticket:
+                        # suntem primii la rând: verificăm din nou cota, apoi tokenul
+                        self._check_quota(priority)
+                        delay = self._take_token()
+                        if delay <= 0:
+                            break
+
+                    if deadline is not None:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            raise TimeoutError("Am așteptat prea mult după un token de cerere.")
+                        delay = remaining if delay is None else min(delay, remaining)
+                    self._cond.wait(delay)
+            finally:
+                self._leave_locked(ticket)
+            waited = self._grant_locked(ticket)
+
+        record(f"scheduler.wait.{_priority_name(priority)}", waited)
+        return waited
+
+    def reserve(self, priority: int = PRIORITY_BATCH) -> Ticket:
+        """
+        Intră la coadă fără să blocheze. Pentru apelanții care nu au voie să
+        țină un thread ocupat (clientul async): întreabă apoi cu try_acquire
+        și, dacă renunță, ies din coadă cu release. Ridică QuotaExceededError
+        dacă cota zilei s-a terminat.
+        """
+        with self._cond:
+            self._check_quota(priority)
+            ticket = (priority, next(self._seq), time.monotonic())
+            heapq.heappush(self._waiting, ticket)
+            return ticket
+
+    def try_acquire(self, ticket: Ticket) -> float:
+        """
+        Varianta neblocantă a lui acquire: 0 dacă tichetul a primit tokenul
+        (și a ieșit din coadă), altfel peste câte secunde merită întrebat din
+        nou. Ridică QuotaExceededError dacă între timp s-a terminat cota.
+        """
+        priority = ticket[0]
+        with self._cond:
+            if self._waiting[0] != ticket:
+                return POLL_INTERVAL
+            try:
+                self._check_quota(priority)
+            except QuotaExceededError:
+                self._leave_locked(ticket)
+                raise
+            delay = self._take_token()
+            if delay > 0:
+                return delay
+            self._leave_locked(ticket)
+            waited = self._grant_locked(ticket)
+
+        record(f"scheduler.wait.{_priority_name(priority)}", waited)
+        return 0.0
+
+    def release(self, ticket: Ticket) -> None:
+        """
+        Renunță la un tichet din reserve care nu a primit încă tokenul;
+        nu consumă nici token, nici cotă.
+        """
+        with self._cond:
+            if ticket in self._waiting:
+                self._leave_locked(ticket)
+
+    def queue_depth(self) -> Dict[str, int]:
+        """
+        Câte cereri așteaptă acum, pe priorități.
+        """
+        with self._cond:
+            depth = {"interactive": 0, "batch": 0}
+            for priority, _, _ in self._waiting:
+                depth[_priority_name(priority)] += 1
+            return depth
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            self._roll_day()
+            self._refresh_used()
+            remaining = (
+                max(0, self.daily_quota - self._used) if self.daily_quota > 0 else None
+            )
+            return {
+                "rate": self.rate,
+                "burst": self.burst,
+                "tokens": round(self._refill(), 3),
+                "daily_quota": self.daily_quota,
+                "used_today": self._used,
+                "remaining_today": remaining,
+                "queued": len(self._waiting),
+                "granted": self.granted,
+                "rejected": self.rejected,
+                "wait_mean_ms": (
+                    self._wait_total / self.granted * 1000.0 if self.granted else 0.0
+                ),
+                "wait_max_ms": self._wait_max * 1000.0,
+            }
+
+    # ------------ INTERN ------------
+
+    def _leave_locked(self, ticket: Ticket) -> None:
+        self._waiting.remove(ticket)
+        heapq.heapify(self._waiting)
+        # următorul la rând poate fi altul acum
+        self._cond.notify_all()
+
+    def _grant_locked(self, ticket: Ticket) -> float:
+        try:
+            self._record_use(ticket[0])
+        except QuotaExceededError:
+            # alt proces a luat ultima cerere din cotă: tokenul nu s-a folosit
+            if self.rate > 0:
+                self._tokens = min(float(self.burst), self._tokens + 1.0)
+            raise
+        self.granted += 1
+
+        waited = time.monotonic() - ticket[2]
+        self._wait_total += waited
+        self._wait_max = max(self._wait_max, waited)
+        return waited
+
+    def _refill(self) -> float:
+        if self.rate <= 0:
+            return float(self.burst)
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        return self._tokens
+
+    def _take_token(self) -> float:
+        """
+        Ia un token dacă există și întoarce 0; altfel întoarce peste câte
+        secunde va fi unul disponibil.
+        """
+        if self.rate <= 0:
+            return 0.0
+        if self._refill() >= 1.0:
+            self._tokens -= 1.0
+            return 0.0
+        return (1.0 - self._tokens) / self.rate
+
+    def _check_quota(self, priority: int) -> None:
+        if self.daily_quota <= 0:
+            return
+        self._roll_day()
+        self._refresh_used()
+        self._check_limit(priority, self._used)
+
+    def _check_limit(self, priority: int, used: int) -> None:
+        if self.daily_quota <= 0:
+            return
+        limit = self.daily_quota
+        if priority > PRIORITY_INTERACTIVE:
+            limit -= int(self.daily_quota * self.interactive_reserve)
+        if used >= limit:
+            self.rejected += 1
+            raise QuotaExceededError(
+                f"Cota zilnică Plant.id atinsă ({used}/{self.daily_quota} cereri"
+                + ("" if priority <= PRIORITY_INTERACTIVE else ", restul e rezervat pentru GUI")
+                + ")."
+            )
+
+    @staticmethod
+    def _today() -> str:
+        return datetime.date.today().isoformat()
+
+    def _roll_day(self) -> None:
+        today = self._today()
+        if today != self._day:
+            self._day = today
+            self._used = 0
+
+    def _open_state(self) -> Optional[sqlite3.Connection]:
+        if not self.state_path:
+            return None
+        try:
+            directory = os.path.dirname(self.state_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            # tranzacțiile le deschidem noi (BEGIN IMMEDIATE), vezi _record_use
+            conn = sqlite3.connect(
+                self.state_path, check_same_thread=False, timeout=10.0, isolation_level=None
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS quota (day TEXT PRIMARY KEY, used INTEGER NOT NULL)"
+            )
+            return conn
+        except (OSError, sqlite3.Error):
+            # fără fișier de stare numărăm doar în proces
+            return None
+
+    def _read_used(self) -> int:
+        row = self._conn.execute("SELECT used FROM quota WHERE day = ?", (self._day,)).fetchone()
+        return int(row[0]) if row else 0
+
+    def _refresh_used(self) -> None:
+        # alte procese pot fi consumat din cotă între timp
+        if self._conn is None:
+            return
+        try:
+            self._used = self._read_used()
+        except sqlite3.Error:
+            pass
+
+    def _record_use(self, priority: int) -> None:
+        """
+        Numără o cerere în cota zilei: citim, verificăm și creștem contorul
+        într-o singură tranzacție, ca două procese să nu-și suprascrie
+        numărătoarea. Ridică QuotaExceededError dacă între timp cota s-a
+        terminat (din alt proces).
+        """
+        self._roll_day()
+        if self._conn is None:
+            self._check_limit(priority, self._used)
+            self._used += 1
+            return
+
+        try:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                used = self._read_used()
+                self._check_limit(priority, used)
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO quota (day, used) VALUES (?, ?)", (self._day, used + 1)
+                )
+                self._conn.execute("DELETE FROM quota WHERE day <> ?", (self._day,))
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+        except sqlite3.Error:
+            # baza blocată prea mult sau stricată: măcar nu pierdem cererea din socoteală
+            self._used += 1
+            return
+        self._used = used + 1
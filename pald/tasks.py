@@ -0,0 +1,154 @@
+import queue
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Optional, Set
+
+
+class Task:
+    """
+    O sarcină trimisă la TkTaskRunner.
+
+    Un task deja pornit nu poate fi oprit din mijlocul apelului HTTP,
+    dar după `cancel()` rezultatul lui este ignorat (callback-urile nu
+    mai sunt apelate).
+    """
+
+    def __init__(
+        self,
+        future: Future,
+        description: str,
+        on_success: Optional[Callable[[Any], None]],
+        on_error: Optional[Callable[[BaseException], None]],
+    ):
+        self.future = future
+        self.description = description
+        self.on_success = on_success
+        self.on_error = on_error
+        self.cancelled = False
+
+    def cancel(self) -> None:
+        self.cancelled = True
+        self.future.cancel()
+
+
+class TkTaskRunner:
+    """
+    Rulează funcții lente (cameră, apeluri Plant.id) pe un pool de thread-uri
+    și livrează rezultatele înapoi pe thread-ul Tk.
+
+    Tkinter nu e thread-safe, așa că thread-urile de lucru doar pun
+    task-urile terminate într-o coadă; bucla Tk o golește periodic prin
+    `after()` și abia acolo apelează callback-urile.
+    """
+
+    def __init__(
+        self,
+        root,
+        max_workers: int = 3,
+        poll_ms: int = 50,
+        on_change: Optional[Callable[[int], None]] = None,
+    ):
+        self.root = root
+        self.poll_ms = poll_ms
+        # apelat (pe thread-ul Tk) cu numărul de task-uri active, la fiecare schimbare
+        self.on_change = on_change
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="pald-worker"
+        )
+        self._done: "queue.Queue[Task]" = queue.Queue()
+        self._active: Set[Task] = set()
+        self._lock = threading.Lock()
+        self._closed = False
+
+        self.root.after(self.poll_ms, self._poll)
+
+    @property
+    def active_count(self) -> int:
+        with self._lock:
+            return len(self._active)
+
+    def submit(
+        self,
+        fn: Callable[..., Any],
+        *args: Any,
+        description: str = "",
+        on_success: Optional[Callable[[Any], None]] = None,
+        on_error: Optional[Callable[[BaseException], None]] = None,
+    ) -> Task:
+        """
+        Pune `fn(*args)` în coadă. Callback-urile rulează pe thread-ul Tk.
+        """
+        future = self._executor.submit(fn, *args)
+        task = Task(future, description, on_success, on_error)
+
+        with self._lock:
+            self._active.add(task)
+
+        # apelat din thread-ul de lucru: doar semnalăm, nu atingem Tk aici
+        future.add_done_callback(lambda _: self._done.put(task))
+
+        self._notify()
+        return task
+
+    def cancel_all(self) -> int:
+        """
+        Anulează tot ce e în coadă și ignoră rezultatul celor deja pornite.
+        Întoarce câte task-uri au fost anulate.
+        """
+        with self._lock:
+            tasks = list(self._active)
+            self._active.clear()
+
+        for task in tasks:
+            task.cancel()
+
+        self._notify()
+        return len(tasks)
+
+    def shutdown(self) -> None:
+        self._closed = True
+        self.cancel_all()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    # ------------ INTERN ------------
+
+    def _notify(self) -> None:
+        if self.on_change is not None:
+            self.on_change(self.active_count)
+
+    def _poll(self) -> None:
+        if self._closed:
+            return
+
+        try:
+            self._deliver_finished()
+        finally:
+            # chiar dacă un callback a crăpat, continuăm să golim coada
+            self.root.after(self.poll_ms, self._poll)
+
+    def _deliver_finished(self) -> None:
+        changed = False
+        try:
+            while True:
+                try:
+                    task = self._done.get_nowait()
+                except queue.Empty:
+                    break
+
+                with self._lock:
+                    self._active.discard(task)
+                changed = True
+
+                if task.cancelled or task.future.cancelled():
+                    continue
+
+                error = task.future.exception()
+                if error is not None:
+                    if task.on_error is not None:
+                        task.on_error(error)
+                elif task.on_success is not None:
+                    task.on_success(task.future.result())
+        finally:
+            if changed:
+                self._notify()
@@ -0,0 +1,243 @@
+import hashlib
+import io
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from .config import CACHE_DIR, THUMB_CACHE_MAX_MB, THUMB_MEMORY_ITEMS
+from .profiling import timed
+
+
+# dimensiunea implicită a previzualizării din GUI
+PREVIEW_SIZE = (350, 350)
+
+# (cale absolută, mtime în ns, mărimea fișierului, lățime, înălțime)
+ThumbKey = Tuple[str, int, int, int, int]
+
+
+def thumbnail_key(path: str, size: Tuple[int, int] = PREVIEW_SIZE) -> ThumbKey:
+    """
+    Cheia unei miniaturi: se schimbă singură dacă fișierul e modificat
+    (alt mtime / altă mărime) sau dacă cerem altă dimensiune.
+    """
+    st = os.stat(path)
+    return (os.path.abspath(path), st.st_mtime_ns, st.st_size, size[0], size[1])
+
+
+def decode_thumbnail(path: str, size: Tuple[int, int] = PREVIEW_SIZE):
+    """
+    Decodează `path` direct la o rezoluție apropiată de `size`: la JPEG,
+    `draft()` cere decodorului o scalare 1/2, 1/4 sau 1/8, deci nu mai
+    despachetăm toată poza de 12 MP ca să afișăm 350 de pixeli.
+    """
+    from PIL import Image, ImageOps  # pip install pillow
+
+    img = Image.open(path)
+    if img.format == "JPEG":
+        img.draft("RGB", size)
+    img = ImageOps.exif_transpose(img)
+    img.thumbnail(size)
+    if img.mode not in ("RGB", "L"):
+        img = img.convert("RGB")
+    return img
+
+
+class ThumbnailCache:
+    """
+    Miniaturi pentru previzualizare, pe două niveluri:
+    - în memorie: ultimele `memory_items` PhotoImage-uri, gata de afișat (LRU)
+    - pe disc: JPEG-uri mici în `directory`, limitate la `max_bytes` (LRU după mtime)
+
+    La ratare imaginea e decodată cu `decode_thumbnail` și scrisă pe disc.
+    `load` poate fi chemat de pe orice thread; `photo` doar de pe thread-ul
+    Tk, pentru că acolo se creează PhotoImage-ul.
+    """
+
+    SUFFIX = ".jpg"
+
+    def __init__(self, directory: str, max_bytes: int, memory_items: int = 200):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.memory_items = memory_items
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._photos: "OrderedDict[ThumbKey, Any]" = OrderedDict()
+        # nume fișier -> mărime; cel mai recent folosit la final
+        self._files: "OrderedDict[str, int]" = OrderedDict()
+        self._total_bytes = 0
+
+        os.makedirs(self.directory, exist_ok=True)
+        self._load_index()
+
+    # ------------ API PUBLIC ------------
+
+    @timed("thumbnails.load")
+    def load(self, path: str, size: Tuple[int, int] = PREVIEW_SIZE):
+        """
+        Miniatura ca imagine PIL: din cache-ul pe disc dacă există, altfel
+        decodată acum și salvată. Ridică excepția lui PIL dacă fișierul nu
+        e o imagine.
+        """
+        from PIL import Image  # pip install pillow
+
+        key = thumbnail_key(path, size)
+        name = self._file_name(key)
+        file_path = os.path.join(self.directory, name)
+
+        with self._lock:
+            known = name in self._files
+            if known:
+                self._files.move_to_end(name)
+
+        if known:
+            try:
+                img = Image.open(file_path)
+                img.load()
+                self._touch(file_path)
+                with self._lock:
+                    self.disk_hits += 1
+                return img
+            except OSError:
+                # șters de altcineva sau corupt: îl refacem
+                with self._lock:
+                    self._forget_locked(name)
+
+        img = decode_thumbnail(path, size)
+        with self._lock:
+            self.misses += 1
+        self._store(name, img)
+        return img
+
+    def photo(self, path: str, size: Tuple[int, int] = PREVIEW_SIZE):
+        """
+        Miniatura ca ImageTk.PhotoImage; repetarea e instantanee cât timp
+        e încă printre ultimele `memory_items` afișate.
+        """
+        from PIL import ImageTk  # pip install pillow
+
+        key = thumbnail_key(path, size)
+        with self._lock:
+            photo = self._photos.get(key)
+            if photo is not None:
+                self._photos.move_to_end(key)
+                self.memory_hits += 1
+                return photo
+
+        photo = ImageTk.PhotoImage(self.load(path, size))
+        with self._lock:
+            self._photos[key] = photo
+            while len(self._photos) > self.memory_items:
+                self._photos.popitem(last=False)
+        return photo
+
+    def clear(self) -> None:
+        with self._lock:
+            self._photos.clear()
+            for name in list(self._files):
+                self._forget_locked(name)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            return {
+                "memory_entries": len(self._photos),
+                "disk_entries": len(self._files),
+                "disk_bytes": self._total_bytes,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": (
+                    (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0
+                ),
+            }
+
+    # ------------ INTERN ------------
+
+    def _file_name(self, key: ThumbKey) -> str:
+        digest = hashlib.sha1(repr(key).encode("utf-8")).hexdigest()
+        return digest + self.SUFFIX
+
+    def _load_index(self) -> None:
+        entries = []
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.is_file() and entry.name.endswith(self.SUFFIX):
+                    st = entry.stat()
+                    entries.append((st.st_mtime, entry.name, st.st_size))
+
+        for _, name, size in sorted(entries):
+            self._files[name] = size
+            self._total_bytes += size
+        self._evict_locked()
+
+    def _store(self, name: str, img) -> None:
+        if self.max_bytes <= 0:
+            return
+        buf = io.BytesIO()
+        img.convert("RGB").save(buf, format="JPEG", quality=85)
+        data = buf.getvalue()
+
+        # scriem atomic, ca alt thread / proces să nu citească un JPEG pe jumătate
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, os.path.join(self.directory, name))
+        except OSError:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            return
+
+        with self._lock:
+            self._total_bytes -= self._files.pop(name, 0)
+            self._files[name] = len(data)
+            self._total_bytes += len(data)
+            self._evict_locked()
+
+    @staticmethod
+    def _touch(file_path: str) -> None:
+        # mtime-ul ține ordinea LRU între porniri
+        try:
+            os.utime(file_path, None)
+        except OSError:
+            pass
+
+    def _forget_locked(self, name: str) -> None:
+        self._total_bytes -= self._files.pop(name, 0)
+        try:
+            os.remove(os.path.join(self.directory, name))
+        except FileNotFoundError:
+            pass
+
+    def _evict_locked(self) -> None:
+        while self._files and self._total_bytes > self.max_bytes:
+            self._forget_locked(next(iter(self._files)))
+
+
+_cache: Optional[ThumbnailCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_thumbnail_cache() -> ThumbnailCache:
+    """
+    Cache-ul de miniaturi comun aplicației, în CACHE_DIR/thumbnails
+    (PALD_THUMB_CACHE_MAX_MB=0 = doar în memorie).
+    """
+    global _cache
+
+    with _cache_lock:
+        if _cache is None:
+            _cache = ThumbnailCache(
+                os.path.join(CACHE_DIR, "thumbnails"),
+                max_bytes=int(THUMB_CACHE_MAX_MB * 1024 * 1024),
+                memory_items=THUMB_MEMORY_ITEMS,
+            )
+        return _cache
@@ -0,0 +1,539 @@
+import argparse
+import ctypes
+import ctypes.util
+import json
+import os
+import select
+import signal
+import struct
+import sys
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from .api_client import compute_file_hash
+from .batch import IMAGE_EXTENSIONS, describe_record, find_images, identify_record
+from .history import get_history_store
+from .scheduler import PRIORITY_BATCH
+
+
+DEFAULT_OUTPUT_NAME = "pald_watch.jsonl"
+DEFAULT_CHECKPOINT_NAME = ".pald_watch_checkpoint.jsonl"
+
+# după o eroare de cotă nu mai încercăm o vreme (secunde)
+QUOTA_RETRY_DELAY = 900.0
+# de câte ori reîncercăm o poză care dă eroare, până la repornire
+MAX_ATTEMPTS = 3
+
+# evenimente inotify (vezi <sys/inotify.h>)
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_Q_OVERFLOW = 0x00004000
+IN_ISDIR = 0x40000000
+_EVENT_HEADER = struct.Struct("iIII")
+
+# (mtime în ns, mărime)
+FileStat = Tuple[int, int]
+
+
+def _is_image(path: str) -> bool:
+    return path.lower().endswith(IMAGE_EXTENSIONS)
+
+
+def _file_stat(path: str) -> Optional[FileStat]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+class Checkpoint:
+    """
+    Pozele deja procesate, după hash-ul conținutului, într-un fișier JSONL
+    la care doar adăugăm (o linie per poză, scrisă pe disc imediat).
+
+    Ținem și (mtime, mărime) pe cale, ca la repornire să nu mai citim din
+    nou fișierele neschimbate doar ca să le calculăm hash-ul. Aceeași poză
+    copiată sub alt nume are același hash, deci nu e identificată a doua oară.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.hashes: Set[str] = set()
+        self._by_path: Dict[str, Tuple[FileStat, str]] = {}
+        self._load()
+
+    def __contains__(self, content_hash: str) -> bool:
+        return content_hash in self.hashes
+
+    def __len__(self) -> int:
+        return len(self.hashes)
+
+    def known_hash(self, image_path: str, stat: FileStat) -> Optional[str]:
+        """
+        Hash-ul salvat pentru `image_path`, dacă fișierul nu s-a schimbat de atunci.
+        """
+        known = self._by_path.get(os.path.abspath(image_path))
+        if known is not None and known[0] == stat:
+            return known[1]
+        return None
+
+    def add(self, content_hash: str, image_path: str, stat: FileStat) -> None:
+        image_path = os.path.abspath(image_path)
+        self.hashes.add(content_hash)
+        self._by_path[image_path] = (stat, content_hash)
+
+        line = json.dumps(
+            {"hash": content_hash, "image": image_path, "mtime_ns": stat[0], "size": stat[1]},
+            ensure_ascii=False,
+        )
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+            f.flush()
+            # după o cădere de curent nu vrem să plătim din nou aceeași poză
+            os.fsync(f.fileno())
+
+    def _load(self) -> None:
+        if not os.path.isfile(self.path):
+            return
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # ultima linie poate fi tăiată dacă procesul a fost oprit brusc
+                    continue
+                self.hashes.add(entry["hash"])
+                stat = (int(entry.get("mtime_ns", 0)), int(entry.get("size", -1)))
+                self._by_path[entry["image"]] = (stat, entry["hash"])
+
+
+class Debouncer:
+    """
+    Ține pozele noi / modificate până când nu se mai schimbă (mtime și
+    mărime identice) timp de `quiet` secunde, ca să nu trimitem un JPEG
+    pe jumătate copiat.
+    """
+
+    def __init__(self, quiet: float = 2.0):
+        self.quiet = quiet
+        # cale -> (stat la ultima verificare, de când e neschimbat)
+        self._pending: Dict[str, Tuple[Optional[FileStat], float]] = {}
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def touch(self, path: str) -> None:
+        self._pending[path] = (_file_stat(path), time.monotonic())
+
+    def ready(self, limit: Optional[int] = None) -> List[str]:
+        """
+        Pozele neschimbate de `quiet` secunde, cel mult `limit`; restul
+        rămân aici până la următorul apel.
+        """
+        now = time.monotonic()
+        ready: List[str] = []
+        for path, (stat, since) in list(self._pending.items()):
+            if limit is not None and len(ready) >= limit:
+                break
+            if now - since < self.quiet:
+                continue
+            current = _file_stat(path)
+            if current is None:
+                # șters sau mutat între timp
+                del self._pending[path]
+            elif current == stat:
+                del self._pending[path]
+                ready.append(path)
+            else:
+                self._pending[path] = (current, now)
+        return ready
+
+
+class PollingWatcher:
+    """
+    Găsește fișierele noi / modificate comparând listări succesive ale
+    folderului la fiecare `interval` secunde. Merge oriunde, inclusiv pe
+    share-uri de rețea, unde inotify nu vede scrierile altor calculatoare.
+    """
+
+    name = "polling"
+
+    def __init__(self, directory: str, recursive: bool = True, interval: float = 5.0):
+        self.directory = directory
+        self.recursive = recursive
+        self.interval = interval
+        self._snapshot = self._scan()
+        self._next = time.monotonic() + interval
+
+    def wait(self, timeout: float) -> Set[str]:
+        delay = self._next - time.monotonic()
+        if delay > timeout:
+            time.sleep(timeout)
+            return set()
+        if delay > 0:
+            time.sleep(delay)
+
+        self._next = time.monotonic() + self.interval
+        snapshot = self._scan()
+        changed = {
+            path for path, stat in snapshot.items() if self._snapshot.get(path) != stat
+        }
+        self._snapshot = snapshot
+        return changed
+
+    def close(self) -> None:
+        pass
+
+    def _scan(self) -> Dict[str, Optional[FileStat]]:
+        return {path: _file_stat(path) for path in find_images(self.directory, self.recursive)}
+
+
+class InotifyWatcher:
+    """
+    Evenimente inotify (Linux) prin ctypes: aflăm imediat de fișierele
+    închise după scriere sau mutate în folder, fără să listăm nimic.
+    La depășirea cozii kernelului întoarcem o listare completă.
+    """
+
+    name = "inotify"
+
+    MASK = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+
+    def __init__(self, directory: str, recursive: bool = True):
+        self.directory = directory
+        self.recursive = recursive
+
+        libc_name = ctypes.util.find_library("c") or "libc.so.6"
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        if not hasattr(self._libc, "inotify_init1"):
+            raise OSError("inotify nu e disponibil")
+
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 a eșuat")
+        self._dirs: Dict[int, str] = {}
+
+        self._add_watch(directory)
+        if recursive:
+            for root, dirs, _ in os.walk(directory):
+                for name in dirs:
+                    self._add_watch(os.path.join(root, name))
+
+    def wait(self, timeout: float) -> Set[str]:
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if not readable:
+            return set()
+
+        changed: Set[str] = set()
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return changed
+
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            wd, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b"\0").decode("utf-8", "surrogateescape")
+            offset += length
+
+            if mask & IN_Q_OVERFLOW:
+                # am pierdut evenimente: ne uităm la tot folderul
+                changed.update(find_images(self.directory, self.recursive))
+                continue
+
+            directory = self._dirs.get(wd)
+            if directory is None or not name:
+                continue
+            path = os.path.join(directory, name)
+
+            if mask & IN_ISDIR:
+                if self.recursive and mask & (IN_CREATE | IN_MOVED_TO):
+                    self._add_watch(path)
+                    # ce a apucat să apară în folder înainte să-l urmărim
+                    changed.update(find_images(path, True))
+            elif _is_image(path):
+                changed.add(path)
+        return changed
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+    def _add_watch(self, directory: str) -> None:
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), self.MASK)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"Nu pot urmări {directory}")
+        self._dirs[wd] = directory
+
+
+def make_watcher(
+    directory: str,
+    recursive: bool = True,
+    poll_interval: float = 5.0,
+    force_poll: bool = False,
+):
+    """
+    InotifyWatcher unde se poate (Linux), altfel PollingWatcher.
+    """
+    if not force_poll and sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(directory, recursive)
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(directory, recursive, poll_interval)
+
+
+def _process(
+    image_path: str,
+    stat: FileStat,
+    checkpoint: Checkpoint,
+    max_suggestions: int,
+    identify_kwargs: Dict[str, Any],
+) -> Dict[str, Any]:
+    # rulează pe un thread de lucru; checkpoint-ul îl scrie doar bucla principală
+    content_hash = checkpoint.known_hash(image_path, stat) or compute_file_hash(image_path)
+    if content_hash in checkpoint:
+        return {"image": os.path.abspath(image_path), "status": "skipped", "hash": content_hash}
+
+    record = identify_record(image_path, max_suggestions, identify_kwargs)
+    record["hash"] = content_hash
+    return record
+
+
+def watch(
+    directory: str,
+    output_path: str,
+    checkpoint_path: str,
+    recursive: bool = True,
+    workers: int = 2,
+    max_suggestions: int = 3,
+    quiet: float = 2.0,
+    poll_interval: float = 5.0,
+    force_poll: bool = False,
+    rescan_interval: float = 300.0,
+    save_history: bool = True,
+    stop: Optional[threading.Event] = None,
+    identify_kwargs: Optional[Dict[str, Any]] = None,
+) -> Dict[str, int]:
+    """
+    Urmărește `directory` și identifică fiecare poză nouă sau modificată,
+    până la `stop` (sau Ctrl+C).
+
+    Pozele sunt trimise abia după ce nu s-au mai schimbat `quiet` secunde.
+    Fiecare rezultat e adăugat în `output_path` (JSONL, ca la batch) și,
+    cu `save_history`, în istoric. Hash-ul pozelor reușite intră în
+    `checkpoint_path`, deci o repornire nu mai trimite nimic din ce a fost
+    deja identificat. La fiecare `rescan_interval` secunde listăm tot
+    folderul, pentru evenimentele pe care sistemul nu le raportează.
+
+    Cel mult 2 * `workers` poze sunt trimise la pool odată; restul așteaptă
+    în debouncer. La oprire, ce n-a pornit încă nu mai pleacă, iar ce
+    rula deja e terminat și scris în checkpoint.
+    """
+    stop = stop or threading.Event()
+    identify_kwargs = dict(identify_kwargs or {})
+    identify_kwargs.setdefault("priority", PRIORITY_BATCH)
+
+    checkpoint = Checkpoint(checkpoint_path)
+    debouncer = Debouncer(quiet)
+    watcher = make_watcher(directory, recursive, poll_interval, force_poll)
+    print(
+        f"Urmăresc {directory} ({watcher.name}); "
+        f"{len(checkpoint)} poze procesate deja. Ctrl+C oprește."
+    )
+
+    summary = {"ok": 0, "error": 0, "skipped": 0}
+    attempts: Dict[str, int] = {}
+    in_flight: Dict[Future, Tuple[str, FileStat]] = {}
+    paused_until = 0.0
+    history = get_history_store() if save_history else None
+
+    def enqueue(paths) -> None:
+        for path in paths:
+            path = os.path.abspath(path)
+            stat = _file_stat(path)
+            if stat is None:
+                continue
+            # neschimbat față de checkpoint: nici nu-l mai citim
+            if checkpoint.known_hash(path, stat) in checkpoint:
+                continue
+            if attempts.get(path, 0) >= MAX_ATTEMPTS:
+                continue
+            debouncer.touch(path)
+
+    # ce era deja în folder (de ex. a venit cât daemonul era oprit)
+    enqueue(find_images(directory, recursive))
+    next_rescan = time.monotonic() + rescan_interval
+
+    # nu punem mii de sarcini în coadă deodată, doar cât să țină pool-ul ocupat
+    max_in_flight = max(1, workers) * 2
+
+    def collect(out) -> None:
+        nonlocal paused_until
+
+        for future in [f for f in in_flight if f.done()]:
+            path, stat = in_flight.pop(future)
+            if future.cancelled():
+                continue
+            record = future.result()
+            status = record["status"]
+            summary[status] += 1
+            if status == "skipped":
+                # copie a unei poze deja procesate: ținem minte și calea
+                checkpoint.add(record["hash"], path, stat)
+                continue
+
+            out.write(json.dumps(record, ensure_ascii=False) + "\n")
+            out.flush()
+            print(f"{os.path.basename(path)} -> {describe_record(record)}")
+
+            if status == "ok":
+                checkpoint.add(record["hash"], path, stat)
+                attempts.pop(path, None)
+                upload = record["result"].get("upload") or {}
+                if history is not None and upload.get("source") not in (
+                    "near_duplicate", "coalesced"
+                ):
+                    history.add(record["result"], image_path=path)
+            elif record.get("quota_exceeded"):
+                # nu e vina pozei: o reluăm după pauză
+                paused_until = time.monotonic() + QUOTA_RETRY_DELAY
+                debouncer.touch(path)
+                print(
+                    f"Cota zilnică s-a terminat; reîncerc peste "
+                    f"{QUOTA_RETRY_DELAY / 60:.0f} minute."
+                )
+            else:
+                attempts[path] = attempts.get(path, 0) + 1
+                if attempts[path] < MAX_ATTEMPTS:
+                    debouncer.touch(path)
+
+    pool = ThreadPoolExecutor(max_workers=workers)
+    try:
+        with open(output_path, "a", encoding="utf-8") as out:
+            try:
+                while not stop.is_set():
+                    enqueue(watcher.wait(timeout=min(quiet, 1.0) if len(debouncer) else 1.0))
+
+                    if rescan_interval > 0 and time.monotonic() >= next_rescan:
+                        next_rescan = time.monotonic() + rescan_interval
+                        enqueue(find_images(directory, recursive))
+
+                    free = max_in_flight - len(in_flight)
+                    if time.monotonic() >= paused_until and free > 0:
+                        busy = {path for path, _ in in_flight.values()}
+                        for path in debouncer.ready(limit=free):
+                            stat = _file_stat(path)
+                            if path in busy or stat is None:
+                                continue
+                            future = pool.submit(
+                                _process, path, stat, checkpoint, max_suggestions, identify_kwargs
+                            )
+                            in_flight[future] = (path, stat)
+
+                    collect(out)
+            finally:
+                # Ctrl+C / stop: cererile care n-au pornit nu mai pleacă (sunt
+                # plătite); cele pornite se termină și ajung în checkpoint
+                pool.shutdown(wait=True, cancel_futures=True)
+                collect(out)
+    finally:
+        pool.shutdown(wait=False)
+        watcher.close()
+
+    return summary
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m pald watch",
+        description="Urmărește un folder și identifică pozele noi pe măsură ce apar.",
+    )
+    parser.add_argument("directory", help="folderul urmărit")
+    parser.add_argument(
+        "-o", "--output",
+        help=f"fișierul JSONL cu rezultate (implicit <folder>/{DEFAULT_OUTPUT_NAME})",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        help=f"fișierul cu pozele procesate (implicit <folder>/{DEFAULT_CHECKPOINT_NAME})",
+    )
+    parser.add_argument(
+        "-j", "--workers", type=int, default=2,
+        help="câte identificări rulează simultan (implicit 2)",
+    )
+    parser.add_argument(
+        "-n", "--max-suggestions", type=int, default=3,
+        help="câte sugestii păstrăm per imagine (implicit 3)",
+    )
+    parser.add_argument(
+        "--no-recursive", action="store_true",
+        help="nu urmări subfolderele",
+    )
+    parser.add_argument(
+        "--quiet", type=float, default=2.0,
+        help="câte secunde trebuie să rămână neschimbat un fișier înainte de trimitere",
+    )
+    parser.add_argument(
+        "--poll", action="store_true",
+        help="listează periodic folderul în loc de inotify (de ex. pe share-uri de rețea)",
+    )
+    parser.add_argument(
+        "--poll-interval", type=float, default=5.0,
+        help="la câte secunde listăm folderul cu --poll (implicit 5)",
+    )
+    parser.add_argument(
+        "--rescan", type=float, default=300.0,
+        help="la câte secunde listăm oricum tot folderul (0 = niciodată, implicit 300)",
+    )
+    parser.add_argument(
+        "--no-history", action="store_true",
+        help="nu salva rezultatele în istoricul aplicației",
+    )
+    args = parser.parse_args(argv)
+
+    if not os.path.isdir(args.directory):
+        print(f"Folderul nu există: {args.directory}")
+        return 2
+    if args.workers < 1:
+        print("Numărul de workeri trebuie să fie cel puțin 1.")
+        return 2
+
+    stop = threading.Event()
+    # systemd / docker opresc cu SIGTERM: terminăm curat, ca la Ctrl+C
+    signal.signal(signal.SIGTERM, lambda signum, frame: stop.set())
+
+    try:
+        summary = watch(
+            args.directory,
+            args.output or os.path.join(args.directory, DEFAULT_OUTPUT_NAME),
+            args.checkpoint or os.path.join(args.directory, DEFAULT_CHECKPOINT_NAME),
+            recursive=not args.no_recursive,
+            workers=args.workers,
+            max_suggestions=args.max_suggestions,
+            quiet=args.quiet,
+            poll_interval=args.poll_interval,
+            force_poll=args.poll,
+            rescan_interval=args.rescan,
+            save_history=not args.no_history,
+            stop=stop,
+        )
+    except KeyboardInterrupt:
+        print("\nOprit. Pozele deja identificate nu vor fi trimise din nou.")
+        return 130
+
+    print(
+        f"Oprit: {summary['ok']} reușite, {summary['error']} erori, "
+        f"{summary['skipped']} deja procesate."
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
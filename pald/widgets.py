@@ -0,0 +1,194 @@
+import tkinter as tk
+from typing import Callable, List, Optional, Tuple
+
+
+class VirtualList(tk.Frame):
+    """
+    Listă derulabilă pe un Canvas care desenează doar rândurile vizibile.
+
+    Spre deosebire de tk.Listbox nu ține textul tuturor rândurilor: știe
+    doar câte sunt (`set_count`) și cere textul unui rând prin `row_text(index)`
+    abia când rândul intră în fereastră. Așa rămâne la fel de rapidă cu
+    100.000 de rânduri ca și cu 10.
+
+    `on_visible(first, last)` (opțional) e chemat înainte de desenare, ca
+    cine furnizează datele să le poată aduce pe toate dintr-o dată.
+    `on_activate(index)` e chemat la dublu-click sau Enter.
+    """
+
+    def __init__(
+        self,
+        master,
+        row_text: Callable[[int], str],
+        on_activate: Optional[Callable[[int], None]] = None,
+        on_visible: Optional[Callable[[int, int], None]] = None,
+        row_height: int = 20,
+        font=("Segoe UI", 9),
+        bg: str = "#f9fafb",
+        fg: str = "#111827",
+        select_bg: str = "#dbeafe",
+        **kwargs,
+    ):
+        super().__init__(master, bg=bg, **kwargs)
+        self.row_text = row_text
+        self.on_activate = on_activate
+        self.on_visible = on_visible
+        self.row_height = row_height
+        self.font = font
+        self.bg = bg
+        self.fg = fg
+        self.select_bg = select_bg
+
+        self.rowconfigure(0, weight=1)
+        self.columnconfigure(0, weight=1)
+
+        self.canvas = tk.Canvas(self, bg=bg, highlightthickness=0, borderwidth=0)
+        self.canvas.grid(row=0, column=0, sticky="nsew")
+        self.scrollbar = tk.Scrollbar(self, orient="vertical", command=self.yview)
+        self.scrollbar.grid(row=0, column=1, sticky="ns")
+
+        self._count = 0
+        # cât am derulat, în pixeli de la primul rând
+        self._offset = 0
+        self.selected: Optional[int] = None
+        # rândurile desenate: (dreptunghi, text), refolosite la fiecare redesenare
+        self._slots: List[Tuple[int, int]] = []
+        self._redraw_pending = False
+
+        self.canvas.bind("<Configure>", lambda e: self.redraw())
+        self.canvas.bind("<Button-1>", self._on_click)
+        self.canvas.bind("<Double-1>", self._on_double_click)
+        self.canvas.bind("<MouseWheel>", self._on_mousewheel)
+        # Linux trimite rotița ca butoanele 4 / 5
+        self.canvas.bind("<Button-4>", lambda e: self.yview("scroll", -3, "units"))
+        self.canvas.bind("<Button-5>", lambda e: self.yview("scroll", 3, "units"))
+        self.canvas.bind("<Up>", lambda e: self._move_selection(-1))
+        self.canvas.bind("<Down>", lambda e: self._move_selection(1))
+        self.canvas.bind("<Return>", lambda e: self._activate(self.selected))
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    def set_count(self, count: int, keep_position: bool = False) -> None:
+        """
+        Schimbă numărul de rânduri (de ex. după o căutare) și redesenează.
+        """
+        self._count = count
+        if not keep_position:
+            self._offset = 0
+            self.selected = None
+        elif self.selected is not None and self.selected >= count:
+            self.selected = None
+        self._clamp_offset()
+        self.redraw()
+
+    def redraw(self) -> None:
+        # mai multe cereri în același ciclu Tk -> o singură desenare
+        if not self._redraw_pending:
+            self._redraw_pending = True
+            self.after_idle(self._redraw)
+
+    def yview(self, *args) -> None:
+        """
+        Interfața de derulare folosită de Scrollbar ("moveto" / "scroll").
+        """
+        if not args:
+            return
+        height = self.canvas.winfo_height()
+        if args[0] == "moveto":
+            self._offset = int(float(args[1]) * self._total_height())
+        elif args[0] == "scroll":
+            amount = int(args[1])
+            step = height if args[2] == "pages" else self.row_height
+            self._offset += amount * step
+        self._clamp_offset()
+        self.redraw()
+
+    def see(self, index: int) -> None:
+        height = self.canvas.winfo_height()
+        top = index * self.row_height
+        if top < self._offset:
+            self._offset = top
+        elif top + self.row_height > self._offset + height:
+            self._offset = top + self.row_height - height
+        self._clamp_offset()
+        self.redraw()
+
+    # ------------ INTERN ------------
+
+    def _total_height(self) -> int:
+        return self._count * self.row_height
+
+    def _clamp_offset(self) -> None:
+        max_offset = max(0, self._total_height() - self.canvas.winfo_height())
+        self._offset = max(0, min(self._offset, max_offset))
+
+    def _redraw(self) -> None:
+        self._redraw_pending = False
+        width = self.canvas.winfo_width()
+        height = self.canvas.winfo_height()
+
+        first = self._offset // self.row_height
+        visible = height // self.row_height + 2
+        last = min(self._count, first + visible)
+
+        if self.on_visible is not None and last > first:
+            self.on_visible(first, last)
+
+        while len(self._slots) < visible:
+            rect = self.canvas.create_rectangle(0, 0, 0, 0, width=0, fill=self.bg)
+            text = self.canvas.create_text(
+                6, 0, anchor="w", font=self.font, fill=self.fg, text=""
+            )
+            self._slots.append((rect, text))
+
+        for slot, (rect, text) in enumerate(self._slots):
+            index = first + slot
+            if index >= last:
+                self.canvas.itemconfigure(rect, state="hidden")
+                self.canvas.itemconfigure(text, state="hidden")
+                continue
+
+            y = index * self.row_height - self._offset
+            fill = self.select_bg if index == self.selected else self.bg
+            self.canvas.coords(rect, 0, y, width, y + self.row_height)
+            self.canvas.itemconfigure(rect, state="normal", fill=fill)
+            self.canvas.coords(text, 6, y + self.row_height // 2)
+            self.canvas.itemconfigure(text, state="normal", text=self.row_text(index))
+
+        total = self._total_height()
+        if total <= 0 or total <= height:
+            self.scrollbar.set(0.0, 1.0)
+        else:
+            self.scrollbar.set(self._offset / total, (self._offset + height) / total)
+
+    def _index_at(self, y: int) -> Optional[int]:
+        index = (self._offset + y) // self.row_height
+        return index if 0 <= index < self._count else None
+
+    def _on_click(self, event) -> None:
+        self.canvas.focus_set()
+        self.selected = self._index_at(event.y)
+        self.redraw()
+
+    def _on_double_click(self, event) -> None:
+        self._activate(self._index_at(event.y))
+
+    def _activate(self, index: Optional[int]) -> None:
+        if index is not None and self.on_activate is not None:
+            self.selected = index
+            self.redraw()
+            self.on_activate(index)
+
+    def _on_mousewheel(self, event) -> None:
+        # Windows: multipli de 120; macOS: valori mici
+        delta = event.delta // 120 if abs(event.delta) >= 120 else event.delta
+        self.yview("scroll", -delta * 3, "units")
+
+    def _move_selection(self, step: int) -> None:
+        if not self._count:
+            return
+        current = self.selected if self.selected is not None else -step
+        self.selected = max(0, min(self._count - 1, current + step))
+        self.see(self.selected)
@@ -0,0 +1,12 @@
+import os
+import tempfile
+
+# config.py citește mediul la import: testele nu au voie să atingă cache-ul,
+# istoricul sau cheile reale ale utilizatorului
+_root = tempfile.mkdtemp(prefix="pald-tests-")
+os.environ["PALD_CACHE_DIR"] = os.path.join(_root, "cache")
+os.environ["PALD_HISTORY_DB"] = os.path.join(_root, "history.sqlite3")
+os.environ["PLANT_ID_API_KEY"] = "test-key"
+os.environ.pop("PLANT_ID_API_KEYS", None)
+os.environ["PALD_DAILY_QUOTA"] = "0"
+os.environ["PALD_RATE_LIMIT"] = "0"
@@ -0,0 +1,75 @@
+import json
+import os
+
+from pald.cache import ResultCache
+
+
+def _key(i: int) -> str:
+    return f"{i:064x}"
+
+
+def test_put_get_roundtrip(tmp_path):
+    cache = ResultCache(str(tmp_path), max_bytes=1024 * 1024, max_age=0)
+    cache.put(_key(1), {"suggestions": [{"name": "Quercus robur"}]})
+
+    assert cache.get(_key(1)) == {"suggestions": [{"name": "Quercus robur"}]}
+    assert cache.get(_key(2)) is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_evicts_least_recently_used(tmp_path):
+    payload = {"x": "a" * 200}
+    probe = ResultCache(str(tmp_path / "probe"), max_bytes=1024 * 1024, max_age=0)
+    probe.put(_key(0), payload)
+    entry_size = probe.stats()["bytes"]
+
+    # mărimea variază cu câțiva bytes (timpul din înregistrare): loc pentru 2, nu 3
+    cache = ResultCache(str(tmp_path / "cache"), max_bytes=entry_size * 2 + 16, max_age=0)
+    cache.put(_key(1), payload)
+    cache.put(_key(2), payload)
+    # 1 devine cel mai recent folosit, deci 2 iese la următoarea adăugare
+    assert cache.get(_key(1)) is not None
+    cache.put(_key(3), payload)
+
+    assert cache.get(_key(2)) is None
+    assert cache.get(_key(1)) is not None
+    assert cache.get(_key(3)) is not None
+    assert cache.stats()["evictions"] == 1
+    assert not os.path.exists(os.path.join(cache.directory, _key(2) + ".json"))
+
+
+def test_expired_entry_is_dropped(tmp_path):
+    cache = ResultCache(str(tmp_path), max_bytes=1024 * 1024, max_age=3600)
+    cache.put(_key(1), {"ok": True})
+
+    path = os.path.join(str(tmp_path), _key(1) + ".json")
+    with open(path, "r", encoding="utf-8") as f:
+        record = json.load(f)
+    record["created"] = 0
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(record, f)
+
+    assert cache.get(_key(1)) is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_ignores_files_that_are_not_keys(tmp_path):
+    for name in ("quota.json", "notes.json", _key(1)[:-1] + "g.json"):
+        (tmp_path / name).write_text("{}", encoding="utf-8")
+
+    cache = ResultCache(str(tmp_path), max_bytes=1, max_age=0)
+    assert cache.stats()["entries"] == 0
+    cache.clear()
+    assert (tmp_path / "quota.json").exists()
+    assert (tmp_path / "notes.json").exists()
+
+
+def test_peek_does_not_touch_stats(tmp_path):
+    cache = ResultCache(str(tmp_path), max_bytes=1024 * 1024, max_age=0)
+    cache.put(_key(1), {"ok": True})
+
+    assert cache.peek(_key(1)) == {"ok": True}
+    assert cache.peek(_key(2)) is None
+    stats = cache.stats()
+    assert stats["hits"] == 0 and stats["misses"] == 0
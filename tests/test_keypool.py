@@ -0,0 +1,60 @@
+import pytest
+
+from pald.keypool import KeyPool, NoKeyAvailableError
+
+
+def test_requests_rotate_over_keys():
+    pool = KeyPool(["key-a", "key-b", "key-c"])
+    used = [pool.acquire() for _ in range(6)]
+
+    assert sorted(used) == ["key-a", "key-a", "key-b", "key-b", "key-c", "key-c"]
+
+
+def test_prefers_key_with_most_remaining_quota():
+    pool = KeyPool(["key-a", "key-b"])
+    pool.report("key-a", 200, remaining=5)
+    pool.report("key-b", 200, remaining=500)
+
+    assert pool.acquire() == "key-b"
+
+
+def test_duplicate_and_empty_keys_are_dropped():
+    assert len(KeyPool(["key-a", "", "key-a", "key-b"])) == 2
+    with pytest.raises(ValueError):
+        KeyPool(["", ""])
+
+
+def test_rate_limited_key_is_quarantined():
+    pool = KeyPool(["key-a", "key-b"], quarantine=60.0)
+    pool.report("key-a", 429, retry_after=30.0)
+
+    assert not pool.is_available("key-a")
+    assert pool.available_count() == 1
+    assert {pool.acquire() for _ in range(4)} == {"key-b"}
+
+    pool.report("key-b", 429)
+    with pytest.raises(NoKeyAvailableError) as info:
+        pool.acquire()
+    assert 0 < info.value.retry_after <= 30.0
+
+
+def test_auth_error_quarantines_key_while_others_remain():
+    pool = KeyPool(["key-a", "key-b"], auth_quarantine=3600.0)
+    pool.report("key-a", 401)
+
+    assert not pool.is_available("key-a")
+    assert pool.acquire() == "key-b"
+
+
+def test_last_available_key_is_not_quarantined_on_auth_error():
+    pool = KeyPool(["key-a"], auth_quarantine=3600.0)
+    pool.report("key-a", 403)
+
+    assert pool.is_available("key-a")
+    assert pool.acquire() == "key-a"
+    assert pool.stats()[0]["failures"] == 1
+
+
+def test_stats_mask_keys():
+    pool = KeyPool(["secret-key"])
+    assert pool.stats()[0]["key"] == "secr***"
@@ -0,0 +1,90 @@
+import json
+import os
+
+import pytest
+
+from pald.api_client import PlantIdClient, identify_plant
+from pald.batch import find_images, run_batch
+from pald.mock_server import MockPlantIdServer
+from pald.scheduler import RateScheduler
+
+
+@pytest.fixture
+def server():
+    with MockPlantIdServer(latency=0.0, jitter=0.0, seed=1) as server:
+        yield server
+
+
+@pytest.fixture
+def client(server):
+    client = PlantIdClient(
+        api_key="mock-key",
+        endpoint=server.url,
+        backoff_base=0.01,
+        scheduler=RateScheduler(rate=0),
+    )
+    yield client
+    client.close()
+
+
+def _photos(directory, count):
+    paths = []
+    for i in range(count):
+        path = os.path.join(str(directory), f"photo_{i}.jpg")
+        with open(path, "wb") as f:
+            f.write(os.urandom(2000 + i))
+        paths.append(path)
+    return paths
+
+
+def test_identify_plant_end_to_end(tmp_path, server, client):
+    (path,) = _photos(tmp_path, 1)
+
+    result = identify_plant(path, client=client, use_cache=False, use_dedup=False, max_edge=0)
+
+    assert result["suggestions"]
+    assert all(s["name"] for s in result["suggestions"])
+    assert result["upload"]["source"] == "api"
+    assert result["upload"]["sent_bytes"] == os.path.getsize(path)
+
+    stats = server.stats()
+    assert stats["requests"] == 1
+    assert stats["images"] == 1
+
+
+@pytest.mark.parametrize("processes", [0, 1])
+def test_batch_end_to_end(tmp_path, server, client, processes):
+    photos = tmp_path / "photos"
+    photos.mkdir()
+    _photos(photos, 6)
+    output = str(tmp_path / "results.jsonl")
+
+    summary = run_batch(
+        find_images(str(photos)),
+        output,
+        workers=3,
+        progress=False,
+        identify_kwargs={
+            "client": client, "use_cache": False, "use_dedup": False, "max_edge": 0,
+        },
+        processes=processes,
+    )
+
+    assert summary["ok"] == 6
+    assert summary["error"] == 0
+    assert server.stats()["requests"] == 6
+    with open(output, "r", encoding="utf-8") as f:
+        records = [json.loads(line) for line in f]
+    assert len(records) == 6
+    assert all(r["status"] == "ok" for r in records)
+
+    # o rulare reluată sare peste tot ce a reușit deja
+    again = run_batch(
+        find_images(str(photos)),
+        output,
+        progress=False,
+        identify_kwargs={"client": client, "use_cache": False, "max_edge": 0},
+        processes=processes,
+    )
+    assert again["skipped"] == 6
+    assert server.stats()["requests"] == 6
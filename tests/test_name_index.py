@@ -0,0 +1,50 @@
+from pald.name_index import NameIndex
+
+
+def _index():
+    return NameIndex().build(
+        [
+            (1, "Quercus robur|English oak|pedunculate oak"),
+            (2, "Taraxacum officinale|common dandelion"),
+            (3, "Quercus robur|English oak|pedunculate oak"),
+            (4, "Hedera helix|common ivy|English ivy"),
+            (5, ""),
+        ]
+    )
+
+
+def test_substring_search_newest_first():
+    assert _index().search("oak") == [3, 1]
+    assert _index().search("ROBUR") == [3, 1]
+
+
+def test_short_terms_match_word_prefixes_only():
+    index = _index()
+    assert index.search("co") == [4, 2]
+    # "ak" apare în "oak", dar nu la începutul unui cuvânt
+    assert index.search("ak") == []
+
+
+def test_all_terms_must_match():
+    index = _index()
+    assert index.search("english ivy") == [4]
+    assert index.search("english dandelion") == []
+
+
+def test_empty_query_and_limit():
+    index = _index()
+    assert index.search("") == [5, 4, 3, 2, 1]
+    assert index.search("  ", limit=2) == [5, 4]
+    assert index.search("english", limit=1) == [4]
+
+
+def test_incremental_add_and_last_id():
+    index = _index()
+    assert index.last_id == 5
+    index.add(7, "Bellis perennis|daisy")
+    index.add(6, "Rosa canina|dog rose")
+
+    assert index.last_id == 7
+    assert index.search("daisy") == [7]
+    assert index.all_ids()[:3] == [7, 6, 5]
+    assert len(index) == 7
@@ -0,0 +1,66 @@
+import asyncio
+import base64
+import json
+import os
+
+import pytest
+
+from pald.request_body import JSONImagesBody, base64_length
+
+
+@pytest.mark.parametrize("size", [0, 1, 2, 3, 4, 1000, 3 * 64 * 1024 + 1])
+def test_base64_length(size):
+    assert base64_length(size) == len(base64.b64encode(b"x" * size))
+
+
+@pytest.mark.parametrize("chunk_size", [3, 30, 3 * 64 * 1024])
+def test_body_round_trip_with_files_and_bytes(tmp_path, chunk_size):
+    on_disk = os.urandom(100_003)
+    in_memory = os.urandom(7)
+    path = tmp_path / "photo.jpg"
+    path.write_bytes(on_disk)
+
+    body = JSONImagesBody(
+        [str(path), in_memory], extra={"classification_level": "speciă"}, chunk_size=chunk_size
+    )
+    raw = b"".join(body.stream())
+
+    assert len(raw) == len(body) == len(body.stream())
+    data = json.loads(raw)
+    assert data["images"] == [
+        base64.b64encode(on_disk).decode("ascii"),
+        base64.b64encode(in_memory).decode("ascii"),
+    ]
+    assert data["classification_level"] == "speciă"
+
+
+def test_every_stream_is_a_fresh_pass():
+    body = JSONImagesBody([b"abc"])
+    assert b"".join(body.stream()) == b"".join(body.stream())
+    assert body.to_json() == {"images": ["YWJj"]}
+
+
+def test_async_iteration_matches_sync(tmp_path):
+    path = tmp_path / "photo.jpg"
+    path.write_bytes(os.urandom(5000))
+    body = JSONImagesBody([str(path)], chunk_size=300)
+
+    async def collect():
+        return b"".join([chunk async for chunk in body.aiter()])
+
+    assert asyncio.run(collect()) == b"".join(body)
+
+
+def test_file_that_shrinks_is_an_error(tmp_path):
+    path = tmp_path / "photo.jpg"
+    path.write_bytes(b"x" * 1000)
+    body = JSONImagesBody([str(path)])
+    path.write_bytes(b"x" * 10)
+
+    with pytest.raises(OSError):
+        b"".join(body)
+
+
+def test_chunk_size_must_be_multiple_of_three():
+    with pytest.raises(ValueError):
+        JSONImagesBody([b"abc"], chunk_size=100)
@@ -0,0 +1,117 @@
+import threading
+import time
+
+import pytest
+
+from pald.scheduler import (
+    POLL_INTERVAL,
+    PRIORITY_BATCH,
+    PRIORITY_INTERACTIVE,
+    QuotaExceededError,
+    RateScheduler,
+)
+
+
+def test_interactive_waiter_goes_before_batch():
+    scheduler = RateScheduler(rate=5.0, burst=1)
+    scheduler.acquire()  # golim rafala: următorul token vine peste ~200 ms
+
+    order = []
+
+    def wait_for(priority, name):
+        scheduler.acquire(priority)
+        order.append(name)
+
+    batch = threading.Thread(target=wait_for, args=(PRIORITY_BATCH, "batch"))
+    batch.start()
+    time.sleep(0.05)
+    interactive = threading.Thread(target=wait_for, args=(PRIORITY_INTERACTIVE, "interactive"))
+    interactive.start()
+    batch.join(5)
+    interactive.join(5)
+
+    assert order == ["interactive", "batch"]
+
+
+def test_acquire_timeout():
+    scheduler = RateScheduler(rate=0.1, burst=1)
+    scheduler.acquire()
+    with pytest.raises(TimeoutError):
+        scheduler.acquire(timeout=0.05)
+    assert scheduler.queue_depth() == {"interactive": 0, "batch": 0}
+
+
+def test_daily_quota_keeps_reserve_for_interactive():
+    scheduler = RateScheduler(rate=0, daily_quota=10, interactive_reserve=0.2)
+    for _ in range(8):
+        scheduler.acquire(PRIORITY_BATCH)
+    with pytest.raises(QuotaExceededError):
+        scheduler.acquire(PRIORITY_BATCH)
+
+    scheduler.acquire(PRIORITY_INTERACTIVE)
+    scheduler.acquire(PRIORITY_INTERACTIVE)
+    with pytest.raises(QuotaExceededError):
+        scheduler.acquire(PRIORITY_INTERACTIVE)
+
+    stats = scheduler.stats()
+    assert stats["used_today"] == 10
+    assert stats["remaining_today"] == 0
+    assert stats["rejected"] == 2
+
+
+def test_quota_is_shared_through_state_file(tmp_path):
+    state = str(tmp_path / "state" / "quota.sqlite3")
+    first = RateScheduler(rate=0, daily_quota=4, interactive_reserve=0, state_path=state)
+    second = RateScheduler(rate=0, daily_quota=4, interactive_reserve=0, state_path=state)
+
+    first.acquire()
+    second.acquire()
+    first.acquire()
+    second.acquire()
+    with pytest.raises(QuotaExceededError):
+        first.acquire()
+
+    # o repornire vede aceeași numărătoare
+    restarted = RateScheduler(rate=0, daily_quota=4, state_path=state)
+    assert restarted.stats()["used_today"] == 4
+
+
+def test_reserve_and_try_acquire():
+    scheduler = RateScheduler(rate=5.0, burst=1)
+    first = scheduler.reserve(PRIORITY_BATCH)
+    second = scheduler.reserve(PRIORITY_BATCH)
+
+    # doar primul la coadă poate lua tokenul
+    assert scheduler.try_acquire(second) == POLL_INTERVAL
+    assert scheduler.try_acquire(first) == 0.0
+    assert scheduler.try_acquire(second) > 0
+    assert scheduler.queue_depth()["batch"] == 1
+
+    scheduler.release(second)
+    assert scheduler.queue_depth()["batch"] == 0
+    assert scheduler.granted == 1
+
+
+def test_released_ticket_costs_nothing():
+    scheduler = RateScheduler(rate=0, daily_quota=5)
+    for _ in range(6):
+        scheduler.release(scheduler.reserve(PRIORITY_BATCH))
+
+    stats = scheduler.stats()
+    assert stats["granted"] == 0
+    assert stats["used_today"] == 0
+    assert stats["queued"] == 0
+
+
+def test_released_ticket_unblocks_sync_waiter():
+    scheduler = RateScheduler(rate=0)
+    ticket = scheduler.reserve(PRIORITY_INTERACTIVE)
+    done = threading.Event()
+
+    thread = threading.Thread(target=lambda: (scheduler.acquire(PRIORITY_BATCH), done.set()))
+    thread.start()
+    # tichetul interactiv e în fața lui; thread-ul așteaptă
+    assert not done.wait(0.1)
+    scheduler.release(ticket)
+    assert done.wait(2)
+    thread.join(2)
@@ -0,0 +1,105 @@
+import threading
+import time
+
+import pytest
+
+from pald import api_client
+from pald.singleflight import SingleFlight
+
+
+def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight()
+    calls = []
+    started = threading.Event()
+
+    def slow():
+        calls.append(1)
+        started.set()
+        time.sleep(0.2)
+        return {"value": 42}
+
+    results = []
+
+    def run():
+        results.append(flight.do("key", slow))
+
+    leader = threading.Thread(target=run)
+    leader.start()
+    started.wait(2)
+    followers = [threading.Thread(target=run) for _ in range(3)]
+    for thread in followers:
+        thread.start()
+    for thread in [leader] + followers:
+        thread.join(5)
+
+    assert len(calls) == 1
+    assert sorted(shared for _, shared in results) == [False, True, True, True]
+    assert flight.shared == 3
+    assert flight.in_flight() == 0
+
+
+def test_error_is_raised_to_every_caller():
+    flight = SingleFlight()
+
+    def boom():
+        raise ValueError("nope")
+
+    with pytest.raises(ValueError):
+        flight.do("key", boom)
+    # nu rămâne nimic agățat după eroare
+    assert flight.in_flight() == 0
+    assert flight.do("key", lambda: 1) == (1, False)
+
+
+class _SlowClient:
+    endpoint = "https://example.invalid/identify"
+
+    def __init__(self):
+        self.calls = 0
+        self.started = threading.Event()
+
+    def post_identification(self, payload, params=None, priority=0):
+        self.calls += 1
+        self.started.set()
+        time.sleep(0.3)
+        return {
+            "result": {
+                "is_plant": {"probability": 0.95},
+                "classification": {
+                    "suggestions": [
+                        {"name": "Quercus robur", "probability": 0.9,
+                         "details": {"common_names": ["English oak"]}},
+                    ]
+                },
+            }
+        }
+
+
+def test_coalesced_results_are_independent_copies():
+    client = _SlowClient()
+    image = b"same image bytes for everyone"
+    results = []
+
+    def identify():
+        results.append(
+            api_client.identify_plant(
+                image, client=client, use_cache=False, use_dedup=False, max_edge=0
+            )
+        )
+
+    leader = threading.Thread(target=identify)
+    leader.start()
+    client.started.wait(2)
+    follower = threading.Thread(target=identify)
+    follower.start()
+    leader.join(5)
+    follower.join(5)
+
+    assert client.calls == 1
+    assert sorted(r["upload"]["source"] for r in results) == ["api", "coalesced"]
+
+    first, second = results
+    first["suggestions"][0]["name"] = "changed"
+    first["suggestions"].append({"name": "extra"})
+    assert second["suggestions"][0]["name"] == "Quercus robur"
+    assert len(second["suggestions"]) == 1
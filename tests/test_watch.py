@@ -0,0 +1,87 @@
+import os
+import time
+
+from pald.watch import Checkpoint, Debouncer, _file_stat
+
+
+def test_checkpoint_survives_restart(tmp_path):
+    photo = tmp_path / "a.jpg"
+    photo.write_bytes(b"jpeg")
+    stat = _file_stat(str(photo))
+    path = str(tmp_path / "checkpoint.jsonl")
+
+    checkpoint = Checkpoint(path)
+    checkpoint.add("hash-a", str(photo), stat)
+
+    resumed = Checkpoint(path)
+    assert "hash-a" in resumed
+    assert len(resumed) == 1
+    assert resumed.known_hash(str(photo), stat) == "hash-a"
+
+
+def test_checkpoint_forgets_path_when_file_changes(tmp_path):
+    photo = tmp_path / "a.jpg"
+    photo.write_bytes(b"jpeg")
+    path = str(tmp_path / "checkpoint.jsonl")
+    Checkpoint(path).add("hash-a", str(photo), _file_stat(str(photo)))
+
+    photo.write_bytes(b"another, longer jpeg")
+    resumed = Checkpoint(path)
+    assert resumed.known_hash(str(photo), _file_stat(str(photo))) is None
+    # hash-ul rămâne cunoscut: o copie identică nu mai e trimisă
+    assert "hash-a" in resumed
+
+
+def test_checkpoint_skips_truncated_last_line(tmp_path):
+    path = tmp_path / "checkpoint.jsonl"
+    path.write_text(
+        '{"hash": "hash-a", "image": "/x/a.jpg", "mtime_ns": 1, "size": 2}\n{"hash": "ha',
+        encoding="utf-8",
+    )
+    checkpoint = Checkpoint(str(path))
+    assert len(checkpoint) == 1
+    assert "hash-a" in checkpoint
+
+
+def test_debouncer_waits_until_file_is_quiet(tmp_path):
+    photo = tmp_path / "a.jpg"
+    photo.write_bytes(b"half")
+    debouncer = Debouncer(quiet=0.1)
+    debouncer.touch(str(photo))
+
+    assert debouncer.ready() == []
+    time.sleep(0.15)
+    # încă se scrie: ceasul pornește din nou
+    photo.write_bytes(b"half a jpeg, now longer")
+    assert debouncer.ready() == []
+    assert len(debouncer) == 1
+
+    time.sleep(0.15)
+    assert debouncer.ready() == [str(photo)]
+    assert len(debouncer) == 0
+
+
+def test_debouncer_drops_deleted_files(tmp_path):
+    photo = tmp_path / "a.jpg"
+    photo.write_bytes(b"jpeg")
+    debouncer = Debouncer(quiet=0.0)
+    debouncer.touch(str(photo))
+    os.remove(photo)
+
+    assert debouncer.ready() == []
+    assert len(debouncer) == 0
+
+
+def test_debouncer_limit_keeps_the_rest(tmp_path):
+    debouncer = Debouncer(quiet=0.0)
+    for i in range(5):
+        photo = tmp_path / f"{i}.jpg"
+        photo.write_bytes(b"jpeg")
+        debouncer.touch(str(photo))
+
+    first = debouncer.ready(limit=2)
+    assert len(first) == 2
+    assert len(debouncer) == 3
+    rest = debouncer.ready()
+    assert len(rest) == 3
+    assert not set(first) & set(rest)